@@ -0,0 +1,29 @@
+"""
+Fetching headlines from any of the backends.
+"""
+
+from typing import List, Optional
+
+from api.hybrid import iter_hybrid_news
+from api.news_api import fetch_news_from_api
+from scrapers.web_scraper import scrape_news_websites
+from utils.article import Article
+
+# Backends headlines can be fetched from, as in `headlines --mode`
+MODES = ("api", "scraper", "hybrid", "rss")
+
+def fetch_headlines(mode: str, source: Optional[str], category: Optional[str], limit: int) -> List[Article]:
+    """
+    Fetch headlines from a backend all at once.
+
+    Raises:
+        QuotaExceededError: If the daily NewsAPI quota is used up (api mode)
+    """
+    if mode == "api":
+        return fetch_news_from_api(source=source, category=category, limit=limit)
+    if mode == "hybrid":
+        news_items: List[Article] = []
+        for news_items in iter_hybrid_news(source, category, limit):
+            pass
+        return news_items
+    return scrape_news_websites(source, category, limit, backend="rss" if mode == "rss" else None)
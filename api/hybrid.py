@@ -0,0 +1,155 @@
+"""
+Module for fetching news from NewsAPI and the web scrapers together.
+"""
+
+import asyncio
+from typing import List, AsyncIterator, Iterator, Optional
+
+from api.news_api import fetch_news_from_api
+from scrapers.web_scraper import iterate_async, run_in_daemon_thread, stream_news_websites
+from utils.article import Article
+from utils.config import HYBRID_HEDGE_AFTER, HYBRID_PRIMARY, NEWS_SOURCES
+from utils.merge import TopNewsMerger
+from utils.store import save_articles
+
+# Backends hybrid mode can ask
+BACKENDS = ("api", "scraper")
+
+# Marks the end of a backend's results on the results queue
+_DONE = None
+
+async def stream_hybrid_news(
+    source: Optional[str] = None,
+    category: Optional[str] = None,
+    limit: int = 10,
+    use_cache: bool = True,
+    max_age: Optional[int] = None,
+    hedge_after: float = HYBRID_HEDGE_AFTER,
+    primary: str = HYBRID_PRIMARY
+) -> AsyncIterator[List[Article]]:
+    """
+    Merge news from NewsAPI and the web scrapers into the `limit` most recent items.
+
+    The primary backend is asked first. The other backend is asked too
+    once `hedge_after` seconds pass, or the primary finishes, without
+    `limit` items collected. Results of both are merged and deduplicated
+    by canonical URL (and near-duplicate stories) as they arrive, and the
+    current top items are yielded whenever they change. Stops as soon as
+    `limit` items are available, abandoning the slower backend.
+
+    Args:
+        source: The news source to fetch from
+        category: The news category to filter by
+        limit: Maximum number of news items to return
+        use_cache: Whether the scrapers use the on-disk response cache
+        max_age: Override the configured cache TTL (in seconds)
+        hedge_after: Seconds to wait for the primary backend before asking the other
+        primary: The backend asked first, "api" or "scraper"
+    """
+    merger = TopNewsMerger(limit)
+    results: "asyncio.Queue[Optional[List[Article]]]" = asyncio.Queue()
+
+    async def ask_api() -> None:
+        try:
+            await results.put(await run_in_daemon_thread(fetch_news_from_api, source, category, limit))
+        except Exception:
+            # Out of quota or unreachable; the scrapers can still answer
+            pass
+        finally:
+            results.put_nowait(_DONE)
+
+    async def ask_scraper() -> None:
+        pages = stream_news_websites(source, category, limit, use_cache, max_age)
+        try:
+            async for page_news in pages:
+                # Keep a local copy of every scraped article
+                save_articles(page_news)
+                await results.put(page_news)
+        except Exception:
+            pass
+        finally:
+            await pages.aclose()
+            results.put_nowait(_DONE)
+
+    backends = {"api": ask_api, "scraper": ask_scraper}
+    order = [primary] + [backend for backend in BACKENDS if backend != primary]
+    tasks = [asyncio.ensure_future(backends[order[0]]())]
+    if hedge_after <= 0:
+        tasks.append(asyncio.ensure_future(backends[order[1]]()))
+
+    loop = asyncio.get_running_loop()
+    hedge_at = loop.time() + hedge_after
+    finished = 0
+
+    try:
+        while finished < len(tasks):
+            hedged = len(tasks) == len(order)
+            timeout = None if hedged else max(0.0, hedge_at - loop.time())
+            try:
+                news_items = await asyncio.wait_for(results.get(), timeout)
+            except asyncio.TimeoutError:
+                # The primary backend is slower than usual; ask the other one too
+                tasks.append(asyncio.ensure_future(backends[order[1]]()))
+                continue
+
+            if news_items is _DONE:
+                finished += 1
+                if not hedged and not merger.is_full():
+                    tasks.append(asyncio.ensure_future(backends[order[1]]()))
+                continue
+
+            changed = False
+            for item in news_items:
+                if item.get("title") and item.get("url"):
+                    changed = merger.push(item) or changed
+            if changed:
+                yield merger.items()
+            if merger.is_full():
+                break
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+def iter_hybrid_news(
+    source: Optional[str] = None,
+    category: Optional[str] = None,
+    limit: int = 10,
+    use_cache: bool = True,
+    max_age: Optional[int] = None,
+    hedge_after: float = HYBRID_HEDGE_AFTER,
+    primary: str = HYBRID_PRIMARY
+) -> Iterator[List[Article]]:
+    """
+    Fetch news from NewsAPI and the web scrapers progressively.
+
+    Yields the current `limit` most recent news items, newest first, each
+    time new results change them. The last list yielded is the result.
+    """
+    if source and source not in NEWS_SOURCES:
+        return
+
+    yield from iterate_async(
+        stream_hybrid_news(source, category, limit, use_cache, max_age, hedge_after, primary)
+    )
+
+def iter_hybrid_items(
+    source: Optional[str] = None,
+    category: Optional[str] = None,
+    limit: int = 10,
+    use_cache: bool = True,
+    max_age: Optional[int] = None,
+    hedge_after: float = HYBRID_HEDGE_AFTER,
+    primary: str = HYBRID_PRIMARY
+) -> Iterator[Article]:
+    """
+    Fetch news from NewsAPI and the web scrapers one item at a time.
+
+    An item merged early can still be displaced by newer ones from the
+    other backend, so items are only yielded once the backends have been
+    merged: the `limit` most recent items, newest first.
+    """
+    news_items: List[Article] = []
+    for news_items in iter_hybrid_news(source, category, limit, use_cache, max_age, hedge_after, primary):
+        pass
+    yield from news_items
@@ -2,193 +2,367 @@
 Module for fetching news from NewsAPI.
 """
 
+import datetime
+import json
+import os
+import threading
 import time
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterator, Optional
 
 import requests
 from newsapi import NewsApiClient
+from newsapi.newsapi_exception import NewsAPIException
 
-from utils.config import NEWS_API_KEY, NEWS_SOURCES, MAX_RETRIES, REQUEST_TIMEOUT
-from utils.helpers import normalize_news_item, categorize_article
+from utils import http_client, profiling
+from utils.article import Article
+from utils.config import (
+    MAX_RETRIES,
+    NEWS_API_DAILY_QUOTA,
+    NEWS_API_KEY,
+    NEWS_API_PAGE_SIZE,
+    NEWS_API_QUOTA_PATH,
+    NEWS_SOURCES
+)
+from utils.helpers import normalize_news_item, categorize_articles
+from utils.store import save_articles
+
+# NewsAPI endpoint used by the direct HTTP transport
+EVERYTHING_URL = "https://newsapi.org/v2/everything"
+
+# India-specific keywords added to every query to ensure relevance
+INDIA_TERMS = ["India", "Indian", "Delhi", "Mumbai", "Bangalore"]
+
+# Category-specific keywords added to the query
+CATEGORY_TERMS = {
+    "politics": ["politics", "government", "election", "minister", "parliament"],
+    "business": ["business", "economy", "market", "finance", "stock"],
+    "sports": ["sports", "cricket", "ipl", "match", "tournament"],
+    "entertainment": ["entertainment", "bollywood", "movie", "film", "actor"],
+    "technology": ["technology", "tech", "digital", "software", "app"],
+    "health": ["health", "medical", "doctor", "hospital", "disease"],
+    "science": ["science", "research", "scientist", "study", "discovery"]
+}
+
+# NewsAPI query parameter names of the NewsApiClient keyword arguments
+_HTTP_PARAMS = {"sort_by": "sortBy", "page_size": "pageSize"}
 
 class NewsAPIError(Exception):
     """Exception raised for NewsAPI errors."""
     pass
 
-def fetch_news_from_api(
-    source: Optional[str] = None, 
-    category: Optional[str] = None, 
-    limit: int = 10
-) -> List[Dict[str, Any]]:
+class QuotaExceededError(NewsAPIError):
+    """Exception raised when the daily NewsAPI request quota is used up."""
+    pass
+
+def build_query(source: Optional[str] = None, category: Optional[str] = None) -> Dict[str, Any]:
     """
-    Fetch news from NewsAPI with specified filters.
-    
-    Args:
-        source: The news source to fetch from
-        category: The news category to filter by
-        limit: Maximum number of news items to return
-        
+    Build the `get_everything` arguments for a source and category.
+
     Returns:
-        List of normalized news items
+        Keyword arguments for NewsApiClient.get_everything, without paging
     """
-    try:
-        newsapi = NewsApiClient(api_key=NEWS_API_KEY)
-        
-        # Build query parameters - Using everything endpoint instead of top-headlines
-        query_params = {
-            "language": "en",
-            "pageSize": limit,
-            "sortBy": "publishedAt"
-        }
-        
-        # Add source if specified
-        if source:
-            source_id = NEWS_SOURCES.get(source, {}).get("api_id")
-            if source_id:
-                query_params["sources"] = source_id
-        
-        # Add India-specific keywords to ensure relevance
-        query_terms = ["India", "Indian", "Delhi", "Mumbai", "Bangalore"]
-        
-        # Add category-specific terms if category is specified
-        if category and category != "general":
-            category_terms = {
-                "politics": ["politics", "government", "election", "minister", "parliament"],
-                "business": ["business", "economy", "market", "finance", "stock"],
-                "sports": ["sports", "cricket", "ipl", "match", "tournament"],
-                "entertainment": ["entertainment", "bollywood", "movie", "film", "actor"],
-                "technology": ["technology", "tech", "digital", "software", "app"],
-                "health": ["health", "medical", "doctor", "hospital", "disease"],
-                "science": ["science", "research", "scientist", "study", "discovery"]
-            }
-            if category in category_terms:
-                query_terms.extend(category_terms[category])
-        
-        # Combine query terms with OR operator
-        query_params["q"] = " OR ".join(query_terms)
-        
-        # Try to fetch news with retries
+    query = {
+        "language": "en",
+        "sort_by": "publishedAt"
+    }
+
+    # Add source if specified
+    if source:
+        source_id = NEWS_SOURCES.get(source, {}).get("api_id")
+        if source_id:
+            query["sources"] = source_id
+
+    # Add category-specific terms if category is specified
+    query_terms = list(INDIA_TERMS)
+    if category and category != "general":
+        query_terms.extend(CATEGORY_TERMS.get(category, []))
+
+    # Combine query terms with OR operator
+    query["q"] = " OR ".join(query_terms)
+    return query
+
+class RequestQuota:
+    """
+    Local count of the NewsAPI requests made today.
+
+    The count is persisted so that it survives between runs, and resets
+    when the UTC day changes. Requests are refused once `limit` is
+    reached, before NewsAPI starts answering with 429.
+    """
+
+    def __init__(self, limit: int = NEWS_API_DAILY_QUOTA, path: str = NEWS_API_QUOTA_PATH):
+        self.limit = limit
+        self.path = path
+        self._lock = threading.Lock()
+
+    def _today(self) -> str:
+        return datetime.datetime.now(datetime.timezone.utc).date().isoformat()
+
+    def _load(self) -> int:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return 0
+        if not isinstance(state, dict) or state.get("day") != self._today():
+            return 0
+        return int(state.get("used", 0))
+
+    def _save(self, used: int) -> None:
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"day": self._today(), "used": used}, f)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            # Counting is best-effort; NewsAPI still enforces the quota
+            pass
+
+    def remaining(self) -> int:
+        """Get the number of requests left today."""
+        with self._lock:
+            return max(0, self.limit - self._load())
+
+    def acquire(self) -> bool:
+        """
+        Count one request against today's quota.
+
+        Returns:
+            False if the quota is used up and the request must not be sent
+        """
+        with self._lock:
+            used = self._load()
+            if used >= self.limit:
+                return False
+            self._save(used + 1)
+            return True
+
+    def exhaust(self) -> None:
+        """Mark today's quota as used up, e.g. after NewsAPI rate-limited us."""
+        with self._lock:
+            self._save(self.limit)
+
+class NewsAPIAdapter:
+    """
+    Pages through NewsAPI's everything endpoint with one shared client.
+
+    Pages are requested lazily, so a caller that stops iterating once it
+    has enough articles never pays for the pages it did not need. Every
+    request attempt is counted against the local daily quota.
+    """
+
+    def __init__(
+        self,
+        api_key: str = NEWS_API_KEY,
+        quota: Optional[RequestQuota] = None,
+        page_size: int = NEWS_API_PAGE_SIZE
+    ):
+        self.api_key = api_key
+        self.quota = quota or RequestQuota()
+        self.page_size = page_size
+        self._client: Optional[NewsApiClient] = None
+        self._client_lock = threading.Lock()
+
+    @property
+    def client(self) -> NewsApiClient:
+        """The NewsApiClient, created on first use on the shared session."""
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    self._client = NewsApiClient(api_key=self.api_key, session=http_client.get_session())
+        return self._client
+
+    def _send(self, query: Dict[str, Any], page: int, use_sdk: bool) -> Dict[str, Any]:
+        if use_sdk:
+            return self.client.get_everything(page=page, page_size=self.page_size, **query)
+
+        params = {_HTTP_PARAMS.get(name, name): value for name, value in query.items()}
+        params.update({"page": page, "pageSize": self.page_size})
+        response = http_client.get(
+            EVERYTHING_URL,
+            params=params,
+            headers={"X-Api-Key": self.api_key},
+            retries=1
+        )
+        if response.status_code != 200:
+            raise NewsAPIException(response.json())
+        return response.json()
+
+    def fetch_page(self, query: Dict[str, Any], page: int = 1, use_sdk: bool = True) -> Dict[str, Any]:
+        """
+        Fetch one page of results, retrying transport failures.
+
+        Args:
+            query: Arguments built with build_query
+            page: 1-based page number
+            use_sdk: Send the request with NewsApiClient instead of a direct HTTP request
+
+        Returns:
+            The decoded NewsAPI response
+
+        Raises:
+            QuotaExceededError: If the daily quota is used up
+            NewsAPIError: If NewsAPI returns an error or cannot be reached
+        """
+        try:
+            # All attempts count as one request towards NewsAPI's health, and
+            # a refused request does not spend any quota
+            with http_client.track_request(EVERYTHING_URL):
+                return self._fetch_with_retries(query, page, use_sdk)
+        except http_client.CircuitOpenError as e:
+            # NewsAPI has been failing; don't wait for it to time out again
+            raise NewsAPIError(f"NewsAPI request skipped: {e}") from e
+
+    def _fetch_with_retries(self, query: Dict[str, Any], page: int, use_sdk: bool) -> Dict[str, Any]:
         for attempt in range(MAX_RETRIES):
             try:
-                # Use everything endpoint instead of top-headlines
-                response = newsapi.get_everything(**query_params)
-                break
-            except Exception as e:
+                if not self.quota.acquire():
+                    raise QuotaExceededError(
+                        f"Daily NewsAPI quota of {self.quota.limit} requests is used up"
+                    )
+
+                with profiling.span("request", "NewsAPI"):
+                    return self._send(query, page, use_sdk)
+            except NewsAPIException as e:
+                error = e.get_exception() if isinstance(e.get_exception(), dict) else {}
+                code = error.get("code")
+                if code == "rateLimited":
+                    # Don't spend any more requests today
+                    self.quota.exhaust()
+                    raise QuotaExceededError("NewsAPI rate limit reached") from e
+                if code == "maximumResultsReached":
+                    # The plan does not allow paging any deeper
+                    return {"status": "ok", "articles": []}
+                raise NewsAPIError(f"NewsAPI error: {error.get('message') or code}") from e
+            except requests.RequestException as e:
                 if attempt < MAX_RETRIES - 1:
-                    time.sleep(1)  # Wait before retrying
+                    time.sleep(http_client.backoff_delay(attempt))
                     continue
+                raise NewsAPIError(f"NewsAPI request failed: {e}") from e
+
+        # Not reached: the last attempt either returns or raises
+        raise NewsAPIError("NewsAPI request failed")
+
+    def iter_pages(
+        self,
+        source: Optional[str] = None,
+        category: Optional[str] = None,
+        use_sdk: bool = True
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Lazily yield the raw articles of each results page, newest first.
+
+        Stops after the last page of results.
+        """
+        query = build_query(source, category)
+        page = 1
+        while True:
+            response = self.fetch_page(query, page, use_sdk)
+            articles = response.get("articles") or []
+            if articles:
+                yield articles
+
+            total = response.get("totalResults") or 0
+            if len(articles) < self.page_size or page * self.page_size >= total:
+                return
+            page += 1
+
+# Shared adapter, so the client and its connections are reused across calls
+news_api = NewsAPIAdapter()
+
+def iter_news_items(
+    pages: Iterator[List[Dict[str, Any]]],
+    category: Optional[str] = None,
+    limit: int = 10
+) -> Iterator[Article]:
+    """
+    Normalize raw NewsAPI articles page by page and yield them until `limit` are yielded.
+
+    Articles repeated on a later page (NewsAPI pages shift while new
+    articles are published) are skipped. Only as many articles of a page
+    as are still needed are categorized and normalized. Each page is saved
+    to the store before its articles are yielded, and the next page is
+    only requested once they have all been consumed.
+    """
+    seen_ids = set()
+    remaining = limit
+
+    for articles in pages:
+        news_items: List[Article] = []
+        start = 0
+        # Skipped repeats make room for the next articles of the page
+        while len(news_items) < remaining and start < len(articles):
+            batch = articles[start:start + remaining - len(news_items)]
+            start += len(batch)
+
+            # Categorize in one batch if not specified
+            with profiling.span("categorize", "NewsAPI"):
+                if not category or category == "general":
+                    categories = categorize_articles(batch)
                 else:
-                    # If all retries fail, try fallback method
-                    return fetch_news_fallback(source, category, limit)
-        
-        # Process results
-        articles = response.get("articles", [])
-        
-        if not articles:
-            # If no results, try fallback method
-            return fetch_news_fallback(source, category, limit)
-        
-        # Normalize news items
-        news_items = []
-        for article in articles[:limit]:
-            source_name = article.get("source", {}).get("name", "Unknown")
-            
-            # Categorize if not specified
-            if not category or category == "general":
-                article_category = categorize_article(
-                    article.get("title", ""), 
-                    article.get("description", "")
-                )
-                article["category"] = article_category
-            else:
-                article["category"] = category
-                
-            news_items.append(normalize_news_item(article, source_name))
-            
-        return news_items
-        
-    except Exception as e:
-        # If NewsAPI fails, try fallback method
-        return fetch_news_fallback(source, category, limit)
-
-def fetch_news_fallback(
-    source: Optional[str] = None, 
-    category: Optional[str] = None, 
+                    categories = [category] * len(batch)
+
+            # Normalize news items
+            with profiling.span("normalize", "NewsAPI"):
+                for article, article_category in zip(batch, categories):
+                    source_name = (article.get("source") or {}).get("name", "Unknown")
+                    article["category"] = article_category
+                    item = normalize_news_item(article, source_name)
+                    if item.id in seen_ids:
+                        continue
+                    seen_ids.add(item.id)
+                    news_items.append(item)
+
+        # Keep a local copy of every fetched article
+        save_articles(news_items)
+        profiling.count("articles", len(news_items), "NewsAPI")
+
+        yield from news_items
+        remaining -= len(news_items)
+
+        # Don't request any more pages once we have enough
+        if remaining <= 0:
+            break
+
+def iter_news_from_api(
+    source: Optional[str] = None,
+    category: Optional[str] = None,
     limit: int = 10
-) -> List[Dict[str, Any]]:
+) -> Iterator[Article]:
     """
-    Fallback method for fetching news when NewsAPI fails.
-    Uses a direct HTTP request to the NewsAPI endpoint.
+    Fetch news from NewsAPI one item at a time.
+
+    Same as fetch_news_from_api, but yields each item as soon as its page
+    has been normalized.
+
+    Raises:
+        QuotaExceededError: If the daily NewsAPI quota is used up
     """
     try:
-        # Build URL and parameters - Using everything endpoint instead of top-headlines
-        url = "https://newsapi.org/v2/everything"
-        
-        params = {
-            "apiKey": NEWS_API_KEY,
-            "language": "en",
-            "pageSize": limit,
-            "sortBy": "publishedAt"
-        }
-        
-        # Add source if specified
-        if source:
-            source_id = NEWS_SOURCES.get(source, {}).get("api_id")
-            if source_id:
-                params["sources"] = source_id
-                
-        # Add India-specific keywords
-        query_terms = ["India", "Indian", "Delhi", "Mumbai", "Bangalore"]
-        
-        # Add category-specific terms if category is specified
-        if category and category != "general":
-            category_terms = {
-                "politics": ["politics", "government", "election", "minister", "parliament"],
-                "business": ["business", "economy", "market", "finance", "stock"],
-                "sports": ["sports", "cricket", "ipl", "match", "tournament"],
-                "entertainment": ["entertainment", "bollywood", "movie", "film", "actor"],
-                "technology": ["technology", "tech", "digital", "software", "app"],
-                "health": ["health", "medical", "doctor", "hospital", "disease"],
-                "science": ["science", "research", "scientist", "study", "discovery"]
-            }
-            if category in category_terms:
-                query_terms.extend(category_terms[category])
-        
-        # Combine query terms with OR operator
-        params["q"] = " OR ".join(query_terms)
-        
-        # Make request
-        response = requests.get(
-            url, 
-            params=params, 
-            timeout=REQUEST_TIMEOUT
-        )
-        
-        if response.status_code != 200:
-            raise NewsAPIError(f"API request failed with status code {response.status_code}")
-            
-        data = response.json()
-        articles = data.get("articles", [])
-        
-        # Normalize news items
-        news_items = []
-        for article in articles[:limit]:
-            source_name = article.get("source", {}).get("name", "Unknown")
-            
-            # Categorize if not specified
-            if not category or category == "general":
-                article_category = categorize_article(
-                    article.get("title", ""), 
-                    article.get("description", "")
-                )
-                article["category"] = article_category
-            else:
-                article["category"] = category
-                
-            news_items.append(normalize_news_item(article, source_name))
-            
-        return news_items
-        
-    except Exception as e:
-        # If all methods fail, return empty list
-        return [] 
\ No newline at end of file
+        yield from iter_news_items(news_api.iter_pages(source, category), category, limit)
+    except QuotaExceededError:
+        raise
+    except NewsAPIError:
+        return
+
+def fetch_news_from_api(
+    source: Optional[str] = None,
+    category: Optional[str] = None,
+    limit: int = 10
+) -> List[Article]:
+    """
+    Fetch news from NewsAPI with specified filters.
+
+    Args:
+        source: The news source to fetch from
+        category: The news category to filter by
+        limit: Maximum number of news items to return
+
+    Returns:
+        List of normalized articles
+
+    Raises:
+        QuotaExceededError: If the daily NewsAPI quota is used up
+    """
+    return list(iter_news_from_api(source, category, limit))
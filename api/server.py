@@ -0,0 +1,332 @@
+"""
+Local HTTP/JSON API serving headlines from memory.
+
+The headlines of each (mode, source, category) are fetched once, kept in
+memory and refreshed in the background, so requests are answered without
+waiting for NewsAPI or the news websites. Concurrent requests for
+headlines that are not in memory yet share a single upstream fetch.
+
+Endpoints:
+    GET /headlines?source=&category=&limit=&mode=
+    GET /health
+"""
+
+import asyncio
+import json
+import time
+from http import HTTPStatus
+from typing import List, Dict, Any, Callable, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from api.headlines import MODES, fetch_headlines
+from api.news_api import NewsAPIError
+from scrapers.web_scraper import run_in_daemon_thread
+from utils.article import Article, json_default
+from utils.config import (
+    CATEGORIES,
+    NEWS_SOURCES,
+    SERVE_API_REFRESH_AFTER,
+    SERVE_FETCH_LIMIT,
+    SERVE_IDLE_AFTER,
+    SERVE_REFRESH_AFTER
+)
+
+# Headlines returned when a request does not give a limit
+DEFAULT_LIMIT = 10
+
+# How often (in seconds) the refresher looks for stale and idle headlines
+REFRESH_CHECK_INTERVAL = 1.0
+
+# Most header lines read from a single request
+MAX_HEADER_LINES = 100
+
+# (mode, source, category) of a set of headlines
+HeadlinesKey = Tuple[str, Optional[str], Optional[str]]
+
+class RequestError(Exception):
+    """Exception raised for requests that cannot be answered."""
+
+    def __init__(self, status: HTTPStatus, message: str):
+        super().__init__(message)
+        self.status = status
+
+class CachedHeadlines:
+    """Headlines of one (mode, source, category), with each article encoded as JSON once."""
+
+    __slots__ = ("encoded", "fetched_at", "refreshed_at", "requested_at")
+
+    def __init__(self, items: List[Article], fetched_at: float):
+        self.encoded = [
+            json.dumps(item, ensure_ascii=False, default=json_default).encode("utf-8")
+            for item in items
+        ]
+        self.fetched_at = fetched_at
+        # When a refresh was last started, whether or not it got any headlines
+        self.refreshed_at = fetched_at
+        self.requested_at = fetched_at
+
+    def to_json(self, key: HeadlinesKey, limit: int) -> bytes:
+        """Encode the first `limit` headlines and their metadata as a JSON object."""
+        mode, source, category = key
+        head = json.dumps({
+            "mode": mode,
+            "source": source,
+            "category": category,
+            "fetched_at": int(self.fetched_at),
+            "age": round(time.time() - self.fetched_at, 1)
+        })
+        return b"".join((
+            head[:-1].encode("utf-8"),
+            b', "items": [',
+            b", ".join(self.encoded[:limit]),
+            b"]}"
+        ))
+
+class HeadlinesService:
+    """
+    Headlines kept in memory, refreshed in the background.
+
+    Headlines are fetched on their first request, then refreshed whenever
+    they are older than `refresh_after` seconds (`api_refresh_after` for
+    NewsAPI) for as long as they keep being requested. Only one fetch of
+    the same headlines runs at a time; every request that needs them
+    waits for that fetch instead of starting another.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[str, Optional[str], Optional[str], int], List[Article]] = fetch_headlines,
+        fetch_limit: int = SERVE_FETCH_LIMIT,
+        refresh_after: float = SERVE_REFRESH_AFTER,
+        api_refresh_after: float = SERVE_API_REFRESH_AFTER,
+        idle_after: float = SERVE_IDLE_AFTER
+    ):
+        self.fetch = fetch
+        self.fetch_limit = fetch_limit
+        self.refresh_after = refresh_after
+        self.api_refresh_after = api_refresh_after
+        self.idle_after = idle_after
+        self.upstream_fetches = 0
+        self._entries: Dict[HeadlinesKey, CachedHeadlines] = {}
+        self._fetches: Dict[HeadlinesKey, "asyncio.Task[CachedHeadlines]"] = {}
+
+    async def get(self, key: HeadlinesKey) -> CachedHeadlines:
+        """
+        Get headlines, fetching them first if they are not in memory.
+
+        Raises:
+            RequestError: If the headlines are not in memory and cannot be fetched
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            # Shield the shared fetch from requests that are cancelled while waiting
+            try:
+                entry = await asyncio.shield(self._start_fetch(key))
+            except NewsAPIError as e:
+                raise RequestError(HTTPStatus.SERVICE_UNAVAILABLE, str(e)) from e
+            except Exception as e:
+                raise RequestError(HTTPStatus.BAD_GATEWAY, f"Fetching headlines failed: {e}") from e
+        entry.requested_at = time.time()
+        return entry
+
+    def _start_fetch(self, key: HeadlinesKey) -> "asyncio.Task[CachedHeadlines]":
+        """Start fetching headlines, unless a fetch of them is already running."""
+        task = self._fetches.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch(key))
+            self._fetches[key] = task
+            task.add_done_callback(lambda done: self._fetch_done(key, done))
+        return task
+
+    def _fetch_done(self, key: HeadlinesKey, task: "asyncio.Task[CachedHeadlines]") -> None:
+        self._fetches.pop(key, None)
+        if not task.cancelled():
+            # Failed background refreshes keep the headlines in memory
+            task.exception()
+
+    async def _fetch(self, key: HeadlinesKey) -> CachedHeadlines:
+        mode, source, category = key
+        entry = self._entries.get(key)
+        if entry is not None:
+            # A failed refresh is retried after the next refresh interval
+            entry.refreshed_at = time.time()
+
+        self.upstream_fetches += 1
+        items = await run_in_daemon_thread(self.fetch, mode, source, category, self.fetch_limit)
+
+        entry = self._entries.get(key)
+        if items or entry is None:
+            requested_at = entry.requested_at if entry else time.time()
+            entry = CachedHeadlines(items, time.time())
+            entry.requested_at = requested_at
+            self._entries[key] = entry
+        # Otherwise keep the headlines we have rather than blanking them out
+        return entry
+
+    async def run_refresher(self) -> None:
+        """Refresh stale headlines and drop idle ones, until cancelled."""
+        while True:
+            await asyncio.sleep(REFRESH_CHECK_INTERVAL)
+            now = time.time()
+            for key, entry in list(self._entries.items()):
+                if now - entry.requested_at >= self.idle_after:
+                    del self._entries[key]
+                    continue
+                refresh_after = self.api_refresh_after if key[0] == "api" else self.refresh_after
+                if now - entry.refreshed_at >= refresh_after:
+                    self._start_fetch(key)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the number of headline sets in memory and of upstream fetches so far."""
+        return {
+            "pages": len(self._entries),
+            "fetching": len(self._fetches),
+            "upstream_fetches": self.upstream_fetches
+        }
+
+class HeadlinesServer:
+    """
+    Minimal HTTP/1.1 server of the headlines API.
+
+    Connections are kept alive between requests, so a client that reuses
+    its connection pays no connection setup per request.
+    """
+
+    def __init__(self, service: HeadlinesService, default_mode: str = "scraper"):
+        self.service = service
+        self.default_mode = default_mode
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Answer the requests sent on one connection."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+
+                headers: Dict[str, str] = {}
+                for _ in range(MAX_HEADER_LINES):
+                    line = await reader.readline()
+                    if not line.strip():
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    self._write_response(writer, HTTPStatus.BAD_REQUEST, _error_body("Malformed request line"), False)
+                    break
+
+                connection = headers.get("connection", "").lower()
+                keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+                # Request bodies are not read, so a connection that sent one cannot be reused
+                if headers.get("content-length", "0") != "0" or "transfer-encoding" in headers:
+                    keep_alive = False
+
+                status, body = await self.dispatch(method, target)
+                self._write_response(writer, status, body, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, ValueError):
+            # The client went away or sent something we can't read
+            pass
+        finally:
+            writer.close()
+
+    async def dispatch(self, method: str, target: str) -> Tuple[HTTPStatus, bytes]:
+        """Answer one request with a status and a JSON body."""
+        if method != "GET":
+            return HTTPStatus.METHOD_NOT_ALLOWED, _error_body("Only GET is supported")
+
+        url = urlsplit(target)
+        try:
+            if url.path == "/headlines":
+                key, limit = self._parse_headlines_query(url.query)
+                entry = await self.service.get(key)
+                return HTTPStatus.OK, entry.to_json(key, limit)
+            if url.path == "/health":
+                return HTTPStatus.OK, json.dumps({"status": "ok", **self.service.stats()}).encode("utf-8")
+        except RequestError as e:
+            return e.status, _error_body(str(e))
+        return HTTPStatus.NOT_FOUND, _error_body(f"Unknown path: {url.path}")
+
+    def _parse_headlines_query(self, query: str) -> Tuple[HeadlinesKey, int]:
+        """
+        Get the headlines key and limit of a /headlines query string.
+
+        Raises:
+            RequestError: If a parameter is invalid
+        """
+        params = {name: values[-1] for name, values in parse_qs(query).items()}
+
+        source = params.get("source") or None
+        if source is not None and source not in NEWS_SOURCES:
+            raise RequestError(HTTPStatus.BAD_REQUEST, f"Unknown source: {source}")
+
+        category = params.get("category") or None
+        if category is not None and category not in CATEGORIES:
+            raise RequestError(HTTPStatus.BAD_REQUEST, f"Unknown category: {category}")
+
+        mode = params.get("mode") or self.default_mode
+        if mode not in MODES:
+            raise RequestError(HTTPStatus.BAD_REQUEST, f"Unknown mode: {mode}")
+
+        try:
+            limit = int(params.get("limit", DEFAULT_LIMIT))
+        except ValueError:
+            limit = 0
+        if not 1 <= limit <= self.service.fetch_limit:
+            raise RequestError(
+                HTTPStatus.BAD_REQUEST, f"limit must be between 1 and {self.service.fetch_limit}"
+            )
+
+        return (mode, source, category), limit
+
+    def _write_response(
+        self,
+        writer: asyncio.StreamWriter,
+        status: HTTPStatus,
+        body: bytes,
+        keep_alive: bool
+    ) -> None:
+        head = (
+            f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            "Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+            "\r\n"
+        )
+        writer.write(head.encode("latin-1") + body)
+
+def _error_body(message: str) -> bytes:
+    return json.dumps({"error": message}).encode("utf-8")
+
+async def serve_headlines(
+    host: str,
+    port: int,
+    default_mode: str = "scraper",
+    on_start: Optional[Callable[[str, int], None]] = None
+) -> None:
+    """
+    Run the headlines API until cancelled.
+
+    Args:
+        host: Address to listen on
+        port: Port to listen on (0 picks a free one)
+        default_mode: Backend used when a request does not name one
+        on_start: Called with the address and port once the server is listening
+    """
+    service = HeadlinesService()
+    server = HeadlinesServer(service, default_mode)
+    listener = await asyncio.start_server(server.handle_connection, host, port)
+    refresher = asyncio.ensure_future(service.run_refresher())
+    try:
+        if on_start is not None:
+            address = listener.sockets[0].getsockname()
+            on_start(address[0], address[1])
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        refresher.cancel()
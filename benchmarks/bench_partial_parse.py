@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Benchmark partial (strained) parsing against a full parse of scraped pages.
+
+Usage:
+    python benchmarks/bench_partial_parse.py [--cards 2000] [--limit 10]
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+# Add the repository root to sys.path to allow imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.pages import generate_page
+from scrapers.extractor import HTML_PARSER, parse_articles
+from utils.config import NEWS_SOURCES
+
+def measure(body, source_info, limit, partial, parser, repeat):
+    """Return the best time and the peak memory of parsing and extracting a page."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        parse_articles(body, source_info, "general", limit, partial=partial, parser=parser)
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    parse_articles(body, source_info, "general", limit, partial=partial, parser=parser)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return best, peak
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--cards", type=int, default=2000, help="Article cards per page")
+    parser.add_argument("--limit", type=int, default=10, help="Articles to extract")
+    parser.add_argument("--repeat", type=int, default=3, help="Timing repetitions")
+    parser.add_argument("--parser", default=HTML_PARSER, help="BeautifulSoup parser")
+    args = parser.parse_args()
+
+    print(f"parser={args.parser} cards={args.cards} limit={args.limit}")
+    print(f"{'source':<16}{'size':>10}{'full s':>10}{'partial s':>11}{'speedup':>9}"
+          f"{'full MB':>10}{'partial MB':>12}")
+
+    for source, source_info in NEWS_SOURCES.items():
+        body = generate_page(source, args.cards)
+        full_time, full_peak = measure(body, source_info, args.limit, False, args.parser, args.repeat)
+        part_time, part_peak = measure(body, source_info, args.limit, True, args.parser, args.repeat)
+
+        print(f"{source:<16}{len(body) // 1024:>8}KB{full_time:>10.3f}{part_time:>11.3f}"
+              f"{full_time / part_time:>8.1f}x{full_peak / 2**20:>10.1f}{part_peak / 2**20:>12.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+Benchmark every scraper offline against recorded and synthetic pages.
+
+Pages are served by a local stand-in HTTP server: the recorded front and
+category pages in benchmarks/fixtures/<source>/<category>.html, plus
+synthetic pages of each source at 1x, 10x and 100x the usual card count.
+For every page, the fetch, parse, select, categorize and normalize stages
+and the whole scrape_web_page pipeline are timed, and their peak
+memory is traced. Results can be written as JSON and compared with an
+earlier run to catch regressions.
+
+Usage:
+    python benchmarks/bench_scrapers.py [--output results.json] [--compare baseline.json]
+    python benchmarks/bench_scrapers.py --record   # re-record the fixtures from the live sites
+"""
+
+import argparse
+import datetime
+import http.server
+import json
+import os
+import platform
+import sys
+import threading
+import time
+import tracemalloc
+
+# Add the repository root to sys.path to allow imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.pages import generate_page
+from scrapers import web_scraper
+from scrapers.extractor import HTML_PARSER, parse_page, select_articles
+from utils import http_client
+from utils.config import NEWS_SOURCES, PARTIAL_PARSE
+from utils.helpers import categorize_articles, normalize_article
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+# Cards on a typical front page; synthetic pages are multiples of this
+BASE_CARDS = 30
+
+# Synthetic page sizes, as multiples of BASE_CARDS
+SCALES = (1, 10, 100)
+
+STAGES = ("fetch", "parse", "select", "categorize", "normalize", "pipeline")
+
+class PageHandler(http.server.BaseHTTPRequestHandler):
+    """Serve the benchmark pages from memory."""
+
+    pages = {}
+
+    def do_GET(self):
+        body = self.pages.get(self.path)
+        if body is None:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def record_fixtures(directory):
+    """Download the front and category pages of every source into `directory`."""
+    for source, source_info in NEWS_SOURCES.items():
+        os.makedirs(os.path.join(directory, source), exist_ok=True)
+        for category, category_path in source_info.get("categories", {}).items():
+            url = source_info["scrape_url"] + category_path
+            try:
+                response = http_client.get(url)
+            except Exception as e:
+                print(f"skip {source}/{category}: {e}")
+                continue
+            if response.status_code != 200:
+                print(f"skip {source}/{category}: HTTP {response.status_code}")
+                continue
+            with open(os.path.join(directory, source, f"{category}.html"), "wb") as f:
+                f.write(response.content)
+            print(f"recorded {source}/{category} ({len(response.content) // 1024} KB)")
+
+def load_pages(directory, scales):
+    """
+    Get the benchmark pages: recorded fixtures, then synthetic pages.
+
+    Returns:
+        List of dicts with the source, page name, category and body of each page
+    """
+    pages = []
+    for source, source_info in NEWS_SOURCES.items():
+        for category in source_info.get("categories", {}):
+            path = os.path.join(directory, source, f"{category}.html")
+            if os.path.exists(path):
+                with open(path, "rb") as f:
+                    pages.append({"source": source, "page": category, "category": category, "body": f.read()})
+
+        for scale in scales:
+            pages.append({
+                "source": source,
+                "page": f"synthetic-{scale}x",
+                "category": "general",
+                "cards": BASE_CARDS * scale,
+                "body": generate_page(source, BASE_CARDS * scale, filler_every=3)
+            })
+    return pages
+
+def measure(func, repeat):
+    """Return the best time, the peak traced memory and the result of calling func."""
+    # Warm up caches (compiled selectors, date formats) outside the timing
+    result = func()
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return best, peak, result
+
+def bench_page(page, server_url, limit, repeat):
+    """Time every stage of scraping one page and return a result per stage."""
+    source = page["source"]
+    source_info = NEWS_SOURCES[source]
+    category_path = source_info["categories"][page["category"]]
+
+    # Point the source at the stand-in server for this page
+    scrape_url = f"{server_url}/{page['page']}/{source}"
+    PageHandler.pages[f"/{page['page']}/{source}{category_path}"] = page["body"]
+
+    timings = {}
+    original_url = source_info["scrape_url"]
+    source_info["scrape_url"] = scrape_url
+    try:
+        timings["fetch"] = measure(lambda: http_client.get(scrape_url + category_path).content, repeat)
+        timings["parse"] = measure(
+            lambda: parse_page(page["body"], source_info, limit, partial=PARTIAL_PARSE), repeat
+        )
+        soup = timings["parse"][2]
+        timings["select"] = measure(lambda: select_articles(soup, source_info, limit), repeat)
+        raw_items = timings["select"][2]
+        timings["categorize"] = measure(lambda: categorize_articles(raw_items), repeat)
+        categories = timings["categorize"][2]
+        # Articles are normalized in place, so every run normalizes fresh copies
+        timings["normalize"] = measure(
+            lambda: [
+                normalize_article(item.copy(), category)
+                for item, category in zip(raw_items, categories)
+            ],
+            repeat
+        )
+        timings["pipeline"] = measure(
+            lambda: web_scraper.scrape_web_page(source, page["category"], limit, use_cache=False),
+            repeat
+        )
+    finally:
+        source_info["scrape_url"] = original_url
+
+    results = []
+    for stage in STAGES:
+        seconds, peak, _ = timings[stage]
+        seconds = max(seconds, 1e-9)
+        items = len(raw_items) if stage != "pipeline" else len(timings["pipeline"][2])
+        results.append({
+            "source": source,
+            "page": page["page"],
+            "bytes": len(page["body"]),
+            "cards": page.get("cards"),
+            "stage": stage,
+            "items": items,
+            "ms": round(seconds * 1000, 3),
+            "pages_per_s": round(1 / seconds, 2),
+            "items_per_s": round(items / seconds, 1),
+            "peak_kb": round(peak / 1024, 1)
+        })
+    return results
+
+def compare(results, baseline, tolerance, min_ms=1.0):
+    """
+    Compare results with a baseline run.
+
+    Stages that took under `min_ms` in both runs are only compared for
+    memory, since their timings are mostly timer noise.
+
+    Returns:
+        Descriptions of the stages that got slower or use more memory
+        than the baseline by more than `tolerance`
+    """
+    previous = {(r["source"], r["page"], r["stage"]): r for r in baseline.get("results", [])}
+    regressions = []
+    for result in results:
+        before = previous.get((result["source"], result["page"], result["stage"]))
+        if not before:
+            continue
+        label = f"{result['source']}/{result['page']}/{result['stage']}"
+        timed = max(result["ms"], before["ms"]) >= min_ms
+        if timed and result["pages_per_s"] < before["pages_per_s"] * (1 - tolerance):
+            regressions.append(
+                f"{label}: {before['pages_per_s']} -> {result['pages_per_s']} pages/s"
+            )
+        if result["peak_kb"] > before["peak_kb"] * (1 + tolerance):
+            regressions.append(f"{label}: {before['peak_kb']} -> {result['peak_kb']} KB peak")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--fixtures", default=FIXTURES_DIR, help="Directory of recorded pages")
+    parser.add_argument("--record", action="store_true", help="Record the fixtures from the live sites and exit")
+    parser.add_argument("--scales", type=int, nargs="*", default=list(SCALES), help="Synthetic page scales")
+    parser.add_argument("--limit", type=int, default=10, help="Articles to extract per page")
+    parser.add_argument("--repeat", type=int, default=3, help="Timing repetitions (the best is kept)")
+    parser.add_argument("--workers", type=int, default=0,
+                        help="Parse worker processes for the pipeline stage (0 parses in-process)")
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+    parser.add_argument("--compare", help="Compare with the JSON results of an earlier run")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="Allowed slowdown or memory growth before a stage counts as regressed "
+                             "(raise it, or --repeat, on noisy machines)")
+    parser.add_argument("--min-ms", type=float, default=1.0,
+                        help="Stages faster than this are not compared for speed")
+    args = parser.parse_args()
+
+    if args.record:
+        record_fixtures(args.fixtures)
+        return
+
+    web_scraper.PARSE_WORKERS = args.workers
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), PageHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    server_url = f"http://127.0.0.1:{server.server_port}"
+
+    results = []
+    print(f"parser={HTML_PARSER} partial={PARTIAL_PARSE} limit={args.limit} repeat={args.repeat}")
+    print(f"{'source':<16}{'page':<18}{'stage':<12}{'KB':>8}{'ms':>10}{'pages/s':>10}"
+          f"{'items/s':>11}{'peak KB':>10}")
+
+    try:
+        for page in load_pages(args.fixtures, args.scales):
+            for result in bench_page(page, server_url, args.limit, args.repeat):
+                results.append(result)
+                print(f"{result['source']:<16}{result['page']:<18}{result['stage']:<12}"
+                      f"{result['bytes'] // 1024:>8}{result['ms']:>10.2f}{result['pages_per_s']:>10.1f}"
+                      f"{result['items_per_s']:>11.1f}{result['peak_kb']:>10.1f}")
+    finally:
+        server.shutdown()
+        web_scraper.shutdown_parse_pool()
+
+    report = {
+        "meta": {
+            "date": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "parser": HTML_PARSER,
+            "partial": PARTIAL_PARSE,
+            "limit": args.limit,
+            "repeat": args.repeat,
+            "workers": args.workers
+        },
+        "results": results
+    }
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.tolerance, args.min_ms)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        sys.exit(1 if regressions else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Benchmark the start-up time of the CLI entry point against a budget.
+
+Runs `main.py --help` and a cached `main.py headlines --offline` (as a
+table and as JSON lines) under `python -X importtime`, and fails if any is
+over its import-time budget or imports one of the heavy modules it should
+defer. Import times exclude
+what the bare interpreter imports at start-up.
+
+Usage:
+    python benchmarks/bench_startup.py [--runs 5] [--budget-ms 200]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Add the repository root to sys.path to allow imports
+sys.path.insert(0, ROOT)
+
+# Command line, and the modules it must not import
+SCENARIOS = {
+    "help": (["--help"], ["bs4", "newsapi", "requests", "asyncio", "sqlite3"]),
+    "headlines-cached": (["headlines", "--offline", "--limit", "10"], ["bs4", "newsapi", "requests", "asyncio"]),
+    "headlines-jsonl": (
+        ["headlines", "--offline", "--limit", "10", "--format", "jsonl"],
+        ["bs4", "newsapi", "requests", "asyncio", "rich"]
+    )
+}
+
+def seed_store(data_dir):
+    """Fill a throwaway article store for the cached headlines scenario."""
+    from utils.store import ArticleStore
+
+    store = ArticleStore(os.path.join(data_dir, "articles.db"))
+    store.upsert([
+        {
+            "title": f"Benchmark headline {i}",
+            "url": f"https://example.com/news/{i}",
+            "source": "The Hindu",
+            "category": "general",
+            "published_ts": 1700000000 + i
+        }
+        for i in range(50)
+    ])
+    store.close()
+
+def parse_importtime(stderr):
+    """
+    Parse `-X importtime` output.
+
+    Returns:
+        Total import time in microseconds, the set of imported modules and
+        the cumulative time of each top-level import
+    """
+    total = 0
+    modules = set()
+    top_level = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|", 2)
+        try:
+            cumulative = int(cumulative)
+        except ValueError:
+            # Header line
+            continue
+        module = name.strip()
+        modules.add(module)
+        if not name[1:].startswith(" "):
+            top_level[module] = cumulative
+            total += cumulative
+    return total, modules, top_level
+
+def run_scenario(args, env, runs):
+    """Return the median wall time (s) and import time (us) of running Python with `args`, and the last run's modules."""
+    wall_times, import_times = [], []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", *args],
+            cwd=ROOT, env=env, capture_output=True, text=True
+        )
+        wall_times.append(time.perf_counter() - start)
+        total, modules, top_level = parse_importtime(result.stderr)
+        import_times.append(total)
+    return statistics.median(wall_times), statistics.median(import_times), modules, top_level
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="Runs per scenario (the median is reported)")
+    parser.add_argument("--budget-ms", type=float, default=200, help="Import-time budget per scenario")
+    parser.add_argument("--top", type=int, default=5, help="Heaviest top-level imports to list")
+    args = parser.parse_args()
+
+    failures = []
+    with tempfile.TemporaryDirectory() as data_dir:
+        seed_store(data_dir)
+        env = dict(os.environ, NEWS_AGGREGATOR_HOME=data_dir, COLUMNS="120")
+
+        base_wall, base_imports, base_modules, _ = run_scenario(["-c", "pass"], env, args.runs)
+
+        print(f"budget={args.budget_ms:.0f}ms runs={args.runs}")
+        print(f"{'scenario':<20}{'wall ms':>10}{'import ms':>11}")
+        print(f"{'(interpreter)':<20}{base_wall * 1000:>10.1f}{base_imports / 1000:>11.1f}")
+
+        for name, (cli_args, forbidden) in SCENARIOS.items():
+            wall, imports, modules, top_level = run_scenario(
+                [os.path.join(ROOT, "main.py"), *cli_args], env, args.runs
+            )
+            imports = max(0, imports - base_imports)
+            print(f"{name:<20}{wall * 1000:>10.1f}{imports / 1000:>11.1f}")
+
+            heaviest = sorted(
+                (item for item in top_level.items() if item[0] not in base_modules),
+                key=lambda item: item[1],
+                reverse=True
+            )[:args.top]
+            for module, cumulative in heaviest:
+                print(f"    {module:<30}{cumulative / 1000:>8.1f}ms")
+
+            if imports / 1000 > args.budget_ms:
+                failures.append(f"{name}: imports took {imports / 1000:.1f}ms (budget {args.budget_ms:.0f}ms)")
+            loaded = sorted(module for module in forbidden if module in modules)
+            if loaded:
+                failures.append(f"{name}: imports {', '.join(loaded)} at start-up")
+
+    for failure in failures:
+        print(f"FAIL {failure}")
+    sys.exit(1 if failures else 0)
+
+if __name__ == "__main__":
+    main()
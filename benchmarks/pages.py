@@ -0,0 +1,67 @@
+"""
+Synthetic news pages for the benchmarks.
+
+Pages mimic the markup matched by the "selectors" of each NEWS_SOURCES
+entry, padded with navigation and other filler like real front pages.
+"""
+
+from typing import Dict
+
+# Markup of one article card per source
+CARD_TEMPLATES: Dict[str, str] = {
+    "the-hindu": (
+        '<div class="story-card"><a href="/news/national/article{i}.ece">'
+        '<img src="/img/{i}.jpg"></a><h3 class="title"><a href="/news/national/article{i}.ece">'
+        'Government announces new cricket policy {i}</a></h3>'
+        '<p class="intro">The minister said the plan would benefit players across India.</p>'
+        '<span class="dateline">15 May 2023 14:30</span></div>'
+    ),
+    "times-of-india": (
+        '<div class="card-container"><a href="/india/story-{i}.cms">'
+        '<img src="/img/{i}.jpg"><span class="title">Stock market rallies as rupee gains {i}</span></a>'
+        '<p class="synopsis">Markets closed higher on Friday after strong trade data.</p>'
+        '<span class="date">15 May 2023 14:30</span></div>'
+    ),
+    "indian-express": (
+        '<div class="article"><a href="/article/india/story-{i}/">'
+        '<img src="/img/{i}.jpg"></a><h2 class="title"><a href="/article/india/story-{i}/">'
+        'ISRO scientists complete space research study {i}</a></h2>'
+        '<p class="description">The discovery was published by researchers in Bengaluru.</p>'
+        '<div class="date">15 May 2023 14:30</div></div>'
+    ),
+    "ndtv": (
+        '<div class="news_item"><a href="/india-news/story-{i}">'
+        '<img src="/img/{i}.jpg"></a><h2 class="newsHdng"><a href="/india-news/story-{i}">'
+        'Bollywood actor announces new film {i}</a></h2>'
+        '<p class="newsCont">The movie is expected to release in cinemas next year.</p>'
+        '<span class="posted-on">15 May 2023 14:30</span></div>'
+    )
+}
+
+# Navigation and promo markup placed between cards
+FILLER = (
+    '<div class="nav-block"><ul>'
+    + '<li class="nav-item"><a href="/section/{j}">Section {j}</a></li>' * 40
+    + '</ul><script>window.dataLayer = window.dataLayer || [];</script></div>'
+)
+
+def generate_page(source: str, cards: int, filler_every: int = 1) -> bytes:
+    """
+    Generate a synthetic page for a source with the given number of cards.
+
+    A filler block is inserted before every `filler_every` cards.
+    """
+    template = CARD_TEMPLATES[source]
+    parts = ["<html><head><title>News</title></head><body>"]
+    if source == "times-of-india":
+        parts.append('<div class="main-content">')
+
+    for i in range(cards):
+        if filler_every and i % filler_every == 0:
+            parts.append(FILLER.replace("{j}", str(i)))
+        parts.append(template.format(i=i))
+
+    if source == "times-of-india":
+        parts.append("</div>")
+    parts.append("</body></html>")
+    return "".join(parts).encode("utf-8")
@@ -6,8 +6,9 @@ This provides a simple menu-based interface for non-technical users.
 
 import os
 import sys
-import subprocess
 import platform
+import threading
+import time
 
 # Add the parent directory to sys.path to allow imports
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
@@ -20,7 +21,79 @@ from rich.table import Table
 console = Console()
 
 # Categories and sources from config
-from utils.config import CATEGORIES, NEWS_SOURCES
+from utils.config import CATEGORIES, LAUNCHER_REFRESH_AFTER, NEWS_SOURCES
+
+from main import display_news, get_headlines
+
+# Number of headlines shown for each menu choice
+HEADLINES_LIMIT = 10
+
+# Backend headlines are fetched from, the default of `main.py headlines`
+HEADLINES_MODE = 'api'
+
+def fetch_headlines(category=None, source=None):
+    """Fetch headlines the same way `main.py headlines --mode HEADLINES_MODE` does."""
+    return get_headlines(source, category, HEADLINES_LIMIT, HEADLINES_MODE)
+
+class HeadlinesCache:
+    """
+    Headlines of each (category, source) choice kept in memory.
+    
+    Cached headlines are shown right away, and refreshed on a background
+    thread once they are older than `refresh_after` seconds, so the next
+    time the same choice is made it shows the refreshed headlines.
+    """
+    
+    def __init__(self, refresh_after=LAUNCHER_REFRESH_AFTER):
+        self.refresh_after = refresh_after
+        self._entries = {}
+        self._refreshing = set()
+        self._lock = threading.Lock()
+    
+    def get(self, category=None, source=None):
+        """Get the cached headlines and the time they were fetched, or None."""
+        with self._lock:
+            return self._entries.get((category, source))
+    
+    def fetch(self, category=None, source=None):
+        """Fetch headlines now and cache them."""
+        news_items = fetch_headlines(category, source)
+        if news_items:
+            with self._lock:
+                self._entries[(category, source)] = (news_items, time.time())
+        return news_items
+    
+    def refresh(self, category=None, source=None):
+        """
+        Refresh cached headlines on a background thread if they are stale.
+        
+        Returns:
+            True if a refresh is running
+        """
+        key = (category, source)
+        with self._lock:
+            if key in self._refreshing:
+                return True
+            entry = self._entries.get(key)
+            if entry and time.time() - entry[1] < self.refresh_after:
+                return False
+            self._refreshing.add(key)
+        
+        def run():
+            try:
+                self.fetch(category, source)
+            except Exception:
+                # Keep showing the cached headlines
+                pass
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+        
+        threading.Thread(target=run, daemon=True).start()
+        return True
+
+# Shared across menu choices for the lifetime of the launcher
+headlines_cache = HeadlinesCache()
 
 def clear_screen():
     """Clear the terminal screen based on the operating system."""
@@ -75,19 +148,29 @@ def show_source_menu():
     console.print(table)
 
 def run_news_command(category=None, source=None):
-    """Run the news aggregator command with the specified options."""
-    # Use the main.py directly instead of the module
-    cmd = ["python", "main.py", "headlines"]
-    
-    if category:
-        cmd.extend(["--category", category])
+    """Show headlines for the selected options, from memory when possible."""
+    cached = headlines_cache.get(category, source)
     
-    if source:
-        cmd.extend(["--source", source])
-    
-    # Run the command
     try:
-        subprocess.run(cmd)
+        if cached:
+            # Show what we have right away and refresh it behind the scenes
+            news_items, fetched_at = cached
+            display_news(news_items, source, category)
+            age = int(time.time() - fetched_at)
+            if headlines_cache.refresh(category, source):
+                console.print(f"\n[dim]Fetched {age}s ago; refreshing in the background.[/]")
+            else:
+                console.print(f"\n[dim]Fetched {age}s ago.[/]")
+        else:
+            with console.status("[green]Fetching news..."):
+                news_items = headlines_cache.fetch(category, source)
+            
+            if news_items:
+                display_news(news_items, source, category)
+            else:
+                console.print(Panel("No news found matching your criteria.", 
+                                    title="Error", 
+                                    border_style="red"))
     except Exception as e:
         console.print(f"[bold red]Error:[/] {str(e)}")
     
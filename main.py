@@ -4,43 +4,146 @@ Indian News Aggregator CLI App
 A command-line tool to fetch and display the latest Indian news headlines.
 """
 
+import sys
+import time
+
 import click
-from rich.console import Console
-from rich.panel import Panel
-from rich.table import Table
-from rich.progress import Progress
 
-from api.news_api import fetch_news_from_api
-from scrapers.web_scraper import scrape_news_websites
-from utils.config import CATEGORIES, NEWS_SOURCES
+# The fetching backends (requests, bs4, newsapi, asyncio, sqlite3) and Rich
+# are imported inside the functions that use them, so that --help and
+# reading from the local store start up fast, and machine-readable output
+# never loads Rich at all.
+from utils import profiling
+from utils.config import CATEGORIES, HYBRID_HEDGE_AFTER, NEWS_SOURCES, SERVE_HOST, SERVE_PORT
+
+_console = None
 
-console = Console()
+def get_console():
+    """Get the Rich console, creating it on first use."""
+    global _console
+    if _console is None:
+        from rich.console import Console
+        
+        _console = Console()
+    return _console
 
 @click.group()
-def cli():
+@click.option('--profile', is_flag=True, help='Print a per-source, per-stage timing breakdown')
+@click.option('--profile-json', type=click.Path(dir_okay=False, writable=True), 
+              help='Write the timing breakdown as JSON to this file')
+@click.pass_context
+def cli(ctx, profile, profile_json):
     """Indian News Aggregator - Get the latest Indian news headlines."""
-    pass
+    if profile or profile_json:
+        profiling.enable()
+        ctx.call_on_close(lambda: finish_profile(profile, profile_json))
 
 @cli.command()
 @click.option('--source', '-s', type=click.Choice(NEWS_SOURCES.keys()), help='News source to fetch from')
 @click.option('--category', '-c', type=click.Choice(CATEGORIES), help='News category to filter by')
 @click.option('--limit', '-l', default=10, help='Number of headlines to display')
 @click.option('--use-api/--use-scraper', default=True, help='Use NewsAPI or web scraper')
-def headlines(source, category, limit, use_api):
+@click.option('--mode', '--backend', 'mode', type=click.Choice(['api', 'scraper', 'hybrid', 'rss']), 
+              help='Backend to fetch from; hybrid asks both NewsAPI and the web scraper, rss reads only '
+                   'the news feeds (overrides --use-api/--use-scraper)')
+@click.option('--hedge-after', type=click.FloatRange(min=0), default=HYBRID_HEDGE_AFTER, show_default=True,
+              help='In hybrid mode, seconds to wait for the first backend before also asking the other')
+@click.option('--no-cache', is_flag=True, help='Bypass the local response cache')
+@click.option('--max-age', type=click.IntRange(min=0), help='Maximum age (in seconds) of cached pages')
+@click.option('--offline', is_flag=True, help='Show previously fetched articles from the local store')
+@click.option('--format', 'output_format', type=click.Choice(['table', 'jsonl', 'csv', 'json']), default='table', 
+              show_default=True, help='Output format; jsonl, csv and json write each article as soon as it is fetched')
+def headlines(source, category, limit, use_api, mode, hedge_after, no_cache, max_age, offline, output_format):
     """Fetch and display the latest Indian news headlines."""
+    click.get_current_context().call_on_close(report_skipped_sources)
+    
+    if mode is None:
+        mode = 'api' if use_api else 'scraper'
+    
+    if output_format != 'table':
+        write_headlines(output_format, source, category, limit, mode, hedge_after, no_cache, max_age, offline)
+        return
+    
+    from rich.panel import Panel
+    
+    if offline:
+        from utils.store import StoreError, article_store
+        
+        source_name = NEWS_SOURCES[source]["name"] if source else None
+        try:
+            news_items = article_store.query(source=source_name, category=category, limit=limit)
+        except StoreError as e:
+            get_console().print(Panel(f"Error: {str(e)}", title="Error", border_style="red"))
+            return
+        
+        if not news_items:
+            get_console().print(Panel("No stored news found matching your criteria.", 
+                                title="Error", 
+                                border_style="red"))
+            return
+            
+        display_news(news_items, source, category)
+        return
+    
+    if reads_warm_store(mode, no_cache, max_age):
+        # Answer instantly from the store while the watch command keeps it fresh
+        news_items = read_warm_store(source, category, limit)
+        if news_items:
+            display_news(news_items, source, category)
+            return
+    
+    if mode != 'api':
+        # Show headlines progressively as each page or backend answers
+        if mode == 'hybrid':
+            from api.hybrid import iter_hybrid_news
+            
+            snapshots = iter_hybrid_news(
+                source=source,
+                category=category,
+                limit=limit,
+                use_cache=not no_cache,
+                max_age=max_age,
+                hedge_after=hedge_after
+            )
+        else:
+            from scrapers.web_scraper import iter_news_websites
+            
+            snapshots = iter_news_websites(
+                source=source,
+                category=category,
+                limit=limit,
+                use_cache=not no_cache,
+                max_age=max_age,
+                backend='rss' if mode == 'rss' else None
+            )
+        
+        try:
+            news_items = display_news_progressively(snapshots, source, category)
+        except Exception as e:
+            get_console().print(Panel(f"Error: {str(e)}", 
+                                title="Error", 
+                                border_style="red"))
+            return
+        
+        if not news_items:
+            get_console().print(Panel("No news found matching your criteria.", 
+                                title="Error", 
+                                border_style="red"))
+        return
+    
+    from rich.progress import Progress
+    from api.news_api import fetch_news_from_api
+    
     with Progress() as progress:
         task = progress.add_task("[green]Fetching news...", total=1)
         
         try:
-            if use_api:
-                news_items = fetch_news_from_api(source=source, category=category, limit=limit)
-            else:
-                news_items = scrape_news_websites(source=source, category=category, limit=limit)
+            news_items = fetch_news_from_api(source=source, category=category, limit=limit)
                 
             progress.update(task, completed=1)
             
             if not news_items:
-                console.print(Panel("No news found matching your criteria.", 
+                get_console().print(Panel("No news found matching your criteria.", 
                                     title="Error", 
                                     border_style="red"))
                 return
@@ -49,13 +152,233 @@ def headlines(source, category, limit, use_api):
             
         except Exception as e:
             progress.update(task, completed=1)
-            console.print(Panel(f"Error: {str(e)}", 
+            get_console().print(Panel(f"Error: {str(e)}", 
                                 title="Error", 
                                 border_style="red"))
 
-def display_news(news_items, source=None, category=None):
-    """Display news items in a formatted table."""
-    title = "Latest Indian News"
+@cli.command()
+@click.option('--source', '-s', type=click.Choice(NEWS_SOURCES.keys()), help='News source to poll')
+@click.option('--category', '-c', type=click.Choice(CATEGORIES), help='News category to poll')
+def watch(source, category):
+    """Keep polling news websites and save new articles to the local store."""
+    import asyncio
+    from scrapers.scheduler import PollScheduler
+    
+    def report(target, new_articles, ok):
+        status = f"[green]{new_articles} new[/]" if ok else "[red]failed[/]"
+        next_in = max(0, int(target.next_poll - time.time()))
+        get_console().print(f"[dim]{time.strftime('%H:%M:%S')}[/] {target.source}/{target.category}: "
+                      f"{status}, next poll in {next_in // 60}m {next_in % 60:02d}s")
+    
+    scheduler = PollScheduler(source=source, category=category, on_poll=report)
+    get_console().print(f"Watching {len(scheduler.targets)} pages. Press Ctrl+C to stop.")
+    try:
+        asyncio.run(scheduler.run())
+    except KeyboardInterrupt:
+        get_console().print("Stopped watching.")
+
+@cli.command()
+@click.option('--host', default=SERVE_HOST, show_default=True, help='Address to listen on')
+@click.option('--port', type=click.IntRange(0, 65535), default=SERVE_PORT, show_default=True, help='Port to listen on')
+@click.option('--mode', '--backend', 'mode', type=click.Choice(['api', 'scraper', 'hybrid', 'rss']), default='scraper',
+              show_default=True, help='Backend to fetch from when a request does not ask for one')
+def serve(host, port, mode):
+    """Serve headlines from memory over a local HTTP/JSON API.
+    
+    Answers GET /headlines?source=&category=&limit=&mode= with a JSON
+    object of the headlines. Headlines are fetched on their first request
+    and then refreshed in the background while they keep being requested.
+    """
+    import asyncio
+    from api.server import serve_headlines
+    
+    def started(address, bound_port):
+        get_console().print(f"Serving headlines on http://{address}:{bound_port}/headlines. Press Ctrl+C to stop.")
+    
+    try:
+        asyncio.run(serve_headlines(host, port, mode, on_start=started))
+    except KeyboardInterrupt:
+        get_console().print("Stopped serving.")
+    except OSError as e:
+        get_console().print(f"[red]Error: could not listen on {host}:{port}: {e}[/]")
+        sys.exit(1)
+
+@cli.command()
+@click.argument('query', nargs=-1, required=True)
+@click.option('--source', '-s', type=click.Choice(NEWS_SOURCES.keys()), help='Only search this news source')
+@click.option('--category', '-c', type=click.Choice(CATEGORIES), help='Only search this news category')
+@click.option('--since', type=click.DateTime(formats=['%Y-%m-%d']), help='Only articles published on or after this date')
+@click.option('--until', type=click.DateTime(formats=['%Y-%m-%d']), help='Only articles published on or before this date')
+@click.option('--limit', '-l', default=20, help='Number of results to display')
+@click.option('--newest', is_flag=True, help='Sort results by publish time instead of relevance')
+def search(query, source, category, since, until, limit, newest):
+    """Search the articles in the local store.
+    
+    Every word and "quoted phrase" of QUERY must match. End a word with *
+    to match any word starting with it, and put OR between two terms to
+    match either.
+    """
+    from rich.panel import Panel
+    from utils.store import StoreError, article_store
+    
+    source_name = NEWS_SOURCES[source]["name"] if source else None
+    text = " ".join(query)
+    try:
+        news_items = article_store.search(
+            text,
+            source=source_name,
+            category=category,
+            since=local_day_start(since) if since else None,
+            until=local_day_start(until, days=1) if until else None,
+            limit=limit,
+            newest_first=newest
+        )
+    except StoreError as e:
+        get_console().print(Panel(f"Error: {str(e)}", title="Error", border_style="red"))
+        return
+    
+    if not news_items:
+        get_console().print(Panel(f"No stored articles match \"{text}\".", 
+                            title="Error", 
+                            border_style="red"))
+        return
+    
+    display_news(news_items, source, category, title=f"Search results for \"{text}\"")
+
+def local_day_start(date, days=0):
+    """Get the UTC epoch of the start of a date (plus `days`) in local (IST) time."""
+    import datetime
+    from utils.helpers import LOCAL_TIMEZONE
+    
+    start = date.replace(tzinfo=LOCAL_TIMEZONE) + datetime.timedelta(days=days)
+    return int(start.timestamp())
+
+@cli.command()
+@click.argument('article_id')
+def read(article_id):
+    """Read the full text of an article by its ID."""
+    from rich.panel import Panel
+    from rich.progress import Progress
+    from scrapers.web_scraper import ScraperError, fetch_article_body
+    from utils.store import StoreError, article_store
+    
+    try:
+        item = article_store.get(article_id)
+    except StoreError as e:
+        get_console().print(Panel(f"Error: {str(e)}", title="Error", border_style="red"))
+        return
+    
+    if not item:
+        get_console().print(Panel(f"No article found with ID {article_id}. Run headlines first.", 
+                            title="Error", 
+                            border_style="red"))
+        return
+    
+    body = item.get("body")
+    if body is None and item.get("url"):
+        # Fetch the full article once and keep it in the store
+        with Progress() as progress:
+            task = progress.add_task("[green]Fetching article...", total=1)
+            try:
+                body = fetch_article_body(item["url"])
+                article_store.save_body(item["id"], body)
+            except (ScraperError, StoreError) as e:
+                body = None
+                get_console().print(Panel(f"Error: {str(e)}", title="Error", border_style="red"))
+            progress.update(task, completed=1)
+    
+    display_article(item, body)
+
+@cli.command()
+@click.option('--reset', is_flag=True, help='Forget the recorded health and close every circuit')
+def health(reset):
+    """Show the health of every site requests were sent to."""
+    from rich.table import Table
+    from utils.health import host_health
+    
+    if reset:
+        host_health.reset()
+        get_console().print("Forgot the health of every site.")
+        return
+    
+    report = host_health.report()
+    if not report:
+        get_console().print("No requests have been recorded yet.")
+        return
+    
+    table = Table(title="Site Health", expand=True)
+    table.add_column("Host", style="cyan")
+    table.add_column("Sources", style="white")
+    table.add_column("Circuit")
+    table.add_column("Errors", justify="right")
+    table.add_column("Failures in a row", justify="right")
+    table.add_column("Latency ms", justify="right", style="yellow")
+    table.add_column("Next probe", justify="right")
+    
+    for host, entry in sorted(report.items()):
+        state_style = "green" if entry["state"] == "closed" else "red"
+        table.add_row(
+            host,
+            ", ".join(host_source_names(host)),
+            f"[{state_style}]{entry['state']}[/]",
+            f"{entry['error_rate'] * 100:.0f}%",
+            str(entry["consecutive_failures"]),
+            f"{entry['latency'] * 1000:.0f}" if entry["latency"] is not None else "-",
+            f"in {entry['retry_in']:.0f}s" if entry["state"] != "closed" else "-"
+        )
+    
+    get_console().print(table)
+
+def host_source_names(host):
+    """Get the names of the news sources (or NewsAPI) served from a host."""
+    from urllib.parse import urlparse
+    
+    if host == "newsapi.org":
+        return ["NewsAPI"]
+    return [
+        source_info["name"]
+        for source_info in NEWS_SOURCES.values()
+        if host in {
+            urlparse(url).netloc.lower()
+            for url in [source_info.get("scrape_url", "")] + list(source_info.get("feeds", {}).values())
+        }
+    ]
+
+def report_skipped_sources():
+    """Tell the user about the sources skipped because their site keeps failing."""
+    # Nothing can have been skipped if no request was made
+    if "utils.health" not in sys.modules:
+        return
+    from utils.health import host_health
+    
+    skipped = host_health.skipped_hosts()
+    if not skipped:
+        return
+    
+    descriptions = []
+    for host, retry_in in sorted(skipped.items()):
+        names = ", ".join(host_source_names(host)) or host
+        retry = "back up now" if retry_in is None else f"retried in {retry_in:.0f}s"
+        descriptions.append(f"{names} ({host}, {retry})")
+    click.echo(click.style(f"Skipped unavailable sources: {'; '.join(descriptions)}", fg="yellow"), err=True)
+
+def display_article(item, body=None):
+    """Display a single article with its full text."""
+    from rich.panel import Panel
+    
+    text = body or item.get("content") or item.get("description") or "No content available."
+    
+    get_console().print(Panel(
+        f"[bold]{item.get('title', 'No title')}[/]\n\n{text}\n\n[link={item.get('url', '')}]{item.get('url', '')}[/link]",
+        title=item.get("source", "Unknown"),
+        subtitle=f"{item.get('category', 'general').capitalize()} | {item.get('published_at', 'Unknown')}",
+        border_style="cyan"
+    ))
+
+def build_news_table(news_items, source=None, category=None, title="Latest Indian News"):
+    """Build a formatted table of news items."""
+    from rich.table import Table
+    
     if source:
         title += f" from {source}"
     if category:
@@ -63,25 +386,218 @@ def display_news(news_items, source=None, category=None):
     
     table = Table(title=title, expand=True)
     
-    table.add_column("Source", style="cyan", no_wrap=True)
+    table.add_column("ID", style="dim", no_wrap=True)
+    table.add_column("Source", style="cyan")
     table.add_column("Title", style="white", no_wrap=False)
     table.add_column("Category", style="green")
     table.add_column("Published", style="yellow")
     
     for item in news_items:
         table.add_row(
-            item.get('source', 'Unknown'),
+            item.get('id', ''),
+            ", ".join(item.get('sources') or [item.get('source', 'Unknown')]),
             item.get('title', 'No title'),
             item.get('category', 'General'),
             item.get('published_at', 'Unknown')
         )
     
-    console.print(table)
+    return table
+
+def write_headlines(output_format, source=None, category=None, limit=10, mode='api', 
+                    hedge_after=HYBRID_HEDGE_AFTER, no_cache=False, max_age=None, offline=False):
+    """
+    Write headlines to standard output in a machine-readable format.
+    
+    Articles are written as soon as each page returns them, rather than
+    newest first, so a reader sees the first ones right away. Hybrid mode
+    writes its merged headlines once both backends are merged.
+    Errors go to standard error and exit with status 1.
+    """
+    from utils.output import get_writer
+    
+    if offline or (reads_warm_store(mode, no_cache, max_age) and is_store_warm(source, category)):
+        # Stream from the store when offline, or while the watch command keeps it fresh
+        from utils.store import article_store
+        
+        source_name = NEWS_SOURCES[source]["name"] if source else None
+        news_items = article_store.iter_query(source=source_name, category=category, limit=limit)
+    elif mode == 'hybrid':
+        from api.hybrid import iter_hybrid_items
+        
+        news_items = iter_hybrid_items(source, category, limit, not no_cache, max_age, hedge_after)
+    elif mode in ('scraper', 'rss'):
+        from scrapers.web_scraper import iter_scraped_news
+        
+        backend = 'rss' if mode == 'rss' else None
+        news_items = iter_scraped_news(source, category, limit, not no_cache, max_age, backend)
+    else:
+        from api.news_api import iter_news_from_api
+        
+        news_items = iter_news_from_api(source, category, limit)
+    
+    # Articles are plain UTF-8 text, whatever the terminal's encoding
+    if hasattr(sys.stdout, "reconfigure"):
+        sys.stdout.reconfigure(encoding="utf-8")
+    
+    try:
+        with get_writer(output_format) as writer:
+            for item in news_items:
+                with profiling.span("render", "output"):
+                    writer.write(item)
+    except BrokenPipeError:
+        # The reader stopped early (e.g. `| head`); don't complain about it
+        # again when Python flushes stdout at exit
+        import os
+        
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        sys.exit(1)
+    except Exception as e:
+        click.echo(f"Error: {e}", err=True)
+        sys.exit(1)
+    
+    if writer.count == 0:
+        click.echo("No news found matching your criteria.", err=True)
+
+def is_store_warm(source=None, category=None):
+    """Check whether the watch command keeps the stored articles of these pages fresh."""
+    from utils.helpers import get_scrape_targets
+    from utils.store import StoreError, article_store
+    
+    try:
+        return article_store.is_warm(get_scrape_targets(source, category))
+    except StoreError:
+        return False
+
+def reads_warm_store(mode, no_cache=False, max_age=None):
+    """
+    Check whether headlines of a mode are read from the store while the
+    watch command keeps it fresh.
+    
+    The store holds scraped articles, so NewsAPI headlines never come from it.
+    """
+    return mode != 'api' and not no_cache and max_age is None
+
+def read_warm_store(source=None, category=None, limit=10):
+    """
+    Get the latest stored articles if the watch command keeps them fresh.
+    
+    Returns None if any of the pages is not being watched.
+    """
+    from utils.store import StoreError, article_store
+    
+    if not is_store_warm(source, category):
+        return None
+    try:
+        source_name = NEWS_SOURCES[source]["name"] if source else None
+        return article_store.query(source=source_name, category=category, limit=limit)
+    except StoreError:
+        return None
+
+def get_headlines(source=None, category=None, limit=10, mode='api'):
+    """
+    Fetch headlines the same way the headlines command does, all at once
+    rather than progressively.
+    
+    Raises:
+        QuotaExceededError: If the daily NewsAPI quota is used up (api mode)
+    """
+    if reads_warm_store(mode):
+        news_items = read_warm_store(source, category, limit)
+        if news_items:
+            return news_items
+    
+    from api.headlines import fetch_headlines
+    
+    return fetch_headlines(mode, source, category, limit)
+
+def display_news(news_items, source=None, category=None, title="Latest Indian News"):
+    """Display news items in a formatted table."""
+    with profiling.span("render", "display"):
+        get_console().print(build_news_table(news_items, source, category, title))
     
     # Display detailed view option
-    console.print("\nUse [bold cyan]news-aggregator read [ID][/] to read the full article")
+    get_console().print("\nUse [bold cyan]news-aggregator read [ID][/] to read the full article")
+
+def display_news_progressively(news_updates, source=None, category=None):
+    """
+    Display news items as they arrive, redrawing the table in place.
+    
+    news_updates yields the current list of news items each time it changes.
+    Returns the last list of news items.
+    """
+    from rich.live import Live
+    from rich.text import Text
+    
+    news_items = []
+    with Live(Text("Fetching news...", style="green"), console=get_console(), refresh_per_second=8) as live:
+        for news_items in news_updates:
+            with profiling.span("render", "display"):
+                live.update(build_news_table(news_items, source, category))
+        if not news_items:
+            live.update(Text(""))
+    
+    if news_items:
+        # Display detailed view option
+        get_console().print("\nUse [bold cyan]news-aggregator read [ID][/] to read the full article")
+    
+    return news_items
+
+def finish_profile(show=True, json_path=None):
+    """Stop profiling, then print the timing breakdown and/or write it as JSON."""
+    report = profiling.report()
+    profiling.disable()
+    
+    if json_path:
+        import json
+        
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    
+    if show:
+        display_profile(report)
+
+def display_profile(report):
+    """Display a per-source, per-stage timing breakdown on standard error."""
+    from rich.console import Console
+    from rich.table import Table
+    
+    # Keep diagnostics out of the (possibly piped) output
+    console = Console(stderr=True)
+    wall = report["wall"] or 1e-9
+    table = Table(title=f"Profile ({wall * 1000:.0f} ms wall time)", expand=True)
+    
+    table.add_column("Source", style="cyan")
+    table.add_column("Stage", style="white")
+    table.add_column("Calls", justify="right")
+    table.add_column("Total ms", justify="right", style="yellow")
+    table.add_column("Mean ms", justify="right")
+    table.add_column("Max ms", justify="right")
+    table.add_column("% wall", justify="right", style="green")
+    
+    for entry in report["timings"]:
+        table.add_row(
+            entry["source"],
+            entry["stage"],
+            str(entry["calls"]),
+            f"{entry['total'] * 1000:.1f}",
+            f"{entry['total'] * 1000 / entry['calls']:.1f}",
+            f"{entry['max'] * 1000:.1f}",
+            f"{entry['total'] * 100 / wall:.0f}%"
+        )
+    
+    console.print(table)
+    
+    if report["counters"]:
+        counters = ", ".join(
+            f"{entry['source']} {entry['name']}={entry['value']}" for entry in report["counters"]
+        )
+        console.print(f"[dim]Counters: {counters}[/]")
 
 if __name__ == '__main__':
-    console.print(Panel.fit("🇮🇳 [bold green]Indian News Aggregator[/]", 
-                           subtitle="Get the latest Indian news headlines"))
+    # Only greet people at a terminal, so piped output stays machine-readable
+    if sys.stdout.isatty():
+        from rich.panel import Panel
+        
+        get_console().print(Panel.fit("🇮🇳 [bold green]Indian News Aggregator[/]", 
+                                      subtitle="Get the latest Indian news headlines"))
     cli() 
\ No newline at end of file
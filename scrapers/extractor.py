@@ -0,0 +1,324 @@
+"""
+Generic schema-driven article extractor for scraped news pages.
+"""
+
+import datetime
+import re
+from typing import List, Dict, Any, Optional, Tuple
+from urllib.parse import urljoin
+
+import soupsieve
+from bs4 import BeautifulSoup, SoupStrainer
+
+from utils import profiling
+from utils.article import Article
+from utils.helpers import clean_text, normalize_article, categorize_articles
+
+# Prefer the much faster lxml parser when it is installed
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
+
+# Fields every extraction schema can define
+SCHEMA_FIELDS = ("article", "title", "link", "description", "image", "date", "body")
+
+# Article cards read past the limit before a partial parse stops early, to
+# make up for cards that turn out to have no title (ads, empty promos)
+PARTIAL_PARSE_MARGIN = 5
+
+# A simple compound selector such as "div.story-card" or "article"
+_SIMPLE_SELECTOR = re.compile(r"^([a-zA-Z][a-zA-Z0-9]*)?((?:\.[\w-]+)*)$")
+
+# Compiled schemas, keyed by the selector strings they were compiled from
+_compiled_schemas: Dict[Tuple[str, ...], Dict[str, Any]] = {}
+
+class SchemaError(Exception):
+    """Exception raised for invalid extraction schemas."""
+    pass
+
+def compile_schema(selectors: Dict[str, str]) -> Dict[str, Any]:
+    """
+    Compile the CSS selectors of an extraction schema.
+
+    Compiled schemas are cached, so each schema is only compiled once per
+    process and reused for every page of that source.
+
+    Raises:
+        SchemaError: If the schema has no article or title selector
+    """
+    key = tuple(selectors.get(field, "") for field in SCHEMA_FIELDS)
+    compiled = _compiled_schemas.get(key)
+    if compiled is not None:
+        return compiled
+
+    if not selectors.get("article") or not selectors.get("title"):
+        raise SchemaError("Extraction schema needs 'article' and 'title' selectors")
+
+    compiled = {
+        field: soupsieve.compile(pattern)
+        for field, pattern in zip(SCHEMA_FIELDS, key)
+        if pattern
+    }
+    _compiled_schemas[key] = compiled
+    return compiled
+
+class _LimitReached(Exception):
+    """Raised by the article strainer to stop parsing early."""
+    pass
+
+class _PartialSoup(BeautifulSoup):
+    """
+    BeautifulSoup that keeps the tree built so far when parsing is stopped
+    early by an article strainer.
+    """
+
+    # Whether parsing was stopped before the end of the page
+    stopped_early = False
+
+    def _feed(self):
+        try:
+            super()._feed()
+        except _LimitReached:
+            self.stopped_early = True
+            # Close out the tree exactly like a complete parse would
+            self.endData()
+            while self.currentTag.name != self.ROOT_TAG_NAME:
+                self.popTag()
+
+def _parse_compound(selector: str) -> Optional[Tuple[Optional[str], List[str]]]:
+    """Split a simple compound selector into its tag name and classes."""
+    match = _SIMPLE_SELECTOR.match(selector.strip())
+    if not match or not selector.strip():
+        return None
+    tag_name = match.group(1).lower() if match.group(1) else None
+    classes = [cls for cls in match.group(2).split(".") if cls]
+    return tag_name, classes
+
+def build_article_strainer(article_selector: str, limit: int = 0) -> Optional[SoupStrainer]:
+    """
+    Build a SoupStrainer that only keeps the subtrees of article cards.
+
+    Each comma-separated selector is matched on its outermost compound
+    (tag name and classes), so descendant selectors keep the whole ancestor
+    subtree. When every selector is a single compound, each kept subtree
+    is an article card, and parsing stops once `limit` cards (plus
+    PARTIAL_PARSE_MARGIN) are complete.
+
+    Returns None if the selector is too complex to translate, in which
+    case the whole page should be parsed.
+    """
+    matchers = []
+    all_simple = True
+    for part in article_selector.split(","):
+        compounds = part.split()
+        if not compounds:
+            return None
+        parsed = _parse_compound(compounds[0])
+        if parsed is None:
+            return None
+        matchers.append(parsed)
+        if len(compounds) > 1:
+            all_simple = False
+
+    stop_after = limit + PARTIAL_PARSE_MARGIN if all_simple and limit > 0 else 0
+    matched = 0
+
+    def match_card(name: str, attrs: Dict[str, Any]) -> bool:
+        nonlocal matched
+        # The strainer is only consulted outside kept subtrees, so once the
+        # limit is reached every collected card has been fully parsed
+        if stop_after and matched >= stop_after:
+            raise _LimitReached()
+
+        classes = attrs.get("class", "") if attrs else ""
+        if isinstance(classes, str):
+            classes = classes.split()
+
+        for tag_name, required_classes in matchers:
+            if tag_name and tag_name != name:
+                continue
+            if all(cls in classes for cls in required_classes):
+                matched += 1
+                return True
+        return False
+
+    return SoupStrainer(match_card)
+
+def parse_page(
+    body: bytes,
+    source_info: Dict[str, Any],
+    limit: int = 10,
+    partial: bool = True,
+    parser: str = HTML_PARSER
+) -> BeautifulSoup:
+    """
+    Parse a downloaded page.
+
+    In partial mode, only the subtrees matched by the source's article
+    selector are built, and parsing stops early once `limit` cards (plus a
+    margin) have been collected where the selector allows it. Use
+    parse_articles to redo a parse that stopped too early.
+    """
+    strainer = None
+    if partial:
+        article_selector = source_info.get("selectors", {}).get("article", "")
+        strainer = build_article_strainer(article_selector, limit)
+
+    if strainer is None:
+        return BeautifulSoup(body, parser)
+    return _PartialSoup(body, parser, parse_only=strainer)
+
+def parse_articles(
+    body: bytes,
+    source_info: Dict[str, Any],
+    category: Optional[str] = None,
+    limit: int = 10,
+    partial: bool = True,
+    parser: str = HTML_PARSER
+) -> List[Article]:
+    """
+    Parse a downloaded page and extract its news items.
+
+    A partial parse that stopped early but gives fewer than `limit` items
+    (because too many of the cards read had no title) is redone without
+    stopping, so it never returns fewer items than a full parse.
+
+    Returns:
+        List of normalized articles
+    """
+    source_name = source_info.get("name", "Unknown")
+
+    with profiling.span("parse", source_name):
+        soup = parse_page(body, source_info, limit, partial, parser)
+    with profiling.span("select", source_name):
+        articles = select_articles(soup, source_info, limit)
+
+    if len(articles) < limit and isinstance(soup, _PartialSoup) and soup.stopped_early:
+        profiling.count("reparses", 1, source_name)
+        with profiling.span("parse", source_name):
+            soup = parse_page(body, source_info, 0, partial, parser)
+        with profiling.span("select", source_name):
+            articles = select_articles(soup, source_info, limit)
+
+    return _finish_articles(articles, source_info, category)
+
+def _finish_articles(
+    articles: List[Article],
+    source_info: Dict[str, Any],
+    category: Optional[str] = None
+) -> List[Article]:
+    """Categorize and normalize the articles selected from a page."""
+    source_name = source_info.get("name", "Unknown")
+
+    # Determine categories in one batch if not specified
+    with profiling.span("categorize", source_name):
+        if not category or category == "general":
+            categories = categorize_articles(articles)
+        else:
+            categories = [category] * len(articles)
+
+    # Normalize the results in place
+    with profiling.span("normalize", source_name):
+        for article, article_category in zip(articles, categories):
+            normalize_article(article, article_category)
+
+    profiling.count("articles", len(articles), source_name)
+    return articles
+
+def select_articles(
+    soup: BeautifulSoup,
+    source_info: Dict[str, Any],
+    limit: int = 10
+) -> List[Article]:
+    """
+    Collect the fields of up to `limit` article cards of a parsed page.
+
+    Returns:
+        List of articles with their fields as shown on the page, to be
+        finished with normalize_article
+    """
+    schema = compile_schema(source_info.get("selectors", {}))
+    source_name = source_info.get("name", "Unknown")
+    base_url = source_info.get("scrape_url", "")
+
+    articles = []
+    for card in schema["article"].iselect(soup):
+        if len(articles) >= limit:
+            break
+
+        try:
+            article = _extract_article(card, schema, source_name, base_url)
+        except Exception:
+            continue
+        if article:
+            articles.append(article)
+
+    return articles
+
+def _select_one(schema: Dict[str, Any], field: str, article: Any) -> Any:
+    """Apply a compiled field selector within an article card."""
+    selector = schema.get(field)
+    return selector.select_one(article) if selector else None
+
+def _extract_article(
+    article: Any,
+    schema: Dict[str, Any],
+    source_name: str,
+    base_url: str
+) -> Optional[Article]:
+    """Extract the fields of a single article card."""
+    # Extract title
+    title_elem = _select_one(schema, "title", article)
+    if not title_elem:
+        return None
+    title = clean_text(title_elem.text)
+
+    # Extract URL
+    link_elem = _select_one(schema, "link", article)
+    url = link_elem.get("href", "") if link_elem else ""
+    if url and not url.startswith("http"):
+        url = urljoin(base_url, url)
+
+    # Extract description
+    desc_elem = _select_one(schema, "description", article)
+    description = clean_text(desc_elem.text) if desc_elem else ""
+
+    # Extract image
+    img_elem = _select_one(schema, "image", article)
+    image_url = img_elem.get("src", "") if img_elem else ""
+
+    # Extract date
+    date_elem = _select_one(schema, "date", article)
+    published_at = clean_text(date_elem.text) if date_elem else datetime.datetime.now().strftime("%d %b %Y")
+
+    return Article(
+        title=title,
+        description=description,
+        url=url,
+        source=source_name,
+        published_at=published_at,
+        image_url=image_url
+    )
+
+def extract_article_body(body: bytes, source_info: Dict[str, Any], parser: str = HTML_PARSER) -> str:
+    """
+    Extract the full text of an article page.
+
+    Uses the source's "body" selector, falling back to the paragraphs of
+    the page's <article> element or, failing that, of the whole page.
+    """
+    soup = BeautifulSoup(body, parser)
+
+    paragraphs = []
+    selectors = source_info.get("selectors", {})
+    if selectors.get("body"):
+        paragraphs = compile_schema(selectors)["body"].select(soup)
+
+    if not paragraphs:
+        container = soup.find("article") or soup
+        paragraphs = container.find_all("p")
+
+    texts = [clean_text(paragraph.get_text(" ")) for paragraph in paragraphs]
+    return "\n\n".join(text for text in texts if text)
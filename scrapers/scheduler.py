@@ -0,0 +1,199 @@
+"""
+Module for polling news websites continuously in the background.
+"""
+
+import asyncio
+import heapq
+import itertools
+import random
+import time
+from typing import List, Dict, Callable, Optional, Tuple
+
+from scrapers.web_scraper import get_request_host, run_in_daemon_thread, scrape_single_source
+from utils.cache import get_cache_ttl
+from utils.helpers import get_scrape_targets
+from utils.config import (
+    SCRAPE_CONCURRENCY,
+    WATCH_FAILURE_BACKOFF,
+    WATCH_HOST_CONCURRENCY,
+    WATCH_JITTER,
+    WATCH_MAX_INTERVAL,
+    WATCH_MIN_INTERVAL,
+    WATCH_PAGE_LIMIT,
+    WATCH_RATE_SMOOTHING,
+    WATCH_TARGET_NEW_ARTICLES
+)
+from utils.store import StoreError, article_store, save_articles
+
+def clamp_interval(interval: float) -> float:
+    """Keep a poll interval between WATCH_MIN_INTERVAL and WATCH_MAX_INTERVAL."""
+    return min(WATCH_MAX_INTERVAL, max(WATCH_MIN_INTERVAL, interval))
+
+class PollTarget:
+    """
+    Polling state of one (source, category) page.
+
+    The interval between polls follows a smoothed rate of new articles
+    per second, so a page is polled about once every
+    WATCH_TARGET_NEW_ARTICLES new articles.
+    """
+
+    def __init__(self, source: str, category: str, interval: float):
+        self.source = source
+        self.category = category
+        self.interval = clamp_interval(interval)
+        self.rate: Optional[float] = None
+        self.last_poll: Optional[float] = None
+        self.next_poll = 0.0
+
+    @property
+    def host(self) -> str:
+        """The host polls of the page send their first request to."""
+        return get_request_host(self.source, self.category)
+
+    def update(self, new_articles: int, ok: bool, now: float) -> float:
+        """
+        Adapt the poll interval to the result of a poll.
+
+        Args:
+            new_articles: Number of articles the poll added to the store
+            ok: Whether the page was fetched and yielded any articles
+            now: Time of the poll
+
+        Returns:
+            The time of the next poll, with jitter
+        """
+        if not ok:
+            self.interval = clamp_interval(self.interval * WATCH_FAILURE_BACKOFF)
+        elif self.last_poll is not None:
+            # The first poll of a page only seeds the store
+            observed = new_articles / max(1.0, now - self.last_poll)
+            if self.rate is None:
+                self.rate = observed
+            else:
+                self.rate = WATCH_RATE_SMOOTHING * observed + (1 - WATCH_RATE_SMOOTHING) * self.rate
+
+            if self.rate > 0:
+                self.interval = clamp_interval(WATCH_TARGET_NEW_ARTICLES / self.rate)
+            else:
+                self.interval = clamp_interval(self.interval * WATCH_FAILURE_BACKOFF)
+
+        if ok:
+            self.last_poll = now
+        self.next_poll = now + self.interval * random.uniform(1 - WATCH_JITTER, 1 + WATCH_JITTER)
+        return self.next_poll
+
+class PollScheduler:
+    """
+    Poll (source, category) pages on their own adaptive, jittered timers.
+
+    Scraped articles are saved to the article store, and every poll is
+    recorded there so that headlines can tell the store is fresh. At most
+    `host_concurrency` pages are fetched at once from any single host.
+    """
+
+    def __init__(
+        self,
+        source: Optional[str] = None,
+        category: Optional[str] = None,
+        host_concurrency: int = WATCH_HOST_CONCURRENCY,
+        on_poll: Optional[Callable[[PollTarget, int, bool], None]] = None
+    ):
+        self.targets = [
+            PollTarget(src, cat or "", get_cache_ttl(src, cat))
+            for src, cat in get_scrape_targets(source, category)
+        ]
+        self.host_concurrency = host_concurrency
+        self.on_poll = on_poll
+        self._queue: List[Tuple[float, int, PollTarget]] = []
+        self._order = itertools.count()
+        self._wakeup: Optional[asyncio.Event] = None
+
+    def _restore(self, now: float) -> None:
+        """Resume the schedule of a previous run from the recorded polls."""
+        try:
+            polls = article_store.get_polls()
+        except StoreError:
+            polls = {}
+
+        for target in self.targets:
+            poll = polls.get((target.source, target.category))
+            if poll is None:
+                # Spread the first polls out instead of firing them all at once
+                target.next_poll = now + random.uniform(0, WATCH_JITTER * WATCH_MIN_INTERVAL)
+                continue
+            target.interval = clamp_interval(poll["next_poll"] - poll["polled_at"])
+            target.last_poll = poll["polled_at"]
+            target.next_poll = max(now, poll["next_poll"])
+
+    def _schedule(self, target: PollTarget) -> None:
+        heapq.heappush(self._queue, (target.next_poll, next(self._order), target))
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def _poll(
+        self,
+        target: PollTarget,
+        host_semaphore: asyncio.Semaphore,
+        global_semaphore: asyncio.Semaphore
+    ) -> None:
+        try:
+            async with host_semaphore, global_semaphore:
+                # Revalidate on every poll; unchanged pages answer 304
+                news_items = await run_in_daemon_thread(
+                    scrape_single_source, target.source, target.category, WATCH_PAGE_LIMIT, True, 0
+                )
+        except Exception:
+            news_items = []
+
+        ok = bool(news_items)
+        new_articles = save_articles(news_items)
+        now = time.time()
+        next_poll = target.update(new_articles, ok, now)
+
+        try:
+            article_store.record_poll(
+                target.source, target.category, int(now), int(next_poll), new_articles
+            )
+        except StoreError:
+            pass
+
+        if self.on_poll is not None:
+            self.on_poll(target, new_articles, ok)
+        self._schedule(target)
+
+    async def run(self, stop: Optional[asyncio.Event] = None) -> None:
+        """Poll the pages until `stop` is set (or forever)."""
+        stop = stop or asyncio.Event()
+        self._wakeup = asyncio.Event()
+        self._restore(time.time())
+        for target in self.targets:
+            self._schedule(target)
+
+        global_semaphore = asyncio.Semaphore(SCRAPE_CONCURRENCY)
+        host_semaphores: Dict[str, asyncio.Semaphore] = {}
+        tasks: set = set()
+
+        try:
+            while not stop.is_set():
+                delay = self._queue[0][0] - time.time() if self._queue else None
+                if delay is None or delay > 0:
+                    # Sleep until the next poll is due, a poll reschedules or we stop
+                    self._wakeup.clear()
+                    waiters = [asyncio.ensure_future(stop.wait()), asyncio.ensure_future(self._wakeup.wait())]
+                    await asyncio.wait(waiters, timeout=delay, return_when=asyncio.FIRST_COMPLETED)
+                    for waiter in waiters:
+                        waiter.cancel()
+                    continue
+
+                _, _, target = heapq.heappop(self._queue)
+                host_semaphore = host_semaphores.setdefault(
+                    target.host, asyncio.Semaphore(self.host_concurrency)
+                )
+                task = asyncio.ensure_future(self._poll(target, host_semaphore, global_semaphore))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
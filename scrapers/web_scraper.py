@@ -2,26 +2,252 @@
 Module for scraping news from Indian news websites.
 """
 
+import asyncio
 import concurrent.futures
-import datetime
+import multiprocessing
+import threading
 import time
-from typing import List, Dict, Any, Optional
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Dict, Any, AsyncIterator, Callable, Iterator, Optional
+from urllib.parse import urlparse
 
-import requests
-from bs4 import BeautifulSoup
+from scrapers.extractor import extract_article_body, parse_articles
+from scrapers.rss_feed import get_feed_url, parse_feed
+from utils import http_client, profiling
+from utils.article import Article
+from utils.cache import CacheEntry, get_cache_ttl, response_cache
+from utils.config import (
+    NEWS_SOURCES,
+    PARSE_WORKERS,
+    PARTIAL_PARSE,
+    SCRAPE_BACKEND,
+    SCRAPE_CONCURRENCY,
+    SCRAPE_HOST_CONCURRENCY,
+    SCRAPE_SETTLE_TIMEOUT,
+    USER_AGENT
+)
+from utils.helpers import get_scrape_targets
+from utils.merge import DuplicateFilter, TopNewsMerger
+from utils.store import save_articles
 
-from utils.config import NEWS_SOURCES, REQUEST_TIMEOUT, USER_AGENT
-from utils.helpers import clean_text, normalize_news_item, categorize_article
+# Scrape backends: web pages, feeds, or feeds falling back to web pages
+SCRAPE_BACKENDS = ("html", "rss", "auto")
+
+# Accept headers of web page and feed requests
+HTML_ACCEPT = "text/html,application/xhtml+xml,application/xml"
+FEED_ACCEPT = "application/rss+xml,application/atom+xml,application/xml;q=0.9,text/xml;q=0.8"
+
+_parse_pool: Optional[concurrent.futures.ProcessPoolExecutor] = None
+_parse_pool_lock = threading.Lock()
 
 class ScraperError(Exception):
     """Exception raised for scraper errors."""
     pass
 
+def run_in_daemon_thread(func: Callable[..., Any], *args: Any) -> "asyncio.Future[Any]":
+    """
+    Run a blocking function on a daemon thread and await its result.
+    
+    Page fetches go through the shared pooled session, which is blocking.
+    Unlike a ThreadPoolExecutor, daemon threads do not keep the process
+    alive, so pages abandoned by the merge never delay exiting.
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+    
+    def resolve(result: Any, error: Optional[BaseException]) -> None:
+        if future.done():
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+    
+    def run() -> None:
+        result, error = None, None
+        try:
+            result = func(*args)
+        except BaseException as e:
+            error = e
+        try:
+            loop.call_soon_threadsafe(resolve, result, error)
+        except RuntimeError:
+            # The event loop was closed while the page was being fetched
+            pass
+    
+    threading.Thread(target=run, daemon=True).start()
+    return future
+
+async def stream_news_websites(
+    source: Optional[str] = None,
+    category: Optional[str] = None,
+    limit: int = 10,
+    use_cache: bool = True,
+    max_age: Optional[int] = None,
+    backend: Optional[str] = None
+) -> AsyncIterator[List[Article]]:
+    """
+    Scrape all matching (source, category) pages concurrently.
+    
+    Yields the news items of each page as soon as it has been parsed.
+    At most SCRAPE_CONCURRENCY pages are fetched at once, and at most
+    SCRAPE_HOST_CONCURRENCY from any single host.
+    
+    Args:
+        source: The news source to scrape from
+        category: The news category to filter by
+        limit: Maximum number of news items to extract from each page
+        use_cache: Whether to use the on-disk response cache
+        max_age: Override the configured cache TTL (in seconds)
+        backend: "html", "rss" or "auto" (default: SCRAPE_BACKEND)
+    """
+    targets = get_scrape_targets(source, category)
+    if not targets:
+        return
+    
+    global_semaphore = asyncio.Semaphore(SCRAPE_CONCURRENCY)
+    host_semaphores: Dict[str, asyncio.Semaphore] = {}
+    
+    async def scrape_page(src: str, cat: Optional[str]) -> List[Article]:
+        host_semaphore = host_semaphores.setdefault(
+            get_request_host(src, cat, backend), asyncio.Semaphore(SCRAPE_HOST_CONCURRENCY)
+        )
+        # Take the per-host slot first so a busy host cannot hold global slots
+        async with host_semaphore, global_semaphore:
+            return await run_in_daemon_thread(
+                scrape_single_source, src, cat, limit, use_cache, max_age, backend
+            )
+    
+    tasks = [asyncio.ensure_future(scrape_page(src, cat)) for src, cat in targets]
+    try:
+        for next_page in asyncio.as_completed(tasks):
+            yield await next_page
+    finally:
+        for task in tasks:
+            task.cancel()
+
+async def stream_top_news(
+    source: Optional[str] = None,
+    category: Optional[str] = None,
+    limit: int = 10,
+    use_cache: bool = True,
+    max_age: Optional[int] = None,
+    backend: Optional[str] = None
+) -> AsyncIterator[List[Article]]:
+    """
+    Merge scraped pages into the `limit` most recent news items.
+    
+    Every page may contribute up to `limit` items, so a quiet source
+    leaves room for a busy one. Items are merged through a bounded heap as
+    pages arrive, and the current top items (newest first) are yielded
+    whenever a page changes them. The last list yielded is the newest
+    `limit` items of every page.
+    
+    If SCRAPE_SETTLE_TIMEOUT is set, pages still outstanding that many
+    seconds after `limit` items have been collected are abandoned. The
+    results are then best-effort: the newest items of the pages that
+    answered in time, which can change with network timing.
+    """
+    merger = TopNewsMerger(limit)
+    pages = stream_news_websites(source, category, limit, use_cache, max_age, backend)
+    
+    try:
+        while True:
+            timeout = SCRAPE_SETTLE_TIMEOUT if merger.is_full() else None
+            try:
+                page_news = await asyncio.wait_for(pages.__anext__(), timeout)
+            except (StopAsyncIteration, asyncio.TimeoutError):
+                break
+            
+            # Keep a local copy of every scraped article
+            save_articles(page_news)
+            
+            changed = False
+            for item in page_news:
+                changed = merger.push(item) or changed
+            if changed:
+                yield merger.items()
+    finally:
+        await pages.aclose()
+
+def iterate_async(agen: AsyncIterator[Any]) -> Iterator[Any]:
+    """Drive an async generator from synchronous code on a private event loop."""
+    loop = asyncio.new_event_loop()
+    try:
+        while True:
+            try:
+                yield loop.run_until_complete(agen.__anext__())
+            except StopAsyncIteration:
+                break
+    finally:
+        loop.run_until_complete(agen.aclose())
+        loop.close()
+
+def iter_news_websites(
+    source: Optional[str] = None,
+    category: Optional[str] = None,
+    limit: int = 10,
+    use_cache: bool = True,
+    max_age: Optional[int] = None,
+    backend: Optional[str] = None
+) -> Iterator[List[Article]]:
+    """
+    Scrape news from Indian news websites progressively.
+    
+    Yields the current `limit` most recent news items, newest first, each
+    time a scraped page changes them. The last list yielded is the result.
+    """
+    if source and source not in NEWS_SOURCES:
+        return
+    
+    yield from iterate_async(stream_top_news(source, category, limit, use_cache, max_age, backend))
+
+def iter_scraped_news(
+    source: Optional[str] = None,
+    category: Optional[str] = None,
+    limit: int = 10,
+    use_cache: bool = True,
+    max_age: Optional[int] = None,
+    backend: Optional[str] = None
+) -> Iterator[Article]:
+    """
+    Scrape news from Indian news websites one item at a time.
+    
+    Unlike iter_news_websites, items are yielded as soon as their page is
+    parsed, in the order pages finish rather than newest first. Repeated
+    and near-duplicate items are skipped, and scraping stops after `limit`
+    items.
+    """
+    if source and source not in NEWS_SOURCES:
+        return
+    
+    seen = DuplicateFilter()
+    count = 0
+    pages = iterate_async(stream_news_websites(source, category, limit, use_cache, max_age, backend))
+    try:
+        for page_news in pages:
+            # Keep a local copy of every scraped article
+            save_articles(page_news)
+            
+            for item in page_news:
+                if not seen.add(item):
+                    continue
+                yield item
+                count += 1
+                if count >= limit:
+                    return
+    finally:
+        # Abandon the pages still being scraped
+        pages.close()
+
 def scrape_news_websites(
     source: Optional[str] = None,
     category: Optional[str] = None,
-    limit: int = 10
-) -> List[Dict[str, Any]]:
+    limit: int = 10,
+    use_cache: bool = True,
+    max_age: Optional[int] = None,
+    backend: Optional[str] = None
+) -> List[Article]:
     """
     Scrape news from Indian news websites.
     
@@ -29,53 +255,87 @@ def scrape_news_websites(
         source: The news source to scrape from
         category: The news category to filter by
         limit: Maximum number of news items to return
+        use_cache: Whether to use the on-disk response cache
+        max_age: Override the configured cache TTL (in seconds)
+        backend: "html", "rss" or "auto" (default: SCRAPE_BACKEND)
         
     Returns:
         List of normalized news items
     """
-    # If source is specified, scrape only that source
-    if source:
-        if source in NEWS_SOURCES:
-            return scrape_single_source(source, category, limit)
-        else:
-            return []
-    
-    # Otherwise, scrape all sources and combine results
-    all_news = []
-    sources = list(NEWS_SOURCES.keys())
+    top_news: List[Article] = []
+    for top_news in iter_news_websites(source, category, limit, use_cache, max_age, backend):
+        pass
     
-    # Use ThreadPoolExecutor to scrape sources in parallel
-    with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
-        future_to_source = {
-            executor.submit(scrape_single_source, src, category, limit // len(sources) + 1): src
-            for src in sources
-        }
-        
-        for future in concurrent.futures.as_completed(future_to_source):
-            source_news = future.result()
-            all_news.extend(source_news)
-    
-    # Sort by published date (if available) and limit results
-    all_news.sort(
-        key=lambda x: x.get("published_at", "Unknown"),
-        reverse=True
-    )
-    
-    return all_news[:limit]
+    return top_news
 
 def scrape_single_source(
     source: str,
     category: Optional[str] = None,
-    limit: int = 10
-) -> List[Dict[str, Any]]:
+    limit: int = 10,
+    use_cache: bool = True,
+    max_age: Optional[int] = None,
+    backend: Optional[str] = None
+) -> List[Article]:
     """
     Scrape a single news source.
     
+    Depending on the backend, reads the page's RSS/Atom feed, its web page,
+    or the feed first and the web page if the feed gives no items.
+    
     Args:
         source: The news source to scrape from
         category: The news category to filter by
         limit: Maximum number of news items to return
+        use_cache: Whether to use the on-disk response cache
+        max_age: Override the configured cache TTL (in seconds)
+        backend: "html", "rss" or "auto" (default: SCRAPE_BACKEND)
         
+    Returns:
+        List of normalized news items
+    
+    Raises:
+        ValueError: If the backend is not one of SCRAPE_BACKENDS
+    """
+    backend = backend or SCRAPE_BACKEND
+    if backend not in SCRAPE_BACKENDS:
+        raise ValueError(f"Unknown scrape backend: {backend}")
+    
+    if backend != "html":
+        news_items = scrape_feed(source, category, limit, use_cache, max_age)
+        if news_items or backend == "rss":
+            return news_items
+        profiling.count("feed_fallbacks", 1, NEWS_SOURCES.get(source, {}).get("name", source))
+    
+    return scrape_web_page(source, category, limit, use_cache, max_age)
+
+def get_page_url(source_info: Dict[str, Any], category: Optional[str] = None) -> str:
+    """Get the web page URL of a source's category (the front page if none)."""
+    base_url = source_info.get("scrape_url", "")
+    if base_url and category and category in source_info.get("categories", {}):
+        return base_url + source_info["categories"][category]
+    return base_url
+
+def get_request_host(source: str, category: Optional[str] = None, backend: Optional[str] = None) -> str:
+    """
+    Get the host scrape_single_source sends its first request to.
+    
+    That is the host of the page's feed, unless the backend is "html" or
+    the page has no feed, in which case it is the host of the web page.
+    """
+    source_info = NEWS_SOURCES.get(source, {})
+    url = get_feed_url(source_info, category) if (backend or SCRAPE_BACKEND) != "html" else None
+    return urlparse(url or get_page_url(source_info, category)).netloc.lower()
+
+def scrape_web_page(
+    source: str,
+    category: Optional[str] = None,
+    limit: int = 10,
+    use_cache: bool = True,
+    max_age: Optional[int] = None
+) -> List[Article]:
+    """
+    Scrape the web page of a source's category.
+    
     Returns:
         List of normalized news items
     """
@@ -83,313 +343,263 @@ def scrape_single_source(
     if not source_info:
         return []
     
-    base_url = source_info.get("scrape_url", "")
-    if not base_url:
+    # Get category-specific URL if category is specified
+    url = get_page_url(source_info, category)
+    if not url:
         return []
     
-    # Get category-specific URL if category is specified
-    if category and category in source_info.get("categories", {}):
-        category_path = source_info["categories"][category]
-        url = base_url + category_path
-    else:
-        url = base_url
+    return fetch_items(
+        url,
+        source,
+        category,
+        limit,
+        lambda body: run_parser(source, source_info, body, category, limit),
+        use_cache,
+        max_age,
+        accept=HTML_ACCEPT
+    )
+
+def scrape_feed(
+    source: str,
+    category: Optional[str] = None,
+    limit: int = 10,
+    use_cache: bool = True,
+    max_age: Optional[int] = None
+) -> List[Article]:
+    """
+    Read the RSS/Atom feed of a source's category.
+    
+    Feeds are parsed in the fetching thread: they are small, and parsing
+    stops after `limit` items.
+    
+    Returns:
+        List of normalized news items; empty if the category has no feed
+    """
+    source_info = NEWS_SOURCES.get(source, {})
+    url = get_feed_url(source_info, category)
+    if not url:
+        return []
+    
+    return fetch_items(
+        url,
+        source,
+        category,
+        limit,
+        lambda body: parse_feed(body, source_info, category, limit),
+        use_cache,
+        max_age,
+        accept=FEED_ACCEPT
+    )
+
+def fetch_items(
+    url: str,
+    source: str,
+    category: Optional[str],
+    limit: int,
+    parse: Callable[[bytes], List[Article]],
+    use_cache: bool = True,
+    max_age: Optional[int] = None,
+    accept: str = HTML_ACCEPT
+) -> List[Article]:
+    """
+    Download a page or feed through the response cache and parse its news items.
+    
+    Fresh cache entries are served without a request, and stale ones are
+    revalidated with a conditional request.
+    
+    Args:
+        url: The URL to download
+        source: The news source the URL belongs to
+        category: The news category to filter by
+        limit: Maximum number of news items to return
+        parse: Function extracting the news items from a response body
+        use_cache: Whether to use the on-disk response cache
+        max_age: Override the configured cache TTL (in seconds)
+        accept: Accept header of the request
+        
+    Returns:
+        List of normalized news items; empty if the download fails
+    """
+    source_name = NEWS_SOURCES.get(source, {}).get("name", source)
     
     try:
+        # Serve from the cache while the entry is within its TTL
+        with profiling.span("cache", source_name):
+            entry = response_cache.get(url) if use_cache else None
+        ttl = get_cache_ttl(source, category) if max_age is None else max_age
+        
+        if entry and entry.is_fresh(ttl):
+            cached_items = _items_from_cache(entry, parse, category, limit)
+            if cached_items is not None:
+                profiling.count("cache_hits", 1, source_name)
+                return cached_items
+        
         # Make request with custom headers
         headers = {
             "User-Agent": USER_AGENT,
-            "Accept": "text/html,application/xhtml+xml,application/xml",
+            "Accept": accept,
             "Accept-Language": "en-US,en;q=0.9"
         }
         
-        response = requests.get(url, headers=headers, timeout=REQUEST_TIMEOUT)
+        # Revalidate a stale entry instead of downloading the page again
+        if entry:
+            headers.update(entry.validator_headers())
+        
+        started = time.perf_counter()
+        response = http_client.get(url, headers=headers)
+        if profiling.is_enabled():
+            # elapsed covers connecting and waiting for the headers; the
+            # rest of the call is reading the body
+            waited = response.elapsed.total_seconds()
+            profiling.record("request", waited, source_name)
+            profiling.record("download", max(0.0, time.perf_counter() - started - waited), source_name)
+            profiling.count("bytes", len(response.content), source_name)
+        
+        if response.status_code == 304 and entry:
+            profiling.count("not_modified", 1, source_name)
+            response_cache.touch(entry, response.headers)
+            cached_items = _items_from_cache(entry, parse, category, limit)
+            return cached_items if cached_items is not None else []
         
         if response.status_code != 200:
             return []
-            
-        # Parse HTML
-        soup = BeautifulSoup(response.text, "html.parser")
         
-        # Extract news based on source
-        if source == "the-hindu":
-            return scrape_the_hindu(soup, source_info, category, limit)
-        elif source == "times-of-india":
-            return scrape_times_of_india(soup, source_info, category, limit)
-        elif source == "indian-express":
-            return scrape_indian_express(soup, source_info, category, limit)
-        elif source == "ndtv":
-            return scrape_ndtv(soup, source_info, category, limit)
-        else:
-            return []
+        news_items = parse(response.content)
+        
+        if use_cache:
+            with profiling.span("cache", source_name):
+                response_cache.put(url, response.content, response.headers, news_items, category, limit)
+        
+        return news_items
             
     except Exception as e:
         # If scraping fails, return empty list
         return []
 
-def scrape_the_hindu(
-    soup: BeautifulSoup,
-    source_info: Dict[str, Any],
-    category: Optional[str] = None,
-    limit: int = 10
-) -> List[Dict[str, Any]]:
+def fetch_article_body(url: str) -> str:
     """
-    Scrape news from The Hindu website.
+    Download an article page and extract its full text.
+    
+    Raises:
+        ScraperError: If the page cannot be downloaded
     """
-    news_items = []
-    base_url = source_info.get("scrape_url", "")
+    # Use the schema of the source the article belongs to, if any
+    host = urlparse(url).netloc.lower()
+    source_info = next(
+        (
+            info for info in NEWS_SOURCES.values()
+            if urlparse(info.get("scrape_url", "")).netloc.lower() == host
+        ),
+        {}
+    )
     
-    # Find news article elements
-    articles = soup.select("div.story-card, div.story-card-33")
+    headers = {
+        "User-Agent": USER_AGENT,
+        "Accept": HTML_ACCEPT,
+        "Accept-Language": "en-US,en;q=0.9"
+    }
     
-    for article in articles[:limit]:
-        try:
-            # Extract title
-            title_elem = article.select_one("h3.title, h2.title")
-            if not title_elem:
-                continue
-            title = clean_text(title_elem.text)
-            
-            # Extract URL
-            link_elem = article.select_one("a")
-            url = link_elem.get("href", "") if link_elem else ""
-            if url and not url.startswith("http"):
-                url = base_url + url
-                
-            # Extract description
-            desc_elem = article.select_one("p.intro, div.story-card-33-text")
-            description = clean_text(desc_elem.text) if desc_elem else ""
-            
-            # Extract image
-            img_elem = article.select_one("img")
-            image_url = img_elem.get("src", "") if img_elem else ""
-            
-            # Extract date
-            date_elem = article.select_one("span.dateline, span.dateTime")
-            published_at = clean_text(date_elem.text) if date_elem else datetime.datetime.now().strftime("%d %b %Y")
-            
-            # Create news item
-            item = {
-                "title": title,
-                "description": description,
-                "url": url,
-                "urlToImage": image_url,
-                "publishedAt": published_at,
-                "source": {"name": source_info.get("name", "The Hindu")}
-            }
-            
-            # Determine category if not specified
-            if not category or category == "general":
-                item_category = categorize_article(title, description)
-            else:
-                item_category = category
-                
-            item["category"] = item_category
-            
-            # Normalize and add to results
-            news_items.append(normalize_news_item(item, source_info.get("name", "The Hindu")))
-            
-        except Exception:
-            continue
-            
-    return news_items
+    try:
+        response = http_client.get(url, headers=headers)
+    except Exception as e:
+        raise ScraperError(f"Failed to download article: {e}") from e
+    
+    if response.status_code != 200:
+        raise ScraperError(f"Article request failed with status code {response.status_code}")
+    
+    return extract_article_body(response.content, source_info)
 
-def scrape_times_of_india(
-    soup: BeautifulSoup,
-    source_info: Dict[str, Any],
-    category: Optional[str] = None,
-    limit: int = 10
-) -> List[Dict[str, Any]]:
+def _items_from_cache(
+    entry: CacheEntry,
+    parse: Callable[[bytes], List[Article]],
+    category: Optional[str],
+    limit: int
+) -> Optional[List[Article]]:
     """
-    Scrape news from Times of India website.
+    Get news items for a cached page, re-parsing the body only if the
+    cached items were extracted with a smaller limit or another category.
     """
-    news_items = []
-    base_url = source_info.get("scrape_url", "")
+    news_items = entry.items_for(category, limit)
+    if news_items is not None:
+        return news_items
     
-    # Find news article elements
-    articles = soup.select("div.main-content div.card-container")
+    body = entry.read_body()
+    if body is None:
+        return None
     
-    for article in articles[:limit]:
-        try:
-            # Extract title
-            title_elem = article.select_one("span.title")
-            if not title_elem:
-                continue
-            title = clean_text(title_elem.text)
-            
-            # Extract URL
-            link_elem = article.select_one("a")
-            url = link_elem.get("href", "") if link_elem else ""
-            if url and not url.startswith("http"):
-                url = base_url + url
-                
-            # Extract description
-            desc_elem = article.select_one("p.synopsis")
-            description = clean_text(desc_elem.text) if desc_elem else ""
-            
-            # Extract image
-            img_elem = article.select_one("img")
-            image_url = img_elem.get("src", "") if img_elem else ""
-            
-            # Extract date
-            date_elem = article.select_one("span.date")
-            published_at = clean_text(date_elem.text) if date_elem else datetime.datetime.now().strftime("%d %b %Y")
-            
-            # Create news item
-            item = {
-                "title": title,
-                "description": description,
-                "url": url,
-                "urlToImage": image_url,
-                "publishedAt": published_at,
-                "source": {"name": source_info.get("name", "Times of India")}
-            }
-            
-            # Determine category if not specified
-            if not category or category == "general":
-                item_category = categorize_article(title, description)
-            else:
-                item_category = category
-                
-            item["category"] = item_category
-            
-            # Normalize and add to results
-            news_items.append(normalize_news_item(item, source_info.get("name", "Times of India")))
-            
-        except Exception:
-            continue
-            
+    news_items = parse(body)
+    response_cache.update_items(entry, news_items, category, limit)
     return news_items
 
-def scrape_indian_express(
-    soup: BeautifulSoup,
+def _get_parse_pool() -> Optional[concurrent.futures.ProcessPoolExecutor]:
+    """Get the shared parsing process pool, creating it on first use."""
+    global _parse_pool
+    if PARSE_WORKERS <= 0:
+        return None
+    if _parse_pool is None:
+        with _parse_pool_lock:
+            if _parse_pool is None:
+                # Workers are spawned rather than forked because the pool is
+                # created lazily from fetcher threads
+                _parse_pool = concurrent.futures.ProcessPoolExecutor(
+                    max_workers=PARSE_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+    return _parse_pool
+
+def shutdown_parse_pool() -> None:
+    """Shut down the parsing process pool, if it was started."""
+    global _parse_pool
+    with _parse_pool_lock:
+        if _parse_pool is not None:
+            _parse_pool.shutdown(wait=True)
+            _parse_pool = None
+
+def run_parser(
+    source: str,
     source_info: Dict[str, Any],
+    body: bytes,
     category: Optional[str] = None,
     limit: int = 10
-) -> List[Dict[str, Any]]:
-    """
-    Scrape news from Indian Express website.
+) -> List[Article]:
     """
-    news_items = []
-    base_url = source_info.get("scrape_url", "")
-    
-    # Find news article elements
-    articles = soup.select("div.article, div.articles")
+    Parse a page on the parsing process pool.
     
-    for article in articles[:limit]:
+    Only the raw page bytes are sent to the worker and only the extracted
+    news items come back (with the worker's timings while profiling).
+    Parses in the calling thread if the pool is disabled or unavailable.
+    """
+    pool = _get_parse_pool()
+    if pool is not None:
         try:
-            # Extract title
-            title_elem = article.select_one("h2.title, h3.title")
-            if not title_elem:
-                continue
-            title = clean_text(title_elem.text)
-            
-            # Extract URL
-            link_elem = article.select_one("a")
-            url = link_elem.get("href", "") if link_elem else ""
-            if url and not url.startswith("http"):
-                url = base_url + url
-                
-            # Extract description
-            desc_elem = article.select_one("p.description, div.synopsis")
-            description = clean_text(desc_elem.text) if desc_elem else ""
-            
-            # Extract image
-            img_elem = article.select_one("img")
-            image_url = img_elem.get("src", "") if img_elem else ""
-            
-            # Extract date
-            date_elem = article.select_one("div.date, span.date")
-            published_at = clean_text(date_elem.text) if date_elem else datetime.datetime.now().strftime("%d %b %Y")
-            
-            # Create news item
-            item = {
-                "title": title,
-                "description": description,
-                "url": url,
-                "urlToImage": image_url,
-                "publishedAt": published_at,
-                "source": {"name": source_info.get("name", "Indian Express")}
-            }
-            
-            # Determine category if not specified
-            if not category or category == "general":
-                item_category = categorize_article(title, description)
-            else:
-                item_category = category
-                
-            item["category"] = item_category
-            
-            # Normalize and add to results
-            news_items.append(normalize_news_item(item, source_info.get("name", "Indian Express")))
-            
-        except Exception:
-            continue
-            
-    return news_items
+            if profiling.is_enabled():
+                future = pool.submit(
+                    profiling.run_profiled, parse_source_page, source, source_info, body, category, limit
+                )
+                news_items, timings = future.result()
+                profiling.merge(timings)
+                return news_items
+            future = pool.submit(parse_source_page, source, source_info, body, category, limit)
+            return future.result()
+        except (BrokenProcessPool, RuntimeError):
+            pass
+    
+    return parse_source_page(source, source_info, body, category, limit)
 
-def scrape_ndtv(
-    soup: BeautifulSoup,
+def parse_source_page(
+    source: str,
     source_info: Dict[str, Any],
+    body: bytes,
     category: Optional[str] = None,
     limit: int = 10
-) -> List[Dict[str, Any]]:
+) -> List[Article]:
     """
-    Scrape news from NDTV website.
-    """
-    news_items = []
-    base_url = source_info.get("scrape_url", "")
+    Parse a downloaded page and extract news items for the given source.
     
-    # Find news article elements
-    articles = soup.select("div.news_item, div.new_storylising, div.story_list")
+    Articles are extracted with the "selectors" schema of the source.
+    """
+    if not source_info.get("selectors"):
+        return []
     
-    for article in articles[:limit]:
-        try:
-            # Extract title
-            title_elem = article.select_one("h2.newsHdng, h3.newsHdng, h2.headline")
-            if not title_elem:
-                continue
-            title = clean_text(title_elem.text)
-            
-            # Extract URL
-            link_elem = article.select_one("a")
-            url = link_elem.get("href", "") if link_elem else ""
-            if url and not url.startswith("http"):
-                url = base_url + url
-                
-            # Extract description
-            desc_elem = article.select_one("p.newsCont, div.newsCont, p.description")
-            description = clean_text(desc_elem.text) if desc_elem else ""
-            
-            # Extract image
-            img_elem = article.select_one("img")
-            image_url = img_elem.get("src", "") if img_elem else ""
-            
-            # Extract date
-            date_elem = article.select_one("span.posted-on, div.posted-on, span.update_date")
-            published_at = clean_text(date_elem.text) if date_elem else datetime.datetime.now().strftime("%d %b %Y")
-            
-            # Create news item
-            item = {
-                "title": title,
-                "description": description,
-                "url": url,
-                "urlToImage": image_url,
-                "publishedAt": published_at,
-                "source": {"name": source_info.get("name", "NDTV")}
-            }
-            
-            # Determine category if not specified
-            if not category or category == "general":
-                item_category = categorize_article(title, description)
-            else:
-                item_category = category
-                
-            item["category"] = item_category
-            
-            # Normalize and add to results
-            news_items.append(normalize_news_item(item, source_info.get("name", "NDTV")))
-            
-        except Exception:
-            continue
-            
-    return news_items 
\ No newline at end of file
+    # Parse HTML, building only the article cards unless disabled
+    return parse_articles(body, source_info, category, limit, partial=PARTIAL_PARSE)
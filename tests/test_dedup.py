@@ -0,0 +1,78 @@
+"""
+Tests for near-duplicate detection of news items.
+"""
+
+import unittest
+
+from utils.dedup import DuplicateIndex, minhash, shingles, similarity
+
+class ShinglesTest(unittest.TestCase):
+    def test_non_latin_text_is_shingled(self):
+        self.assertTrue(shingles("संसद ने डेटा संरक्षण विधेयक पारित किया"))
+
+    def test_punctuation_and_case_are_ignored(self):
+        self.assertEqual(shingles("Sensex, Nifty close HIGHER!"), shingles("sensex nifty close higher"))
+
+class MinHashTest(unittest.TestCase):
+    def test_identical_text_has_identical_signature(self):
+        text = "Parliament passes the data protection bill"
+        self.assertEqual(similarity(minhash(shingles(text)), minhash(shingles(text))), 1.0)
+
+    def test_similarity_follows_jaccard(self):
+        a = shingles("Parliament passes the data protection bill after a long debate")
+        b = shingles("Parliament passes data protection bill after long debate")
+        c = shingles("Monsoon arrives early in Kerala, IMD says")
+        near = similarity(minhash(a), minhash(b))
+        self.assertAlmostEqual(near, len(a & b) / len(a | b), delta=0.15)
+        self.assertLess(similarity(minhash(a), minhash(c)), 0.2)
+
+    def test_short_text_fills_every_bin(self):
+        # Densification leaves no empty bins, even for a handful of shingles
+        signature = minhash(shingles("RBI rate"))
+        self.assertNotIn((1 << 32), signature)
+        self.assertEqual(signature, minhash(shingles("RBI rate")))
+
+    def test_empty_text(self):
+        self.assertEqual(minhash(shingles("")), ())
+        self.assertEqual(similarity((), ()), 0.0)
+
+class DuplicateIndexTest(unittest.TestCase):
+    def test_near_duplicate_titles_collapse(self):
+        index = DuplicateIndex()
+        original = {"source": "NDTV", "title": "Parliament passes the data protection bill after a long debate"}
+        self.assertIsNone(index.add(original))
+        duplicate = {"source": "The Hindu", "title": "Parliament passes data protection bill after long debate"}
+        self.assertIs(index.add(duplicate), original)
+
+    def test_different_stories_do_not_collapse(self):
+        index = DuplicateIndex()
+        for source, title in (
+            ("NDTV", "Parliament passes the data protection bill after a long debate"),
+            ("The Hindu", "Parliament adjourned after protests over the price rise"),
+            ("Indian Express", "Monsoon arrives early in Kerala, IMD says"),
+            ("Times of India", "Data protection rules to be notified next month")
+        ):
+            self.assertIsNone(index.add({"source": source, "title": title}), title)
+
+    def test_same_source_is_never_a_duplicate(self):
+        index = DuplicateIndex()
+        title = "Parliament passes the data protection bill after a long debate"
+        index.add({"source": "NDTV", "title": title, "url": "https://ndtv.com/a"})
+        self.assertIsNone(index.add({"source": "NDTV", "title": title, "url": "https://ndtv.com/b"}))
+
+    def test_removed_item_is_not_matched(self):
+        index = DuplicateIndex()
+        original = {"source": "NDTV", "title": "Parliament passes the data protection bill after a long debate"}
+        index.add(original)
+        index.remove(original)
+        self.assertIsNone(index.add({"source": "The Hindu", "title": original["title"]}))
+
+    def test_hindi_near_duplicates_collapse(self):
+        index = DuplicateIndex()
+        original = {"source": "NDTV", "title": "संसद ने डेटा संरक्षण विधेयक पारित किया, विपक्ष ने किया विरोध"}
+        self.assertIsNone(index.add(original))
+        duplicate = {"source": "The Hindu", "title": "संसद ने डेटा संरक्षण विधेयक पारित किया; विपक्ष ने किया विरोध"}
+        self.assertIs(index.add(duplicate), original)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,34 @@
+"""
+Tests for the schema-driven article extractor.
+"""
+
+import unittest
+
+from scrapers.extractor import parse_articles
+from utils.config import NEWS_SOURCES
+
+def make_page(empty_cards: int, story_cards: int) -> bytes:
+    cards = ['<div class="news_item"><div class="ad">Advertisement</div></div>'] * empty_cards
+    cards += [
+        f'<div class="news_item"><h2 class="newsHdng"><a href="/news/{index}">'
+        f'Story number {index} about the monsoon session</a></h2></div>'
+        for index in range(story_cards)
+    ]
+    return f"<html><body>{''.join(cards)}</body></html>".encode()
+
+class PartialParseTest(unittest.TestCase):
+    def assert_same_as_full_parse(self, body: bytes, limit: int):
+        source_info = NEWS_SOURCES["ndtv"]
+        full = parse_articles(body, source_info, "general", limit, partial=False)
+        partial = parse_articles(body, source_info, "general", limit, partial=True)
+        self.assertEqual([item["title"] for item in partial], [item["title"] for item in full])
+        return partial
+
+    def test_cards_without_title_do_not_cut_results_short(self):
+        self.assertEqual(len(self.assert_same_as_full_parse(make_page(3, 5), 3)), 3)
+
+    def test_reparses_when_margin_is_used_up(self):
+        self.assertEqual(len(self.assert_same_as_full_parse(make_page(20, 5), 3)), 3)
+
+if __name__ == "__main__":
+    unittest.main()
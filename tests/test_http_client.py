@@ -0,0 +1,52 @@
+"""
+Tests for the shared HTTP client and its host health tracking.
+"""
+
+import os
+import socket
+import tempfile
+import unittest
+from unittest import mock
+
+import requests
+
+from utils import http_client
+from utils.config import MAX_RETRIES
+from utils.health import HostHealthTracker
+
+def closed_port_url() -> str:
+    """Get a local URL nothing listens on, so connecting fails right away."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    return f"http://127.0.0.1:{port}/news"
+
+class HealthTrackingTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.health = HostHealthTracker(os.path.join(self.tmpdir.name, "health.json"))
+        patches = [
+            mock.patch.object(http_client, "host_health", self.health),
+            mock.patch.object(http_client.time, "sleep")
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_one_failed_fetch_does_not_open_the_circuit(self):
+        url = closed_port_url()
+        host = url.split("/")[2]
+
+        with self.assertRaises(requests.ConnectionError):
+            http_client.get(url, retries=MAX_RETRIES)
+
+        report = self.health.report()[host]
+        self.assertEqual(report["state"], "closed")
+        self.assertEqual(report["consecutive_failures"], 1)
+        self.assertTrue(self.health.allow(host))
+
+if __name__ == "__main__":
+    unittest.main()
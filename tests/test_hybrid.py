@@ -0,0 +1,54 @@
+"""
+Tests for hybrid mode, merging NewsAPI and the web scrapers.
+"""
+
+import asyncio
+import unittest
+from unittest import mock
+
+from api import hybrid
+from utils.article import Article
+
+TOPICS = [
+    "Monsoon arrives early in Kerala", "Sensex closes at a record high",
+    "Parliament passes the data protection bill", "ISRO launches a weather satellite",
+    "India beat Australia in the final over", "Metro line opens in Bengaluru",
+    "RBI keeps the repo rate unchanged", "Heatwave alert issued for Delhi",
+    "New film breaks opening day records", "Hospital network adds rural clinics",
+    "Farmers protest over crop prices", "Startup raises funds for electric buses",
+    "Court rules on river water sharing", "Floods disrupt trains in Assam",
+    "Chess prodigy wins the national title"
+]
+
+def make_articles(source: str, count: int, first_ts: int, first_topic: int):
+    return [
+        Article(
+            id=f"{source}-{index}",
+            title=TOPICS[first_topic + index],
+            url=f"https://{source}.example.com/news/{index}",
+            source=source,
+            published_ts=first_ts + index
+        )
+        for index in range(count)
+    ]
+
+class HybridItemsTest(unittest.TestCase):
+    def test_yields_only_the_merged_top_items(self):
+        older = make_articles("api", 5, 1000, 0)
+        newer = make_articles("scraper", 10, 2000, 5)
+
+        async def stream_pages(*args, **kwargs):
+            # Answer after NewsAPI, with newer items that push its items out
+            await asyncio.sleep(0.1)
+            yield newer
+
+        with mock.patch.object(hybrid, "fetch_news_from_api", return_value=older), \
+                mock.patch.object(hybrid, "stream_news_websites", stream_pages), \
+                mock.patch.object(hybrid, "save_articles"):
+            items = list(hybrid.iter_hybrid_items(limit=10, hedge_after=0, primary="api"))
+
+        self.assertEqual(len(items), 10)
+        self.assertEqual([item.id for item in items], [item.id for item in reversed(newer)])
+
+if __name__ == "__main__":
+    unittest.main()
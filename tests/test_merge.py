@@ -0,0 +1,43 @@
+"""
+Tests for the streaming merge of news items from several sources.
+"""
+
+import unittest
+
+from utils.merge import TopNewsMerger
+
+def make_item(source: str, title: str, published_ts: int, url: str):
+    return {
+        "title": title,
+        "description": f"{title}, reported on the evening of the session.",
+        "url": url,
+        "source": source,
+        "published_ts": published_ts
+    }
+
+STORY = "Parliament passes the revised data protection bill after a long debate"
+
+class TopNewsMergerTest(unittest.TestCase):
+    def test_duplicate_of_evicted_item_is_kept(self):
+        merger = TopNewsMerger(2)
+        merger.push(make_item("NDTV", STORY, 10, "https://ndtv.com/a"))
+        merger.push(make_item("NDTV", "Monsoon arrives early in Kerala this year", 50, "https://ndtv.com/b"))
+        merger.push(make_item("NDTV", "Sensex closes at a record high on bank stocks", 60, "https://ndtv.com/c"))
+
+        self.assertTrue(merger.push(make_item("The Hindu", STORY, 100, "https://thehindu.com/a")))
+        titles = [item["title"] for item in merger.items()]
+        self.assertEqual(titles[0], STORY)
+        self.assertEqual(len(titles), 2)
+
+    def test_duplicate_of_kept_item_is_folded(self):
+        merger = TopNewsMerger(2)
+        merger.push(make_item("NDTV", STORY, 10, "https://ndtv.com/a"))
+
+        self.assertTrue(merger.push(make_item("The Hindu", STORY, 20, "https://thehindu.com/a")))
+        self.assertFalse(merger.push(make_item("The Hindu", STORY, 20, "https://thehindu.com/a")))
+        items = merger.items()
+        self.assertEqual(len(items), 1)
+        self.assertEqual(items[0]["sources"], ["NDTV", "The Hindu"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,29 @@
+"""
+Tests for RSS and Atom feed parsing.
+"""
+
+import unittest
+
+from scrapers.rss_feed import read_feed
+
+def make_feed(empty_items: int, story_items: int) -> bytes:
+    items = ["<item><title></title><link>https://example.com/promo</link></item>"] * empty_items
+    items += [
+        f"<item><title>Story number {index}</title><link>https://example.com/news/{index}</link>"
+        f"<pubDate>Wed, 01 May 2024 10:00:00 +0530</pubDate></item>"
+        for index in range(story_items)
+    ]
+    return f"<rss><channel><title>Example</title>{''.join(items)}</channel></rss>".encode()
+
+class ReadFeedTest(unittest.TestCase):
+    def test_items_without_title_do_not_count_towards_limit(self):
+        articles = read_feed(make_feed(3, 5), "Example", limit=3)
+        self.assertEqual([article["title"] for article in articles],
+                         ["Story number 0", "Story number 1", "Story number 2"])
+
+    def test_malformed_feed_keeps_items_read_before_the_error(self):
+        body = make_feed(0, 2).replace(b"</channel></rss>", b"<item><title>Broken")
+        self.assertEqual(len(read_feed(body, "Example", limit=10)), 2)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+"""
+Tests for the in-memory headlines service behind the serve command.
+"""
+
+import asyncio
+import threading
+import time
+import unittest
+from http import HTTPStatus
+from unittest import mock
+
+from api import server
+from api.news_api import NewsAPIError
+from utils.article import Article
+
+KEY = ("scraper", None, None)
+
+class FakeFetch:
+    """Blocking fetch that counts its calls and answers after a delay."""
+
+    def __init__(self, delay: float = 0.05, items=None, error: Exception = None):
+        self.delay = delay
+        self.items = items if items is not None else [Article(id="a1", title="Story", source="Example")]
+        self.error = error
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, mode, source, category, limit):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return self.items
+
+class HeadlinesServiceTest(unittest.IsolatedAsyncioTestCase):
+    async def test_concurrent_requests_share_one_fetch(self):
+        fetch = FakeFetch()
+        service = server.HeadlinesService(fetch=fetch)
+
+        entries = await asyncio.gather(*(service.get(KEY) for _ in range(50)))
+
+        self.assertEqual(fetch.calls, 1)
+        self.assertEqual(service.upstream_fetches, 1)
+        self.assertTrue(all(entry is entries[0] for entry in entries))
+
+        # Headlines in memory are answered without fetching again
+        await service.get(KEY)
+        self.assertEqual(fetch.calls, 1)
+
+    async def test_cancelled_request_does_not_cancel_the_shared_fetch(self):
+        fetch = FakeFetch(delay=0.1)
+        service = server.HeadlinesService(fetch=fetch)
+
+        first = asyncio.ensure_future(service.get(KEY))
+        await asyncio.sleep(0.02)
+        second = asyncio.ensure_future(service.get(KEY))
+        first.cancel()
+
+        entry = await second
+        self.assertEqual(len(entry.encoded), 1)
+        self.assertEqual(fetch.calls, 1)
+
+    async def test_failed_fetch_is_reported(self):
+        service = server.HeadlinesService(fetch=FakeFetch(error=NewsAPIError("quota")))
+        with self.assertRaises(server.RequestError) as raised:
+            await service.get(KEY)
+        self.assertEqual(raised.exception.status, HTTPStatus.SERVICE_UNAVAILABLE)
+
+        service = server.HeadlinesService(fetch=FakeFetch(error=RuntimeError("boom")))
+        with self.assertRaises(server.RequestError) as raised:
+            await service.get(KEY)
+        self.assertEqual(raised.exception.status, HTTPStatus.BAD_GATEWAY)
+
+    async def test_refresher_refreshes_stale_and_drops_idle_headlines(self):
+        fetch = FakeFetch(delay=0)
+        service = server.HeadlinesService(fetch=fetch, refresh_after=0.05, idle_after=0.3)
+        await service.get(KEY)
+
+        with mock.patch.object(server, "REFRESH_CHECK_INTERVAL", 0.02):
+            refresher = asyncio.ensure_future(service.run_refresher())
+            try:
+                await asyncio.sleep(0.15)
+                self.assertGreater(fetch.calls, 1)
+                self.assertEqual(service.stats()["pages"], 1)
+
+                await asyncio.sleep(0.4)
+                self.assertEqual(service.stats()["pages"], 0)
+            finally:
+                refresher.cancel()
+                await asyncio.gather(refresher, return_exceptions=True)
+
+    async def test_empty_refresh_keeps_the_headlines(self):
+        fetch = FakeFetch(delay=0)
+        service = server.HeadlinesService(fetch=fetch)
+        entry = await service.get(KEY)
+
+        fetch.items = []
+        refreshed = await service._start_fetch(KEY)
+        self.assertIs(refreshed, entry)
+        self.assertEqual(len(refreshed.encoded), 1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+"""
+Tests for the local SQLite article store.
+"""
+
+import unittest
+
+from utils.store import ArticleStore, build_match_query
+
+def make_items(count: int, start: int = 0):
+    return [
+        {
+            "title": f"Story number {index} about the monsoon session",
+            "description": f"Description of story {index}",
+            "url": f"https://example.com/news/{index}",
+            "source": "Example",
+            "category": "general",
+            "published_at": "2024-05-01T10:00:00Z"
+        }
+        for index in range(start, start + count)
+    ]
+
+class UpsertTest(unittest.TestCase):
+    def setUp(self):
+        self.store = ArticleStore(":memory:")
+
+    def tearDown(self):
+        self.store.close()
+
+    def test_returns_new_rows_with_full_text_index(self):
+        self.assertEqual(self.store.upsert(make_items(51)), 51)
+        # The full-text index triggers fired, so the count is not inflated by luck
+        self.assertEqual(len(self.store.search("monsoon", limit=100)), 51)
+
+    def test_existing_rows_are_not_counted(self):
+        self.store.upsert(make_items(10))
+        self.assertEqual(self.store.upsert(make_items(10, start=5)), 5)
+        self.assertEqual(self.store.upsert(make_items(10, start=5)), 0)
+
+def make_item(index: int, title: str, description: str = "", source: str = "Example"):
+    return {
+        "title": title,
+        "description": description,
+        "url": f"https://example.com/search/{index}",
+        "source": source,
+        "category": "general",
+        "published_ts": 1700000000 + index
+    }
+
+class BuildMatchQueryTest(unittest.TestCase):
+    def test_words_and_phrases_are_quoted(self):
+        self.assertEqual(build_match_query('monsoon "heavy rain"'), '"monsoon" "heavy rain"')
+
+    def test_prefix(self):
+        self.assertEqual(build_match_query("elect*"), '"elect"*')
+
+    def test_or_between_terms(self):
+        self.assertEqual(build_match_query("cricket OR hockey"), '"cricket" OR "hockey"')
+        self.assertEqual(build_match_query("OR cricket OR"), '"cricket"')
+        self.assertEqual(build_match_query("cricket OR OR hockey"), '"cricket" OR "hockey"')
+
+    def test_other_syntax_is_plain_text(self):
+        self.assertEqual(build_match_query("NOT title:budget"), '"NOT" "title:budget"')
+        self.assertEqual(build_match_query('say "hello'), '"say" "hello"')
+        self.assertEqual(build_match_query('( ) * " -'), "")
+
+class SearchTest(unittest.TestCase):
+    def setUp(self):
+        self.store = ArticleStore(":memory:")
+        self.store.upsert([
+            make_item(0, "Budget session opens in Parliament", "Finance minister presents the budget"),
+            make_item(1, "Heavy rain lashes Mumbai", "Monsoon disrupts local trains"),
+            make_item(2, "Election results announced", "Counting of votes ends in Bihar"),
+            make_item(3, "Rain forecast for the weekend", "Budget airlines cancel flights", source="Other"),
+            make_item(4, "Elections to be held in May", "Polling in seven phases")
+        ])
+
+    def tearDown(self):
+        self.store.close()
+
+    def titles(self, text: str, **kwargs):
+        return [item["title"] for item in self.store.search(text, **kwargs)]
+
+    def test_operators_and_stray_quotes_do_not_fail(self):
+        for text in ('budget AND', 'NEAR(rain mumbai)', '"unbalanced', 'title:rain', '-rain', '(((', 'a"b"c'):
+            self.store.search(text)
+
+    def test_phrase_matches_words_in_order(self):
+        self.assertEqual(self.titles('"heavy rain"'), ["Heavy rain lashes Mumbai"])
+        self.assertEqual(self.titles('"rain heavy"'), [])
+
+    def test_prefix_matches_word_starts(self):
+        self.assertEqual(
+            sorted(self.titles("elect*")),
+            ["Election results announced", "Elections to be held in May"]
+        )
+
+    def test_title_matches_rank_first(self):
+        self.assertEqual(
+            self.titles("budget"),
+            ["Budget session opens in Parliament", "Rain forecast for the weekend"]
+        )
+
+    def test_source_filter(self):
+        self.assertEqual(self.titles("rain", source="Other"), ["Rain forecast for the weekend"])
+
+    def test_only_newest_candidates_are_ranked(self):
+        # The best match is the oldest one, so it is not among the newest candidate
+        self.assertEqual(self.titles("budget", candidates=1), ["Rain forecast for the weekend"])
+
+    def test_newest_first(self):
+        self.assertEqual(
+            self.titles("rain", newest_first=True),
+            ["Rain forecast for the weekend", "Heavy rain lashes Mumbai"]
+        )
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,159 @@
+"""
+Compact record type of normalized news items.
+"""
+
+import json
+import operator
+import sys
+from collections.abc import MutableMapping
+from typing import Any, Dict, Iterator, Mapping
+
+# Fields every article has, in the order of the normalized item format
+ARTICLE_FIELDS = (
+    "id",
+    "title",
+    "description",
+    "content",
+    "url",
+    "source",
+    "category",
+    "published_at",
+    "published_ts",
+    "image_url"
+)
+
+# Fields only some articles have; unset (None) ones are treated as absent keys
+OPTIONAL_FIELDS = ("sources", "body")
+
+_KEYS = frozenset(ARTICLE_FIELDS + OPTIONAL_FIELDS)
+_OPTIONAL = frozenset(OPTIONAL_FIELDS)
+_get_fields = operator.attrgetter(*ARTICLE_FIELDS)
+
+class Article(MutableMapping):
+    """
+    A normalized news item.
+
+    Articles are slotted records rather than dicts, and the source and
+    category strings of every article are interned, so thousands of
+    articles from a handful of sources share those strings. Articles keep
+    the read and write interface of the dicts they replace (item["title"],
+    item.get("sources"), item.setdefault(...)), limited to the article
+    fields.
+    """
+
+    __slots__ = ARTICLE_FIELDS + OPTIONAL_FIELDS
+
+    def __init__(
+        self,
+        id: str = "",
+        title: str = "",
+        description: str = "",
+        content: str = "",
+        url: str = "",
+        source: str = "",
+        category: str = "general",
+        published_at: str = "",
+        published_ts: Any = None,
+        image_url: str = "",
+        sources: Any = None,
+        body: Any = None
+    ):
+        self.id = id
+        self.title = title
+        self.description = description
+        self.content = content
+        self.url = url
+        self.source = sys.intern(source or "")
+        self.category = sys.intern(category or "general")
+        self.published_at = published_at
+        self.published_ts = published_ts
+        self.image_url = image_url
+        self.sources = sources
+        self.body = body
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "Article":
+        """Build an article from a news item dict, ignoring unknown keys."""
+        return cls(**{key: value for key, value in data.items() if key in _KEYS})
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in _KEYS:
+            raise KeyError(key)
+        value = getattr(self, key)
+        if value is None and key in _OPTIONAL:
+            raise KeyError(key)
+        return value
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key not in _KEYS:
+            return default
+        value = getattr(self, key)
+        if value is None and key in _OPTIONAL:
+            return default
+        return value
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key not in _KEYS:
+            raise KeyError(f"Article has no field {key!r}")
+        if key == "source" or key == "category":
+            value = sys.intern(value or "")
+        setattr(self, key, value)
+
+    def __delitem__(self, key: str) -> None:
+        # Only the optional fields can be removed
+        if key not in _OPTIONAL or getattr(self, key) is None:
+            raise KeyError(key)
+        setattr(self, key, None)
+
+    def __iter__(self) -> Iterator[str]:
+        yield from ARTICLE_FIELDS
+        for key in OPTIONAL_FIELDS:
+            if getattr(self, key) is not None:
+                yield key
+
+    def __len__(self) -> int:
+        return len(ARTICLE_FIELDS) + sum(getattr(self, key) is not None for key in OPTIONAL_FIELDS)
+
+    def __contains__(self, key: object) -> bool:
+        if key not in _KEYS:
+            return False
+        return key not in _OPTIONAL or getattr(self, key) is not None
+
+    def __repr__(self) -> str:
+        return f"Article(id={self.id!r}, source={self.source!r}, title={self.title!r})"
+
+    def __reduce__(self) -> Any:
+        # Pickle as the bare field values, e.g. when returned from a parse worker
+        return (Article, _get_fields(self) + (self.sources, self.body))
+
+    def copy(self) -> "Article":
+        """Get a shallow copy of the article."""
+        return Article(*_get_fields(self), self.sources, self.body)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Get the article as a news item dict.
+
+        The dict shares the article's field values instead of copying them.
+        """
+        data = dict(zip(ARTICLE_FIELDS, _get_fields(self)))
+        if self.sources is not None:
+            data["sources"] = self.sources
+        if self.body is not None:
+            data["body"] = self.body
+        return data
+
+    def to_json(self, **kwargs: Any) -> str:
+        """Serialize the article as a JSON object."""
+        return json.dumps(self.to_dict(), ensure_ascii=False, **kwargs)
+
+def json_default(obj: Any) -> Any:
+    """
+    `default` hook for json.dump/json.dumps that serializes articles.
+
+    Usage:
+        json.dumps({"items": articles}, default=json_default)
+    """
+    if isinstance(obj, Article):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
@@ -0,0 +1,236 @@
+"""
+On-disk HTTP response cache for the news aggregator.
+"""
+
+import hashlib
+import json
+import os
+import time
+from typing import Dict, Any, List, Optional
+
+from utils.article import Article, json_default
+from utils.config import CACHE_DIR, CACHE_DEFAULT_TTL, CACHE_MAX_BYTES, NEWS_SOURCES
+
+def get_cache_ttl(source: str, category: Optional[str] = None) -> int:
+    """
+    Get the cache TTL (in seconds) for a source and category.
+
+    Falls back to the source's "default" TTL and then to CACHE_DEFAULT_TTL.
+    """
+    ttls = NEWS_SOURCES.get(source, {}).get("cache_ttl", {})
+    if category and category in ttls:
+        return ttls[category]
+    return ttls.get("default", CACHE_DEFAULT_TTL)
+
+class CacheEntry:
+    """A cached response together with its validators and parsed items."""
+
+    def __init__(self, meta: Dict[str, Any], path: str):
+        self.meta = meta
+        self.path = path
+
+    @property
+    def url(self) -> str:
+        return self.meta.get("url", "")
+
+    @property
+    def etag(self) -> Optional[str]:
+        return self.meta.get("etag")
+
+    @property
+    def last_modified(self) -> Optional[str]:
+        return self.meta.get("last_modified")
+
+    @property
+    def age(self) -> float:
+        """Seconds since the response was last stored or revalidated."""
+        return time.time() - self.meta.get("stored_at", 0)
+
+    def is_fresh(self, ttl: float) -> bool:
+        """Return True if the entry can be served without revalidation."""
+        return self.age < ttl
+
+    def validator_headers(self) -> Dict[str, str]:
+        """Build the conditional request headers for revalidation."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    def items_for(self, category: Optional[str], limit: int) -> Optional[List[Article]]:
+        """
+        Return the cached parsed items if they satisfy the request.
+
+        Items parsed with a smaller limit or for another category cannot be
+        reused and None is returned, so the caller parses the body instead.
+        """
+        if self.meta.get("category") != category:
+            return None
+        if self.meta.get("parse_limit", 0) < limit:
+            return None
+        return [Article.from_dict(item) for item in self.meta.get("items", [])[:limit]]
+
+    def read_body(self) -> Optional[bytes]:
+        """Read the cached response body from disk."""
+        try:
+            with open(self.path + ".body", "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+
+class ResponseCache:
+    """
+    Size-bounded on-disk cache keyed by URL.
+
+    Each entry is stored as a ".meta" JSON file (validators, timestamps and
+    the items parsed from the page) and a ".body" file with the raw response.
+    When the total size exceeds max_bytes, the least recently used entries
+    are evicted.
+    """
+
+    def __init__(self, cache_dir: str = CACHE_DIR, max_bytes: int = CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+
+    def _path(self, url: str) -> str:
+        key = hashlib.sha1(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, key)
+
+    def get(self, url: str) -> Optional[CacheEntry]:
+        """Look up a cached entry for a URL."""
+        path = self._path(url)
+        try:
+            with open(path + ".meta", "r", encoding="utf-8") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if meta.get("url") != url:
+            return None
+
+        # Record the access for LRU eviction
+        try:
+            os.utime(path + ".meta")
+        except OSError:
+            pass
+
+        return CacheEntry(meta, path)
+
+    def put(
+        self,
+        url: str,
+        body: bytes,
+        headers: Dict[str, str],
+        items: List[Article],
+        category: Optional[str] = None,
+        parse_limit: int = 0
+    ) -> None:
+        """Store a response body, its validators and the items parsed from it."""
+        path = self._path(url)
+        meta = {
+            "url": url,
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+            "stored_at": time.time(),
+            "size": len(body),
+            "category": category,
+            "parse_limit": parse_limit,
+            "items": items
+        }
+
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(path + ".body", "wb") as f:
+                f.write(body)
+            self._write_meta(path, meta)
+        except OSError:
+            return
+
+        self._evict()
+
+    def update_items(
+        self,
+        entry: CacheEntry,
+        items: List[Article],
+        category: Optional[str] = None,
+        parse_limit: int = 0
+    ) -> None:
+        """Replace the parsed items of an entry after re-parsing its body."""
+        entry.meta["items"] = items
+        entry.meta["category"] = category
+        entry.meta["parse_limit"] = parse_limit
+        try:
+            self._write_meta(entry.path, entry.meta)
+        except OSError:
+            pass
+
+    def touch(self, entry: CacheEntry, headers: Optional[Dict[str, str]] = None) -> None:
+        """Mark an entry as fresh again after a 304 Not Modified response."""
+        entry.meta["stored_at"] = time.time()
+        if headers:
+            entry.meta["etag"] = headers.get("ETag", entry.etag)
+            entry.meta["last_modified"] = headers.get("Last-Modified", entry.last_modified)
+        try:
+            self._write_meta(entry.path, entry.meta)
+        except OSError:
+            pass
+
+    def clear(self) -> None:
+        """Remove every entry from the cache."""
+        for path in self._entries():
+            self._remove(path)
+
+    def _write_meta(self, path: str, meta: Dict[str, Any]) -> None:
+        # Write to a temporary file first so readers never see a partial file
+        tmp_path = path + ".meta.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f, default=json_default)
+        os.replace(tmp_path, path + ".meta")
+
+    def _entries(self) -> List[str]:
+        try:
+            names = os.listdir(self.cache_dir)
+        except OSError:
+            return []
+        return [
+            os.path.join(self.cache_dir, name[:-len(".meta")])
+            for name in names
+            if name.endswith(".meta")
+        ]
+
+    def _remove(self, path: str) -> None:
+        for suffix in (".meta", ".body"):
+            try:
+                os.remove(path + suffix)
+            except OSError:
+                pass
+
+    def _evict(self) -> None:
+        """Evict least recently used entries until the cache fits max_bytes."""
+        entries = []
+        total = 0
+        for path in self._entries():
+            try:
+                size = os.path.getsize(path + ".meta")
+                if os.path.exists(path + ".body"):
+                    size += os.path.getsize(path + ".body")
+                accessed = os.path.getmtime(path + ".meta")
+            except OSError:
+                continue
+            entries.append((accessed, size, path))
+            total += size
+
+        if total <= self.max_bytes:
+            return
+
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+
+# Shared cache instance used by the scrapers
+response_cache = ResponseCache()
@@ -2,6 +2,8 @@
 Configuration settings for the news aggregator.
 """
 
+import os
+
 # API key for NewsAPI.org (replace with your own key)
 NEWS_API_KEY = "YOUR_API_KEY_HERE"  # Get your free API key from https://newsapi.org/register
 
@@ -17,12 +19,29 @@ CATEGORIES = [
     "science"
 ]
 
-# News sources with their respective URLs for API and scraping
+# News sources with their respective URLs for API and scraping.
+# "selectors" holds the CSS selectors used to extract articles from a page:
+# "article" matches each article card, the other selectors are applied
+# within a card, except "body" which matches the text of a full article page.
+# "feeds" holds the RSS/Atom feed URL of each category that has one.
 NEWS_SOURCES = {
     "the-hindu": {
         "name": "The Hindu",
         "api_id": "the-hindu",
         "scrape_url": "https://www.thehindu.com/",
+        "selectors": {
+            "article": "div.story-card, div.story-card-33",
+            "title": "h3.title, h2.title",
+            "link": "a",
+            "description": "p.intro, div.story-card-33-text",
+            "image": "img",
+            "date": "span.dateline, span.dateTime",
+            "body": "div.articlebodycontent p"
+        },
+        "cache_ttl": {
+            "default": 300,
+            "general": 120
+        },
         "categories": {
             "general": "/news/national/",
             "politics": "/news/national/politics/",
@@ -32,12 +51,35 @@ NEWS_SOURCES = {
             "technology": "/sci-tech/technology/",
             "health": "/sci-tech/health/",
             "science": "/sci-tech/science/"
+        },
+        "feeds": {
+            "general": "https://www.thehindu.com/news/national/feeder/default.rss",
+            "politics": "https://www.thehindu.com/news/national/politics/feeder/default.rss",
+            "business": "https://www.thehindu.com/business/feeder/default.rss",
+            "sports": "https://www.thehindu.com/sport/feeder/default.rss",
+            "entertainment": "https://www.thehindu.com/entertainment/feeder/default.rss",
+            "technology": "https://www.thehindu.com/sci-tech/technology/feeder/default.rss",
+            "health": "https://www.thehindu.com/sci-tech/health/feeder/default.rss",
+            "science": "https://www.thehindu.com/sci-tech/science/feeder/default.rss"
         }
     },
     "times-of-india": {
         "name": "Times of India",
         "api_id": "the-times-of-india",
         "scrape_url": "https://timesofindia.indiatimes.com/",
+        "selectors": {
+            "article": "div.main-content div.card-container",
+            "title": "span.title",
+            "link": "a",
+            "description": "p.synopsis",
+            "image": "img",
+            "date": "span.date",
+            "body": "div._s30J, div.Normal"
+        },
+        "cache_ttl": {
+            "default": 300,
+            "general": 120
+        },
         "categories": {
             "general": "/india/",
             "politics": "/india/politics/",
@@ -47,12 +89,33 @@ NEWS_SOURCES = {
             "technology": "/technology/",
             "health": "/life-style/health-fitness/",
             "science": "/science/"
+        },
+        "feeds": {
+            "general": "https://timesofindia.indiatimes.com/rssfeeds/-2128936835.cms",
+            "business": "https://timesofindia.indiatimes.com/rssfeeds/1898055.cms",
+            "sports": "https://timesofindia.indiatimes.com/rssfeeds/4719148.cms",
+            "entertainment": "https://timesofindia.indiatimes.com/rssfeeds/1081479906.cms",
+            "technology": "https://timesofindia.indiatimes.com/rssfeeds/66949542.cms",
+            "science": "https://timesofindia.indiatimes.com/rssfeeds/-2128672765.cms"
         }
     },
     "indian-express": {
         "name": "Indian Express",
         "api_id": "the-indian-express",
         "scrape_url": "https://indianexpress.com/",
+        "selectors": {
+            "article": "div.article, div.articles",
+            "title": "h2.title, h3.title",
+            "link": "a",
+            "description": "p.description, div.synopsis",
+            "image": "img",
+            "date": "div.date, span.date",
+            "body": "div#pcl-full-content p, div.full-details p"
+        },
+        "cache_ttl": {
+            "default": 300,
+            "general": 120
+        },
         "categories": {
             "general": "/india/",
             "politics": "/political-pulse/",
@@ -62,12 +125,34 @@ NEWS_SOURCES = {
             "technology": "/technology/",
             "health": "/lifestyle/health/",
             "science": "/science/"
+        },
+        "feeds": {
+            "general": "https://indianexpress.com/section/india/feed/",
+            "politics": "https://indianexpress.com/section/political-pulse/feed/",
+            "business": "https://indianexpress.com/section/business/feed/",
+            "sports": "https://indianexpress.com/section/sports/feed/",
+            "entertainment": "https://indianexpress.com/section/entertainment/feed/",
+            "technology": "https://indianexpress.com/section/technology/feed/",
+            "health": "https://indianexpress.com/section/lifestyle/health/feed/"
         }
     },
     "ndtv": {
         "name": "NDTV",
         "api_id": "ndtv",
         "scrape_url": "https://www.ndtv.com/",
+        "selectors": {
+            "article": "div.news_item, div.new_storylising, div.story_list",
+            "title": "h2.newsHdng, h3.newsHdng, h2.headline",
+            "link": "a",
+            "description": "p.newsCont, div.newsCont, p.description",
+            "image": "img",
+            "date": "span.posted-on, div.posted-on, span.update_date",
+            "body": "div.sp-cn p, div.Art-exp-wrp p"
+        },
+        "cache_ttl": {
+            "default": 300,
+            "general": 120
+        },
         "categories": {
             "general": "/india/",
             "politics": "/india-news/politics/",
@@ -77,15 +162,200 @@ NEWS_SOURCES = {
             "technology": "/gadgets/",
             "health": "/health/",
             "science": "/science/"
+        },
+        "feeds": {
+            "general": "https://feeds.feedburner.com/ndtvnews-india-news",
+            "business": "https://feeds.feedburner.com/ndtvprofit-latest",
+            "sports": "https://feeds.feedburner.com/ndtvsports-latest",
+            "technology": "https://feeds.feedburner.com/gadgets360-latest"
         }
     }
 }
 
+# UTC offset (in minutes) of Indian Standard Time. Dates without a timezone
+# are assumed to be in IST, and dates are displayed in IST.
+LOCAL_UTC_OFFSET_MINUTES = 330
+
 # Maximum number of retries for API calls
 MAX_RETRIES = 3
 
 # Timeout for requests (in seconds)
 REQUEST_TIMEOUT = 10
 
+# Separate connect and read timeouts (in seconds) used by the HTTP client
+CONNECT_TIMEOUT = 3.05
+READ_TIMEOUT = REQUEST_TIMEOUT
+
+# Exponential backoff between retries (in seconds)
+RETRY_BACKOFF_BASE = 0.5
+RETRY_BACKOFF_MAX = 8
+
+# HTTP status codes that are worth retrying
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+# Number of keep-alive connections kept per host
+HTTP_POOL_SIZE = 4
+
+# Per-host overrides of HTTP_POOL_SIZE
+HTTP_HOST_POOL_SIZES = {
+    "newsapi.org": 2
+}
+
+# Maximum number of pages scraped concurrently across all sources
+SCRAPE_CONCURRENCY = 16
+
+# Maximum number of pages scraped concurrently from a single host
+SCRAPE_HOST_CONCURRENCY = HTTP_POOL_SIZE
+
+# Once enough articles have been scraped, how long (in seconds) to wait
+# for slower pages before showing the results. None waits for every page
+# (each is bounded by the request timeout), so the results are the newest
+# articles of all pages; with a timeout they are only the newest of the
+# pages that answered in time.
+SCRAPE_SETTLE_TIMEOUT = None
+
+# How pages are scraped: "html" downloads and parses the web pages, "rss"
+# reads the sources' RSS/Atom feeds only, and "auto" reads a page's feed
+# first and falls back to the web page if it has no feed, or the feed
+# fails or is empty
+SCRAPE_BACKEND = "auto"
+
+# Backend that hybrid mode ("api" or "scraper") asks first
+HYBRID_PRIMARY = "scraper"
+
+# How long (in seconds) hybrid mode waits for the primary backend before
+# also asking the other one (a hedged request). Set this near the primary
+# backend's median (p50) latency; 0 asks both backends at once.
+HYBRID_HEDGE_AFTER = 1.0
+
+# Number of worker processes used to parse scraped pages.
+# Set to 0 to parse in the fetching thread instead.
+PARSE_WORKERS = min(4, os.cpu_count() or 1)
+
+# Only build the article card subtrees of scraped pages instead of the
+# whole document
+PARTIAL_PARSE = True
+
+# How old (in seconds) headlines kept in memory by the easy launcher may
+# get before they are refreshed in the background
+LAUNCHER_REFRESH_AFTER = 60
+
+# Address the serve command listens on
+SERVE_HOST = "127.0.0.1"
+SERVE_PORT = 8765
+
+# Headlines the serve command fetches for each page; also the most a
+# single request can ask for
+SERVE_FETCH_LIMIT = 50
+
+# How old (in seconds) headlines served from memory get before they are
+# refreshed in the background. NewsAPI headlines are refreshed less often
+# to save the daily request quota.
+SERVE_REFRESH_AFTER = 60
+SERVE_API_REFRESH_AFTER = 900
+
+# Headlines not requested for this long (in seconds) stop being refreshed
+# and are dropped from memory
+SERVE_IDLE_AFTER = 900
+
 # User agent for web scraping
-USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36" 
\ No newline at end of file
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36" 
+
+# Directory for locally persisted data (response cache etc.)
+DATA_DIR = os.environ.get(
+    "NEWS_AGGREGATOR_HOME",
+    os.path.join(os.path.expanduser("~"), ".news_aggregator")
+)
+
+# On-disk HTTP response cache for the web scraper
+CACHE_DIR = os.path.join(DATA_DIR, "http_cache")
+
+# Default time (in seconds) a cached page is served without revalidation.
+# Sources can override this per category with a "cache_ttl" entry.
+CACHE_DEFAULT_TTL = 300
+
+# Maximum total size of the response cache (in bytes)
+CACHE_MAX_BYTES = 50 * 1024 * 1024
+
+# Estimated Jaccard similarity of title and description shingles above
+# which articles from different sources are treated as the same story
+DEDUP_THRESHOLD = 0.5
+
+# MinHash signature length and number of LSH bands it is split into
+MINHASH_PERMUTATIONS = 128
+LSH_BANDS = 32
+
+# SQLite database of every article fetched so far
+STORE_PATH = os.path.join(DATA_DIR, "articles.db")
+
+# Whether fetched articles are saved to the article store
+STORE_ENABLED = True
+
+# Most recently saved search matches that are ranked; older matches of
+# very common terms are left out so searches stay fast on large stores
+SEARCH_CANDIDATES = 2000
+
+# File the health of every host we make requests to is persisted in
+HOST_HEALTH_PATH = os.path.join(DATA_DIR, "host_health.json")
+
+# A host's circuit opens, and requests to it fail immediately, after this
+# many consecutive failed requests...
+CIRCUIT_FAILURE_THRESHOLD = 3
+
+# ...or once this share of its last HEALTH_WINDOW requests failed (checked
+# from CIRCUIT_MIN_REQUESTS requests on)
+CIRCUIT_ERROR_RATE = 0.5
+HEALTH_WINDOW = 20
+CIRCUIT_MIN_REQUESTS = 10
+
+# How long (in seconds) an open circuit waits before letting one probe
+# request through. Each failed probe doubles the wait, up to the maximum.
+CIRCUIT_OPEN_SECONDS = 60
+CIRCUIT_MAX_OPEN_SECONDS = 1800
+
+# Status codes counted as failures of the host (besides connection
+# errors and timeouts); 403 and 429 mean the site is blocking us
+CIRCUIT_FAILURE_STATUS_CODES = (403, 429, 500, 502, 503, 504)
+
+# Weight of the latest request in a host's smoothed latency
+LATENCY_SMOOTHING = 0.3
+
+# Daily request quota of the NewsAPI key (the free developer plan allows 100).
+# Requests are counted locally and refused once the quota is used up.
+NEWS_API_DAILY_QUOTA = 100
+
+# Articles requested per NewsAPI page. Each page costs one request of the
+# daily quota, so pages are as large as the API allows.
+NEWS_API_PAGE_SIZE = 100
+
+# File the NewsAPI request count of the current day is persisted in
+NEWS_API_QUOTA_PATH = os.path.join(DATA_DIR, "newsapi_quota.json")
+
+# Shortest and longest time (in seconds) the watch command waits between
+# polls of one (source, category) page
+WATCH_MIN_INTERVAL = 60
+WATCH_MAX_INTERVAL = 3600
+
+# The watch command polls a page about as often as this many new articles
+# appear on it, based on the rate of new articles seen so far
+WATCH_TARGET_NEW_ARTICLES = 3
+
+# Weight of the latest poll in the smoothed rate of new articles
+WATCH_RATE_SMOOTHING = 0.3
+
+# Factor the poll interval grows by when a page fails or yields nothing
+WATCH_FAILURE_BACKOFF = 2.0
+
+# Random spread (as a fraction of the interval) added to every poll time,
+# so pages do not end up polled in lockstep
+WATCH_JITTER = 0.2
+
+# Maximum number of pages polled at once from any single host
+WATCH_HOST_CONCURRENCY = 1
+
+# Maximum number of articles extracted from each polled page
+WATCH_PAGE_LIMIT = 50
+
+# How long (in seconds) past its next due poll a page still counts as
+# fresh, so headlines reads it from the store instead of fetching
+WATCH_STALE_GRACE = 120
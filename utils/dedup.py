@@ -0,0 +1,176 @@
+"""
+Near-duplicate detection for news items across sources.
+
+Items are shingled on their title and description, summarised as MinHash
+signatures and grouped with locality-sensitive hashing (LSH), so finding
+duplicates takes roughly linear time instead of comparing every pair.
+"""
+
+import itertools
+import re
+import unicodedata
+import zlib
+from typing import List, Dict, Any, Optional, Set, Tuple
+
+from utils.config import DEDUP_THRESHOLD, LSH_BANDS, MINHASH_PERMUTATIONS
+
+# Number of characters per shingle
+SHINGLE_SIZE = 4
+
+# Odd multiplier used to mix the shingle hashes
+_MIX = 0x9E3779B1
+_MASK = (1 << 32) - 1
+
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+
+def _normalize(text: str) -> str:
+    """Lowercase text and collapse everything but letters and digits to single spaces."""
+    text = text.lower()
+    if text.isascii():
+        return _NON_WORD.sub(" ", text).strip()
+    # Keep the letters, digits and combining marks (such as Devanagari
+    # vowel signs) of every script
+    chars = [char if unicodedata.category(char)[0] in "LMN" else " " for char in text]
+    return " ".join("".join(chars).split())
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> Set[int]:
+    """
+    Split text into hashed shingles of `size` UTF-8 bytes.
+
+    The text is lowercased and punctuation is collapsed to single spaces
+    first, so small wording and formatting differences between sources
+    change only a few shingles. Text in any script is shingled.
+    """
+    data = _normalize(text).encode("utf-8")
+    if len(data) < size:
+        return {zlib.crc32(data)} if data else set()
+    crc32 = zlib.crc32
+    return {
+        (crc32(data[i:i + size]) * _MIX) & _MASK
+        for i in range(len(data) - size + 1)
+    }
+
+def minhash(shingle_set: Set[int], bins: int = MINHASH_PERMUTATIONS) -> Tuple[int, ...]:
+    """
+    Compute the MinHash signature of a set of hashed shingles.
+
+    Uses one-permutation hashing: each shingle is hashed once and assigned
+    to one of `bins` bins, keeping the minimum per bin. Empty bins borrow
+    the value of the next non-empty bin (rotation densification), so the
+    signature is as comparable as a classic MinHash with `bins` hash
+    functions at a fraction of the cost.
+    """
+    if not shingle_set:
+        return ()
+
+    empty = _MASK + 1
+    signature = [empty] * bins
+    for shingle in shingle_set:
+        index = shingle % bins
+        value = shingle // bins
+        if value < signature[index]:
+            signature[index] = value
+
+    # Fill empty bins from the next non-empty bin to the right. Walking
+    # right to left over two rounds lets the last bins wrap around.
+    filled = list(signature)
+    next_value = None
+    distance = 0
+    for step in range(2 * bins - 1, -1, -1):
+        index = step % bins
+        distance += 1
+        if signature[index] != empty:
+            next_value = signature[index]
+            distance = 0
+        elif next_value is not None and filled[index] == empty:
+            filled[index] = next_value + distance * empty
+
+    return tuple(filled)
+
+def similarity(signature_a: Tuple[int, ...], signature_b: Tuple[int, ...]) -> float:
+    """Estimate the Jaccard similarity of two MinHash signatures."""
+    if not signature_a or not signature_b:
+        return 0.0
+    matches = sum(1 for a, b in zip(signature_a, signature_b) if a == b)
+    return matches / len(signature_a)
+
+def _item_text(item: Dict[str, Any]) -> str:
+    return f"{item.get('title') or ''} {item.get('description') or ''}"
+
+class DuplicateIndex:
+    """
+    Incremental LSH index of news items for near-duplicate lookups.
+
+    Each added item is compared only with the items sharing one of its
+    LSH band buckets, so adding n items takes roughly linear time. Items
+    can be removed again, e.g. once they are no longer displayed.
+    """
+
+    def __init__(self, threshold: float = DEDUP_THRESHOLD, bands: int = LSH_BANDS):
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = MINHASH_PERMUTATIONS // bands
+        self._items: Dict[int, Dict[str, Any]] = {}
+        self._signatures: Dict[int, Tuple[int, ...]] = {}
+        self._buckets: Dict[Tuple[int, Tuple[int, ...]], List[int]] = {}
+        # id() of each indexed item -> its index
+        self._positions: Dict[int, int] = {}
+        self._next_index = itertools.count()
+
+    def _band_keys(self, signature: Tuple[int, ...]) -> List[Tuple[int, Tuple[int, ...]]]:
+        return [
+            (band, signature[band * self.rows:(band + 1) * self.rows])
+            for band in range(self.bands)
+        ] if signature else []
+
+    def add(self, item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Add an item unless it duplicates an indexed item from another source.
+
+        Returns:
+            The indexed item it duplicates, or None if it was added
+        """
+        signature = minhash(shingles(_item_text(item)))
+        keys = self._band_keys(signature)
+
+        for key in keys:
+            for other in self._buckets.get(key, ()):
+                # Articles of one source are already distinct by URL
+                if self._items[other].get("source") == item.get("source"):
+                    continue
+                if similarity(signature, self._signatures[other]) >= self.threshold:
+                    return self._items[other]
+
+        index = next(self._next_index)
+        self._items[index] = item
+        self._signatures[index] = signature
+        self._positions[id(item)] = index
+        for key in keys:
+            self._buckets.setdefault(key, []).append(index)
+        return None
+
+    def remove(self, item: Dict[str, Any]) -> None:
+        """Remove an indexed item, so later items are no longer matched against it."""
+        index = self._positions.pop(id(item), None)
+        if index is None:
+            return
+        del self._items[index]
+        for key in self._band_keys(self._signatures.pop(index)):
+            bucket = self._buckets[key]
+            bucket.remove(index)
+            if not bucket:
+                del self._buckets[key]
+
+def merge_sources(item: Dict[str, Any], duplicate: Dict[str, Any]) -> bool:
+    """
+    Add the source of a duplicate to the "sources" of the item it duplicates.
+
+    Returns:
+        True if the item's sources changed
+    """
+    sources = item.setdefault("sources", [item["source"]] if item.get("source") else [])
+    source = duplicate.get("source")
+    if source and source not in sources:
+        sources.append(source)
+        return True
+    return False
@@ -0,0 +1,295 @@
+"""
+Per-host health tracking and circuit breaking of HTTP requests.
+
+The outcome and latency of every request are recorded per host. Once a
+host keeps failing, its circuit opens and requests to it are refused
+immediately instead of each waiting for a timeout. When the circuit has
+been open for a while, a single probe request is let through
+(half-open): the circuit closes if it succeeds, and otherwise stays open
+for twice as long.
+
+Health is persisted, so a host that was down in the previous run is
+skipped from the first request of the next one.
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+from typing import List, Dict, Any, Optional
+
+from utils.config import (
+    CIRCUIT_ERROR_RATE,
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_MAX_OPEN_SECONDS,
+    CIRCUIT_MIN_REQUESTS,
+    CIRCUIT_OPEN_SECONDS,
+    HEALTH_WINDOW,
+    HOST_HEALTH_PATH,
+    LATENCY_SMOOTHING
+)
+
+# Circuit states
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+# Minimum time (in seconds) between saves of routine updates. Opening and
+# closing a circuit is saved right away.
+SAVE_INTERVAL = 1.0
+
+class HostHealth:
+    """Health and circuit state of one host."""
+
+    __slots__ = ("outcomes", "consecutive_failures", "latency", "state", "retry_at", "trips", "probing")
+
+    def __init__(self):
+        # 1 for each failed and 0 for each successful recent request, oldest first
+        self.outcomes: List[int] = []
+        self.consecutive_failures = 0
+        # Smoothed time (in seconds) the host takes to answer
+        self.latency: Optional[float] = None
+        self.state = CLOSED
+        # When an open circuit lets the next probe through
+        self.retry_at = 0.0
+        # Times the circuit opened since it was last closed
+        self.trips = 0
+        self.probing = False
+
+    @property
+    def error_rate(self) -> float:
+        """Share of the recent requests that failed."""
+        return sum(self.outcomes) / len(self.outcomes) if self.outcomes else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "outcomes": self.outcomes,
+            "consecutive_failures": self.consecutive_failures,
+            "latency": self.latency,
+            # A probe in flight is lost with the process, so the next run probes again
+            "state": OPEN if self.state == HALF_OPEN else self.state,
+            "retry_at": self.retry_at,
+            "trips": self.trips
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "HostHealth":
+        health = cls()
+        health.outcomes = [1 if outcome else 0 for outcome in data.get("outcomes", [])][-HEALTH_WINDOW:]
+        health.consecutive_failures = int(data.get("consecutive_failures", 0))
+        health.latency = data.get("latency")
+        health.state = OPEN if data.get("state") == OPEN else CLOSED
+        health.retry_at = float(data.get("retry_at", 0.0))
+        health.trips = int(data.get("trips", 0))
+        return health
+
+class HostHealthTracker:
+    """
+    Health of every host requests are sent to, with a circuit breaker per host.
+
+    Usage:
+        if host_health.allow(host):
+            ... send the request ...
+            host_health.record(host, ok, latency)
+    """
+
+    def __init__(self, path: str = HOST_HEALTH_PATH):
+        self.path = path
+        self._hosts: Optional[Dict[str, HostHealth]] = None
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._saved_at = 0.0
+        # Hosts requests were refused for in this process -> when they are retried
+        self._skipped: Dict[str, float] = {}
+
+    def _get_hosts(self) -> Dict[str, HostHealth]:
+        # Load the persisted health on first use; called with the lock held
+        if self._hosts is None:
+            self._hosts = {}
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                data = {}
+            if isinstance(data, dict):
+                for host, entry in data.items():
+                    if isinstance(entry, dict):
+                        self._hosts[host] = HostHealth.from_dict(entry)
+            atexit.register(self.flush)
+        return self._hosts
+
+    def _save(self) -> None:
+        # Called with the lock held
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({host: health.to_dict() for host, health in self._get_hosts().items()}, f)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            # Health is best-effort; at worst a dead host is rediscovered
+            pass
+        self._dirty = False
+        self._saved_at = time.monotonic()
+
+    def flush(self) -> None:
+        """Save any health updates not saved yet."""
+        with self._lock:
+            if self._dirty:
+                self._save()
+
+    def allow(self, host: str) -> bool:
+        """
+        Check whether a request to a host may be sent.
+
+        Requests to an open circuit are refused until its wait is over.
+        Then the first request is let through as the probe, and the others
+        are refused until it has finished. A caller that is allowed a
+        request must record() its outcome, or release() the host if it
+        never got one.
+        """
+        with self._lock:
+            health = self._get_hosts().get(host)
+            if health is None or health.state == CLOSED:
+                return True
+
+            now = time.time()
+            if now >= health.retry_at and not health.probing:
+                health.state = HALF_OPEN
+                health.probing = True
+                return True
+
+            self._skipped[host] = health.retry_at
+            return False
+
+    def is_open(self, host: str) -> bool:
+        """
+        Check whether requests to a host would be refused, without taking
+        the probe of a half-open circuit.
+        """
+        with self._lock:
+            health = self._get_hosts().get(host)
+            if health is None or health.state == CLOSED:
+                return False
+            if time.time() >= health.retry_at and not health.probing:
+                return False
+            self._skipped[host] = health.retry_at
+            return True
+
+    def retry_in(self, host: str) -> float:
+        """Get the time (in seconds) until the next probe of a host is let through."""
+        with self._lock:
+            health = self._get_hosts().get(host)
+            if health is None or health.state == CLOSED:
+                return 0.0
+            return max(0.0, health.retry_at - time.time())
+
+    def record(self, host: str, ok: bool, latency: Optional[float] = None) -> None:
+        """
+        Record the outcome of a request to a host.
+
+        Args:
+            host: The host the request was sent to
+            ok: Whether the host answered properly
+            latency: Time (in seconds) the host took to answer
+        """
+        with self._lock:
+            health = self._get_hosts().setdefault(host, HostHealth())
+            health.outcomes.append(0 if ok else 1)
+            del health.outcomes[:-HEALTH_WINDOW]
+            changed = False
+
+            if ok:
+                health.consecutive_failures = 0
+                if latency is not None:
+                    if health.latency is None:
+                        health.latency = latency
+                    else:
+                        health.latency += LATENCY_SMOOTHING * (latency - health.latency)
+                if health.state != CLOSED:
+                    # The host is back: start over with a clean record
+                    health.state = CLOSED
+                    health.probing = False
+                    health.trips = 0
+                    health.outcomes = [0]
+                    changed = True
+            else:
+                health.consecutive_failures += 1
+                if health.state == HALF_OPEN:
+                    # The probe failed
+                    self._open(health)
+                    changed = True
+                elif health.state == CLOSED and (
+                    health.consecutive_failures >= CIRCUIT_FAILURE_THRESHOLD
+                    or (
+                        len(health.outcomes) >= CIRCUIT_MIN_REQUESTS
+                        and health.error_rate >= CIRCUIT_ERROR_RATE
+                    )
+                ):
+                    self._open(health)
+                    changed = True
+
+            self._dirty = True
+            if changed or time.monotonic() - self._saved_at >= SAVE_INTERVAL:
+                self._save()
+
+    def release(self, host: str) -> None:
+        """Give back the probe of a host whose request ended without an outcome."""
+        with self._lock:
+            health = self._get_hosts().get(host)
+            if health is not None and health.state == HALF_OPEN:
+                health.state = OPEN
+                health.probing = False
+
+    def _open(self, health: HostHealth) -> None:
+        """Open a circuit, waiting twice as long as last time before the next probe."""
+        health.trips += 1
+        wait = min(CIRCUIT_MAX_OPEN_SECONDS, CIRCUIT_OPEN_SECONDS * 2 ** (health.trips - 1))
+        health.state = OPEN
+        health.probing = False
+        health.retry_at = time.time() + wait
+
+    def skipped_hosts(self) -> Dict[str, Optional[float]]:
+        """
+        Get the hosts requests were refused for in this process.
+
+        Returns:
+            Dict mapping each host to the time (in seconds) until it is
+            probed again, or to None if its circuit has closed since
+        """
+        now = time.time()
+        with self._lock:
+            hosts = self._get_hosts()
+            return {
+                host: None if host not in hosts or hosts[host].state == CLOSED else max(0.0, retry_at - now)
+                for host, retry_at in self._skipped.items()
+            }
+
+    def report(self) -> Dict[str, Dict[str, Any]]:
+        """Get the health of every known host."""
+        with self._lock:
+            return {
+                host: {
+                    "state": health.state,
+                    "error_rate": health.error_rate,
+                    "consecutive_failures": health.consecutive_failures,
+                    "latency": health.latency,
+                    "retry_in": max(0.0, health.retry_at - time.time()) if health.state != CLOSED else 0.0
+                }
+                for host, health in self._get_hosts().items()
+            }
+
+    def reset(self, host: Optional[str] = None) -> None:
+        """Forget the health of one host, or of all hosts."""
+        with self._lock:
+            hosts = self._get_hosts()
+            if host is None:
+                hosts.clear()
+            else:
+                hosts.pop(host, None)
+            self._skipped.clear()
+            self._save()
+
+# Shared tracker, so every request of the process updates the same health
+host_health = HostHealthTracker()
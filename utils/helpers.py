@@ -4,7 +4,21 @@ Helper functions for the news aggregator.
 
 import re
 import datetime
-from typing import Dict, Any, Optional
+import email.utils
+import hashlib
+import sys
+from typing import Dict, Any, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from utils.article import Article
+from utils.config import LOCAL_UTC_OFFSET_MINUTES, NEWS_SOURCES
+
+# Length of the short article ids shown to users
+ARTICLE_ID_LENGTH = 12
+
+# Query parameters that only track where a click came from
+TRACKING_PARAM_PREFIXES = ("utm_",)
+TRACKING_PARAMS = {"fbclid", "gclid", "ref"}
 
 def clean_text(text: str) -> str:
     """
@@ -24,7 +38,143 @@ def clean_text(text: str) -> str:
     
     return text
 
-def format_date(date_str: str, input_format: Optional[str] = None) -> str:
+# Date formats tried when parsing publish dates, most common first
+DATE_FORMATS = [
+    "%Y-%m-%dT%H:%M:%SZ",      # ISO format (2023-05-15T14:30:00Z)
+    "%Y-%m-%d %H:%M:%S",       # Standard format (2023-05-15 14:30:00)
+    "%d %b %Y, %H:%M",         # 15 May 2023, 14:30
+    "%d %b %Y %H:%M",          # 15 May 2023 14:30
+    "%d %B %Y %H:%M",          # 15 May 2023 14:30
+    "%b %d, %Y %H:%M",         # May 15, 2023 14:30
+    "%B %d, %Y %I:%M %p",      # May 15, 2023 02:30 PM
+    "%b %d, %Y %I:%M %p",      # May 15, 2023 02:30 PM
+    "%d %b %Y",                # 15 May 2023
+    "%d %B %Y",                # 15 May 2023
+    "%b %d, %Y",               # May 15, 2023
+    "%B %d, %Y",               # May 15, 2023
+    "%d-%m-%Y",                # 15-05-2023
+    "%d/%m/%Y"                 # 15/05/2023
+]
+
+# Display format of publish dates
+DISPLAY_DATE_FORMAT = "%d %b %Y, %H:%M"
+
+LOCAL_TIMEZONE = datetime.timezone(
+    datetime.timedelta(minutes=LOCAL_UTC_OFFSET_MINUTES), "IST"
+)
+
+# Last format that parsed a date, per source
+_format_cache: Dict[str, str] = {}
+
+# Cached "format" of sources whose dates are ISO 8601 or RFC 822 (e.g. feeds)
+_STRUCTURED_FORMAT = "structured"
+
+_DATE_LABEL = re.compile(r'^(?:last\s+)?(?:updated|published|posted)(?:\s+on)?\s*:?\s*', re.IGNORECASE)
+_DATE_SEPARATORS = re.compile(r'\s*\|\s*')
+_IST_SUFFIX = re.compile(r'\s*\(?\bIST\b\)?$', re.IGNORECASE)
+_RELATIVE_DATE = re.compile(
+    r'^(an?|\d+)\s*(sec|second|min|minute|hr|hour|day|week)s?\s+ago$',
+    re.IGNORECASE
+)
+_RELATIVE_UNITS = {
+    "sec": 1, "second": 1,
+    "min": 60, "minute": 60,
+    "hr": 3600, "hour": 3600,
+    "day": 86400,
+    "week": 604800
+}
+
+def _parse_relative_date(text: str, now: datetime.datetime) -> Optional[datetime.datetime]:
+    """Parse relative times such as "2 hours ago", "just now" or "yesterday"."""
+    lowered = text.lower()
+    if lowered in ("just now", "now"):
+        return now
+    if lowered == "yesterday":
+        return now - datetime.timedelta(days=1)
+    
+    match = _RELATIVE_DATE.match(text)
+    if not match:
+        return None
+    amount = 1 if match.group(1).lower() in ("a", "an") else int(match.group(1))
+    return now - datetime.timedelta(seconds=amount * _RELATIVE_UNITS[match.group(2).lower()])
+
+def parse_date(
+    date_str: str,
+    source: Optional[str] = None,
+    now: Optional[datetime.datetime] = None
+) -> Optional[datetime.datetime]:
+    """
+    Parse a publish date into a timezone-aware UTC datetime.
+    
+    Handles ISO 8601 and RFC 822 dates, the common formats in DATE_FORMATS,
+    "IST" suffixes and relative times like "2 hours ago". Dates without a
+    timezone are taken to be in IST. The format that last parsed a date
+    from `source` is tried first.
+    
+    Returns:
+        The parsed datetime, or None if the date cannot be parsed
+    """
+    if not date_str:
+        return None
+    
+    now = now or datetime.datetime.now(datetime.timezone.utc)
+    text = _DATE_SEPARATORS.sub(" ", _DATE_LABEL.sub("", date_str.strip()))
+    text = _IST_SUFFIX.sub("", text)
+    
+    dt = _parse_relative_date(text, now)
+    if dt is not None:
+        return dt
+    
+    cached_format = _format_cache.get(source) if source else None
+    if cached_format == _STRUCTURED_FORMAT:
+        # Skip the formats that would all fail first
+        dt = _parse_structured_date(text)
+        if dt is not None:
+            return _to_utc(dt)
+        cached_format = None
+    formats = [cached_format] + DATE_FORMATS if cached_format else DATE_FORMATS
+    
+    for fmt in formats:
+        try:
+            dt = datetime.datetime.strptime(text, fmt)
+        except ValueError:
+            continue
+        if source:
+            _format_cache[source] = fmt
+        if fmt.endswith("Z"):
+            dt = dt.replace(tzinfo=datetime.timezone.utc)
+        break
+    else:
+        dt = _parse_structured_date(text)
+        if dt is None:
+            return None
+        if source:
+            _format_cache[source] = _STRUCTURED_FORMAT
+    
+    return _to_utc(dt)
+
+def _to_utc(dt: datetime.datetime) -> datetime.datetime:
+    """Convert a parsed date to UTC, taking dates without a timezone to be in IST."""
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=LOCAL_TIMEZONE)
+    return dt.astimezone(datetime.timezone.utc)
+
+def _parse_structured_date(text: str) -> Optional[datetime.datetime]:
+    """Parse ISO 8601 dates with offsets and RFC 822 dates."""
+    try:
+        return datetime.datetime.fromisoformat(text)
+    except ValueError:
+        pass
+    try:
+        return email.utils.parsedate_to_datetime(text)
+    except (TypeError, ValueError):
+        return None
+
+def to_timestamp(dt: Optional[datetime.datetime]) -> Optional[int]:
+    """Convert a datetime to a UTC epoch timestamp."""
+    return int(dt.timestamp()) if dt else None
+
+def format_date(date_str: str, input_format: Optional[str] = None, source: Optional[str] = None) -> str:
     """
     Format date string to a standardized format.
     
@@ -33,87 +183,197 @@ def format_date(date_str: str, input_format: Optional[str] = None) -> str:
     if not date_str:
         return "Unknown"
     
-    try:
-        if input_format:
+    if input_format:
+        try:
             dt = datetime.datetime.strptime(date_str, input_format)
-        else:
-            # Try common formats
-            formats = [
-                "%Y-%m-%dT%H:%M:%SZ",  # ISO format (2023-05-15T14:30:00Z)
-                "%Y-%m-%d %H:%M:%S",   # Standard format (2023-05-15 14:30:00)
-                "%d %b %Y %H:%M",      # 15 May 2023 14:30
-                "%d %B %Y",            # 15 May 2023
-                "%d-%m-%Y",            # 15-05-2023
-                "%d/%m/%Y"             # 15/05/2023
-            ]
-            
-            for fmt in formats:
-                try:
-                    dt = datetime.datetime.strptime(date_str, fmt)
-                    break
-                except ValueError:
-                    continue
-            else:
-                return date_str  # Return original if no format matches
-        
-        # Format to a standard output
-        return dt.strftime("%d %b %Y, %H:%M")
-        
-    except Exception:
-        return date_str
-
-def normalize_news_item(item: Dict[Any, Any], source: str) -> Dict[str, Any]:
-    """
-    Normalize news item data from different sources into a standard format.
-    """
-    normalized = {
-        "id": item.get("id", item.get("url", ""))[:50],
-        "title": clean_text(item.get("title", "")),
-        "description": clean_text(item.get("description", "")),
-        "content": clean_text(item.get("content", "")),
-        "url": item.get("url", ""),
-        "source": item.get("source", {}).get("name", source),
-        "category": item.get("category", "general"),
-        "published_at": format_date(item.get("publishedAt", "")),
-        "image_url": item.get("urlToImage", "")
-    }
-    
-    return normalized
+        except ValueError:
+            return date_str
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=LOCAL_TIMEZONE)
+    else:
+        dt = parse_date(date_str, source)
+        if dt is None:
+            return date_str  # Return original if no format matches
+    
+    return display_date(dt)
 
-def categorize_article(title: str, content: str) -> str:
+def display_date(dt: datetime.datetime) -> str:
+    """Format a datetime for display in local (IST) time."""
+    return dt.astimezone(LOCAL_TIMEZONE).strftime(DISPLAY_DATE_FORMAT)
+
+def canonicalize_url(url: str) -> str:
     """
-    Attempt to categorize an article based on its title and content.
+    Canonicalize an article URL so the same article always maps to one URL.
     
-    Returns a category from the CATEGORIES list.
+    Lowercases the scheme and host, drops the fragment and tracking query
+    parameters, and collapses repeated slashes in the path.
     """
-    # Simple keyword-based categorization
-    keywords = {
-        "politics": ["election", "minister", "government", "parliament", "political", "bjp", "congress", "modi"],
-        "business": ["economy", "market", "stock", "finance", "business", "company", "trade", "rupee"],
-        "sports": ["cricket", "ipl", "sport", "match", "player", "team", "tournament", "athlete"],
-        "entertainment": ["movie", "film", "actor", "actress", "bollywood", "cinema", "star", "celebrity"],
-        "technology": ["tech", "technology", "digital", "software", "app", "computer", "internet", "cyber"],
-        "health": ["health", "medical", "doctor", "hospital", "disease", "covid", "vaccine", "medicine"],
-        "science": ["science", "research", "scientist", "study", "discovery", "space", "nasa", "isro"]
-    }
+    if not url:
+        return ""
     
-    text = (title + " " + content).lower()
+    parts = urlsplit(url.strip())
+    path = re.sub(r'/{2,}', '/', parts.path) or "/"
+    query = urlencode([
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS
+        and not key.lower().startswith(TRACKING_PARAM_PREFIXES)
+    ])
     
-    # Count keyword matches for each category
-    category_scores = {category: 0 for category in keywords}
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, query, ""))
+
+def article_key(url: str, source: str = "", title: str = "") -> str:
+    """
+    Get the full hash key of an article.
     
-    for category, category_keywords in keywords.items():
-        for keyword in category_keywords:
-            if keyword.lower() in text:
-                category_scores[category] += 1
+    Articles are keyed by their canonical URL, or by source and title when
+    they have no URL.
+    """
+    key = canonicalize_url(url) or f"{source}\n{title}"
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+def article_id(url: str, source: str = "", title: str = "") -> str:
+    """
+    Get the short, stable id of an article, as shown to users.
+    """
+    return article_key(url, source, title)[:ARTICLE_ID_LENGTH]
+
+def normalize_article(article: Article, category: str = "general") -> Article:
+    """
+    Normalize an article extracted with its fields as shown on the page, in place.
+
+    The date in published_at is replaced with the display date, and the
+    id, category and publish timestamp are filled in.
+    """
+    published_str = article.published_at
+    published = parse_date(published_str, article.source)
+    
+    article.id = article_id(article.url, article.source, article.title)
+    article.category = sys.intern(category or "general")
+    article.published_at = display_date(published) if published else format_date(published_str)
+    article.published_ts = to_timestamp(published)
+    
+    return article
+
+def normalize_news_item(item: Dict[Any, Any], source: str) -> Article:
+    """
+    Normalize a news item in the NewsAPI article format into an Article.
+    """
+    article = Article(
+        title=clean_text(item.get("title", "")),
+        description=clean_text(item.get("description", "")),
+        content=clean_text(item.get("content", "")),
+        url=item.get("url") or "",
+        source=(item.get("source") or {}).get("name") or source,
+        published_at=item.get("publishedAt") or "",
+        image_url=item.get("urlToImage") or ""
+    )
+    
+    return normalize_article(article, item.get("category", "general"))
+
+# Keywords used to categorize articles
+CATEGORY_KEYWORDS = {
+    "politics": ["election", "minister", "government", "parliament", "political", "bjp", "congress", "modi"],
+    "business": ["economy", "market", "stock", "finance", "business", "company", "trade", "rupee"],
+    "sports": ["cricket", "ipl", "sport", "match", "player", "team", "tournament", "athlete"],
+    "entertainment": ["movie", "film", "actor", "actress", "bollywood", "cinema", "star", "celebrity"],
+    "technology": ["tech", "technology", "digital", "software", "app", "computer", "internet", "cyber"],
+    "health": ["health", "medical", "doctor", "hospital", "disease", "covid", "vaccine", "medicine"],
+    "science": ["science", "research", "scientist", "study", "discovery", "space", "nasa", "isro"]
+}
+
+# Keyword -> category lookup table, built once at import time
+_KEYWORD_CATEGORIES = {
+    keyword: category
+    for category, category_keywords in CATEGORY_KEYWORDS.items()
+    for keyword in category_keywords
+}
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+def _match_keyword(word: str) -> Optional[str]:
+    """
+    Get the keyword a word matches, allowing simple plurals
+    ("elections", "matches", "studies").
+    """
+    if word in _KEYWORD_CATEGORIES:
+        return word
+    if word.endswith("ies") and word[:-3] + "y" in _KEYWORD_CATEGORIES:
+        return word[:-3] + "y"
+    if word.endswith("es") and word[:-2] in _KEYWORD_CATEGORIES:
+        return word[:-2]
+    if word.endswith("s") and word[:-1] in _KEYWORD_CATEGORIES:
+        return word[:-1]
+    return None
+
+def _score_categories(text: str) -> str:
+    """
+    Score every category in a single pass over the words of the text.
+    
+    Keywords only match whole words, and each distinct keyword counts
+    once towards its category.
+    """
+    matched = set()
+    for word in _WORD.findall(text.lower()):
+        keyword = _match_keyword(word)
+        if keyword:
+            matched.add(keyword)
+    
+    scores = {category: 0 for category in CATEGORY_KEYWORDS}
+    for keyword in matched:
+        scores[_KEYWORD_CATEGORIES[keyword]] += 1
     
     # Find category with highest score
     max_score = 0
     best_category = "general"
     
-    for category, score in category_scores.items():
+    for category, score in scores.items():
         if score > max_score:
             max_score = score
             best_category = category
     
-    return best_category 
\ No newline at end of file
+    return best_category
+
+def categorize_article(title: str, content: str) -> str:
+    """
+    Attempt to categorize an article based on its title and content.
+    
+    Returns a category from the CATEGORIES list.
+    """
+    return _score_categories(f"{title or ''} {content or ''}")
+
+def categorize_articles(items: List[Dict[str, Any]]) -> List[str]:
+    """
+    Categorize a batch of news items based on their title and description.
+    
+    Returns:
+        One category per item, in the same order
+    """
+    return [
+        _score_categories(f"{item.get('title') or ''} {item.get('description') or ''}")
+        for item in items
+    ]
+
+def get_scrape_targets(
+    source: Optional[str] = None,
+    category: Optional[str] = None
+) -> List[Tuple[str, Optional[str]]]:
+    """
+    Get the (source, category) pages to scrape.
+    
+    Without a category, every category page of the selected sources is
+    scraped so that all of NEWS_SOURCES is covered in one pass.
+    """
+    sources = [source] if source else list(NEWS_SOURCES.keys())
+    
+    targets = []
+    for src in sources:
+        source_info = NEWS_SOURCES.get(src)
+        if not source_info:
+            continue
+        if category:
+            targets.append((src, category))
+        else:
+            targets.extend((src, cat) for cat in source_info.get("categories", {}))
+            
+    return targets
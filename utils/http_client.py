@@ -0,0 +1,261 @@
+"""
+Shared HTTP client for the news aggregator.
+
+All network access goes through a single pooled requests.Session so that
+connections are kept alive and reused across sources and categories. The
+health of every host is recorded once per logical request, however many
+attempts it takes, and requests to hosts whose circuit is open are
+refused (see utils.health).
+"""
+
+import atexit
+import contextlib
+import email.utils
+import random
+import threading
+import time
+from typing import Dict, Any, Iterator, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from utils.config import (
+    CIRCUIT_FAILURE_STATUS_CODES,
+    CONNECT_TIMEOUT,
+    HTTP_HOST_POOL_SIZES,
+    HTTP_POOL_SIZE,
+    MAX_RETRIES,
+    NEWS_SOURCES,
+    READ_TIMEOUT,
+    RETRY_BACKOFF_BASE,
+    RETRY_BACKOFF_MAX,
+    RETRY_STATUS_CODES,
+    USER_AGENT
+)
+from utils.health import host_health
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+# The logical request (RequestOutcome) being sent on each thread, if any
+_tracked = threading.local()
+
+class CircuitOpenError(requests.ConnectionError):
+    """Exception raised when a request is refused because the host's circuit is open."""
+
+    def __init__(self, host: str, retry_in: float):
+        super().__init__(f"{host} is unavailable; it will be retried in {retry_in:.0f}s")
+        self.host = host
+        self.retry_in = retry_in
+
+class RequestOutcome:
+    """Outcome of the last attempt of a logical request."""
+
+    __slots__ = ("ok", "latency")
+
+    def __init__(self):
+        # None until an attempt got an answer or failed to connect
+        self.ok: Optional[bool] = None
+        self.latency: Optional[float] = None
+
+@contextlib.contextmanager
+def track_request(url: str) -> Iterator[None]:
+    """
+    Record the health of a URL's host once for a logical request.
+
+    Attempts sent inside the block (e.g. retries) are not recorded one by
+    one; the outcome of the last of them is recorded when the block exits.
+    Blocks nested in a tracked block are part of the outer request.
+
+    Raises:
+        CircuitOpenError: If the host's circuit is open
+    """
+    if getattr(_tracked, "outcome", None) is not None:
+        yield
+        return
+
+    host = urlparse(url).netloc.lower()
+    if not host_health.allow(host):
+        raise CircuitOpenError(host, host_health.retry_in(host))
+
+    outcome = _tracked.outcome = RequestOutcome()
+    try:
+        yield
+    finally:
+        _tracked.outcome = None
+        if outcome.ok is None:
+            host_health.release(host)
+        else:
+            host_health.record(host, outcome.ok, outcome.latency)
+
+class HealthTrackingAdapter(HTTPAdapter):
+    """
+    HTTPAdapter that records the health of each host and refuses requests
+    to hosts whose circuit is open.
+
+    Tracking at the adapter covers every request made on the session,
+    including those of the NewsAPI client library. Inside track_request
+    the adapter only notes each attempt's outcome, for the logical
+    request to record once.
+    """
+
+    def send(self, request: requests.PreparedRequest, **kwargs: Any) -> requests.Response:
+        outcome = getattr(_tracked, "outcome", None)
+        if outcome is not None:
+            try:
+                response = super().send(request, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                outcome.ok, outcome.latency = False, None
+                raise
+            outcome.ok = response.status_code not in CIRCUIT_FAILURE_STATUS_CODES
+            outcome.latency = response.elapsed.total_seconds()
+            return response
+
+        host = urlparse(request.url).netloc.lower()
+        if not host_health.allow(host):
+            raise CircuitOpenError(host, host_health.retry_in(host))
+
+        try:
+            response = super().send(request, **kwargs)
+        except (requests.ConnectionError, requests.Timeout):
+            host_health.record(host, False)
+            raise
+        except BaseException:
+            host_health.release(host)
+            raise
+
+        host_health.record(
+            host,
+            response.status_code not in CIRCUIT_FAILURE_STATUS_CODES,
+            response.elapsed.total_seconds()
+        )
+        return response
+
+def _known_hosts() -> Dict[str, int]:
+    """Map every host we talk to onto its connection pool size."""
+    hosts = {}
+    for source_info in NEWS_SOURCES.values():
+        host = urlparse(source_info.get("scrape_url", "")).netloc
+        if host:
+            hosts[host] = HTTP_POOL_SIZE
+    hosts.update(HTTP_HOST_POOL_SIZES)
+    return hosts
+
+def _build_session() -> requests.Session:
+    """Create a session with a dedicated connection pool per known host."""
+    session = requests.Session()
+    session.headers.update({"User-Agent": USER_AGENT})
+
+    # Default adapter for any other host
+    default_adapter = HealthTrackingAdapter(pool_connections=10, pool_maxsize=HTTP_POOL_SIZE)
+    session.mount("http://", default_adapter)
+    session.mount("https://", default_adapter)
+
+    for host, pool_size in _known_hosts().items():
+        adapter = HealthTrackingAdapter(pool_connections=1, pool_maxsize=pool_size)
+        session.mount(f"https://{host}/", adapter)
+        session.mount(f"http://{host}/", adapter)
+
+    return session
+
+def get_session() -> requests.Session:
+    """Get the process-wide pooled session, creating it on first use."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _build_session()
+                # Close the pooled connections cleanly when the process exits
+                atexit.register(close_session)
+    return _session
+
+def close_session() -> None:
+    """Close the shared session and release its connections."""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header given either in seconds or as an HTTP date.
+    """
+    if not value:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at is None:
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+def backoff_delay(attempt: int, retry_after: Optional[float] = None) -> float:
+    """
+    Get the delay before the next retry.
+
+    Uses exponential backoff with full jitter, unless the server told us
+    how long to wait with Retry-After.
+    """
+    if retry_after is not None:
+        return min(retry_after, RETRY_BACKOFF_MAX)
+    ceiling = min(RETRY_BACKOFF_MAX, RETRY_BACKOFF_BASE * (2 ** attempt))
+    return random.uniform(0, ceiling)
+
+def request(
+    method: str,
+    url: str,
+    retries: int = MAX_RETRIES,
+    timeout: Any = None,
+    **kwargs: Any
+) -> requests.Response:
+    """
+    Send a request through the shared session, retrying on failures.
+
+    Connection errors, timeouts and responses with a status code in
+    RETRY_STATUS_CODES are retried up to `retries` times in total. The
+    last response is returned as-is, so callers still check its status.
+    The host's health is recorded once, with the outcome of the last
+    attempt.
+
+    Raises:
+        CircuitOpenError: If the host's circuit is open
+        requests.RequestException: If the last attempt fails to connect
+    """
+    session = get_session()
+    if timeout is None:
+        timeout = (CONNECT_TIMEOUT, READ_TIMEOUT)
+
+    attempts = max(1, retries)
+    with track_request(url):
+        for attempt in range(attempts):
+            try:
+                response = session.request(method, url, timeout=timeout, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt < attempts - 1:
+                    time.sleep(backoff_delay(attempt))
+                    continue
+                raise
+
+            if response.status_code in RETRY_STATUS_CODES and attempt < attempts - 1:
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                response.close()
+                time.sleep(backoff_delay(attempt, retry_after))
+                continue
+
+            return response
+
+    # Not reached: the last attempt either returns or raises
+    raise requests.RequestException(f"Request to {url} failed")
+
+def get(url: str, **kwargs: Any) -> requests.Response:
+    """Send a GET request through the shared session."""
+    return request("GET", url, **kwargs)
@@ -0,0 +1,109 @@
+"""
+Streaming merge of news items from several sources.
+"""
+
+import heapq
+import itertools
+from typing import List, Dict, Any, Set
+
+from utils.dedup import DuplicateIndex, merge_sources
+from utils.helpers import canonicalize_url
+
+class DuplicateFilter:
+    """
+    Recognize news items that were seen before.
+
+    Repeated (canonical) URLs are dropped, and near-duplicates of earlier
+    items are folded into the earlier item by adding their source to its
+    "sources".
+    """
+
+    def __init__(self, dedup: bool = True):
+        self._seen_urls: Set[str] = set()
+        self._duplicates = DuplicateIndex() if dedup else None
+
+    def add(self, item: Dict[str, Any]) -> bool:
+        """
+        Check a news item against the items seen so far.
+
+        Returns:
+            True if the item is new
+        """
+        url = canonicalize_url(item.get("url") or "")
+        if url:
+            if url in self._seen_urls:
+                return False
+            self._seen_urls.add(url)
+
+        if self._duplicates is not None:
+            original = self._duplicates.add(item)
+            if original is not None:
+                merge_sources(original, item)
+                return False
+
+        return True
+
+class TopNewsMerger:
+    """
+    Keep the `limit` most recently published news items seen so far.
+
+    Items are pushed one at a time as sources produce them. The newest
+    `limit` items are kept in a bounded min-heap on their publish
+    timestamp, so memory stays O(limit). Repeats of a kept item's
+    (canonical) URL are dropped, and near-duplicates of a kept item are
+    folded into it. Items that were rejected or evicted are forgotten, so
+    a later copy of their story can still be kept.
+    """
+
+    def __init__(self, limit: int, dedup: bool = True):
+        self.limit = limit
+        self._heap: List[Any] = []
+        self._order = itertools.count()
+        # Canonical URLs of the kept items
+        self._urls: Set[str] = set()
+        self._duplicates = DuplicateIndex() if dedup else None
+
+    def push(self, item: Dict[str, Any]) -> bool:
+        """
+        Merge a news item.
+
+        Returns:
+            True if the kept items changed: the item is among the top
+            `limit` items, or its source was added to a kept duplicate
+        """
+        url = canonicalize_url(item.get("url") or "")
+        if url in self._urls:
+            return False
+
+        if self._duplicates is not None:
+            original = self._duplicates.add(item)
+            if original is not None:
+                return merge_sources(original, item)
+
+        # Earlier items win ties, so the sequence number is negated
+        entry = (item.get("published_ts") or 0, -next(self._order), item)
+        if len(self._heap) < self.limit:
+            heapq.heappush(self._heap, entry)
+        elif entry[:2] > self._heap[0][:2]:
+            self._forget(heapq.heapreplace(self._heap, entry)[2])
+        else:
+            self._forget(item)
+            return False
+
+        if url:
+            self._urls.add(url)
+        return True
+
+    def _forget(self, item: Dict[str, Any]) -> None:
+        """Stop deduplicating against an item that is not kept."""
+        self._urls.discard(canonicalize_url(item.get("url") or ""))
+        if self._duplicates is not None:
+            self._duplicates.remove(item)
+
+    def is_full(self) -> bool:
+        """Return True once `limit` items have been collected."""
+        return len(self._heap) >= self.limit
+
+    def items(self) -> List[Dict[str, Any]]:
+        """Get the kept items, newest first."""
+        return [entry[2] for entry in sorted(self._heap, key=lambda entry: entry[:2], reverse=True)]
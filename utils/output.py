@@ -0,0 +1,104 @@
+"""
+Streaming machine-readable output of news items.
+
+Writers write and flush every item as soon as they are given it, without
+holding on to any of them, and don't depend on Rich. They are meant for
+piping headlines into other programs.
+"""
+
+import csv
+import json
+import sys
+from typing import Any, Dict, IO, Optional
+
+from utils.article import ARTICLE_FIELDS, json_default
+
+# Machine-readable output formats
+FORMATS = ("jsonl", "csv", "json")
+
+class NewsWriter:
+    """
+    Base class of the streaming news item writers.
+
+    Usage:
+        with get_writer("jsonl") as writer:
+            for item in news_items:
+                writer.write(item)
+    """
+
+    def __init__(self, stream: IO[str]):
+        self.stream = stream
+        self.count = 0
+
+    def write(self, item: Dict[str, Any]) -> None:
+        """Write one news item and flush it to the stream."""
+        self._write(item)
+        self.count += 1
+        self.stream.flush()
+
+    def close(self) -> None:
+        """Finish the output. The stream itself is left open."""
+        self.stream.flush()
+
+    def _write(self, item: Dict[str, Any]) -> None:
+        raise NotImplementedError
+
+    def __enter__(self) -> "NewsWriter":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+class JsonLinesWriter(NewsWriter):
+    """Write one JSON object per line."""
+
+    def _write(self, item: Dict[str, Any]) -> None:
+        self.stream.write(json.dumps(item, ensure_ascii=False, default=json_default))
+        self.stream.write("\n")
+
+class JsonWriter(NewsWriter):
+    """Write a JSON array, one item at a time."""
+
+    def _write(self, item: Dict[str, Any]) -> None:
+        self.stream.write("[\n" if self.count == 0 else ",\n")
+        self.stream.write(json.dumps(item, ensure_ascii=False, default=json_default))
+
+    def close(self) -> None:
+        self.stream.write("[]\n" if self.count == 0 else "\n]\n")
+        super().close()
+
+class CsvWriter(NewsWriter):
+    """Write a header row, then one row of the article fields per item."""
+
+    def __init__(self, stream: IO[str]):
+        super().__init__(stream)
+        self._writer = csv.writer(stream, lineterminator="\n")
+        self._writer.writerow(ARTICLE_FIELDS)
+
+    def _write(self, item: Dict[str, Any]) -> None:
+        self._writer.writerow([
+            "" if item.get(field) is None else item.get(field)
+            for field in ARTICLE_FIELDS
+        ])
+
+_WRITERS = {
+    "jsonl": JsonLinesWriter,
+    "csv": CsvWriter,
+    "json": JsonWriter
+}
+
+def get_writer(output_format: str, stream: Optional[IO[str]] = None) -> NewsWriter:
+    """
+    Get a writer for one of FORMATS.
+
+    Args:
+        output_format: The output format
+        stream: Text stream to write to (default: standard output)
+
+    Raises:
+        ValueError: If the format is not one of FORMATS
+    """
+    writer_class = _WRITERS.get(output_format)
+    if writer_class is None:
+        raise ValueError(f"Unknown output format: {output_format}")
+    return writer_class(stream if stream is not None else sys.stdout)
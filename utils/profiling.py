@@ -0,0 +1,147 @@
+"""
+Lightweight per-stage timing of the fetch pipeline.
+
+Code wraps each stage (request, parse, extract, render, ...) in a span
+labelled with the source it works on. Profiling is off by default: while
+disabled, span() returns a shared no-op context manager and count() and
+record() return immediately, so instrumented code pays one function call.
+"""
+
+import contextlib
+import threading
+import time
+from typing import List, Dict, Any, Callable, Iterator, Optional, Tuple
+
+# Label of stages that don't belong to a single source
+ALL_SOURCES = "all"
+
+_enabled = False
+_started: Optional[float] = None
+_lock = threading.Lock()
+
+# (source, stage) -> [calls, total seconds, max seconds]
+_timings: Dict[Tuple[str, str], List[float]] = {}
+
+# (source, counter) -> value
+_counters: Dict[Tuple[str, str], int] = {}
+
+_NULL_SPAN = contextlib.nullcontext()
+
+def enable() -> None:
+    """Start collecting timings, discarding any collected before."""
+    global _enabled, _started
+    reset()
+    _started = time.perf_counter()
+    _enabled = True
+
+def disable() -> None:
+    """Stop collecting timings."""
+    global _enabled
+    _enabled = False
+
+def is_enabled() -> bool:
+    """Return True while timings are being collected."""
+    return _enabled
+
+def reset() -> None:
+    """Discard all collected timings and counters."""
+    with _lock:
+        _timings.clear()
+        _counters.clear()
+
+def record(stage: str, seconds: float, source: Optional[str] = None) -> None:
+    """Add a duration measured elsewhere to a stage."""
+    if not _enabled:
+        return
+    key = (source or ALL_SOURCES, stage)
+    with _lock:
+        timing = _timings.get(key)
+        if timing is None:
+            _timings[key] = [1, seconds, seconds]
+        else:
+            timing[0] += 1
+            timing[1] += seconds
+            timing[2] = max(timing[2], seconds)
+
+def count(name: str, value: int = 1, source: Optional[str] = None) -> None:
+    """Add to a counter, e.g. the number of articles a stage handled."""
+    if not _enabled:
+        return
+    key = (source or ALL_SOURCES, name)
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+
+@contextlib.contextmanager
+def _span(stage: str, source: Optional[str]) -> Iterator[None]:
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(stage, time.perf_counter() - start, source)
+
+def span(stage: str, source: Optional[str] = None) -> Any:
+    """
+    Time the enclosed block as one call of a stage.
+
+    Usage:
+        with profiling.span("parse", source_name):
+            soup = parse_page(...)
+    """
+    if not _enabled:
+        return _NULL_SPAN
+    return _span(stage, source)
+
+def snapshot() -> Dict[str, Any]:
+    """Get the collected timings and counters in a form that can be merged or dumped."""
+    with _lock:
+        return {
+            "timings": [
+                {"source": source, "stage": stage, "calls": int(calls), "total": total, "max": longest}
+                for (source, stage), (calls, total, longest) in _timings.items()
+            ],
+            "counters": [
+                {"source": source, "name": name, "value": value}
+                for (source, name), value in _counters.items()
+            ]
+        }
+
+def merge(data: Dict[str, Any]) -> None:
+    """Add timings and counters collected in another process."""
+    if not _enabled:
+        return
+    with _lock:
+        for entry in data.get("timings", []):
+            key = (entry["source"], entry["stage"])
+            timing = _timings.setdefault(key, [0, 0.0, 0.0])
+            timing[0] += entry["calls"]
+            timing[1] += entry["total"]
+            timing[2] = max(timing[2], entry["max"])
+        for entry in data.get("counters", []):
+            key = (entry["source"], entry["name"])
+            _counters[key] = _counters.get(key, 0) + entry["value"]
+
+def run_profiled(func: Callable[..., Any], *args: Any) -> Tuple[Any, Dict[str, Any]]:
+    """
+    Run a function with profiling enabled and return its timings too.
+
+    Used in worker processes, whose timings are merged back into the
+    parent with merge().
+    """
+    enable()
+    try:
+        return func(*args), snapshot()
+    finally:
+        disable()
+        reset()
+
+def report() -> Dict[str, Any]:
+    """
+    Get the profile: wall time since enable() and per-source, per-stage timings.
+
+    Stages are sorted by source, then by total time (descending).
+    """
+    data = snapshot()
+    data["timings"].sort(key=lambda entry: (entry["source"], -entry["total"]))
+    data["counters"].sort(key=lambda entry: (entry["source"], entry["name"]))
+    data["wall"] = time.perf_counter() - _started if _started is not None else 0.0
+    return data
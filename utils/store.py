@@ -0,0 +1,567 @@
+"""
+Local SQLite store of fetched news articles.
+"""
+
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple
+
+from utils import profiling
+from utils.article import Article
+from utils.config import SEARCH_CANDIDATES, STORE_ENABLED, STORE_PATH, WATCH_STALE_GRACE
+from utils.helpers import ARTICLE_ID_LENGTH, article_key, parse_date, to_timestamp
+
+# Columns of the articles table that hold normalized news item fields
+ITEM_COLUMNS = (
+    "title",
+    "description",
+    "content",
+    "url",
+    "source",
+    "category",
+    "published_at",
+    "image_url"
+)
+
+# Schema migrations, applied in order and tracked with PRAGMA user_version
+MIGRATIONS = [
+    """
+    CREATE TABLE IF NOT EXISTS articles (
+        url_hash TEXT PRIMARY KEY,
+        url TEXT NOT NULL,
+        title TEXT NOT NULL,
+        description TEXT,
+        content TEXT,
+        source TEXT,
+        category TEXT,
+        published_at TEXT,
+        published_ts INTEGER NOT NULL,
+        image_url TEXT,
+        content_hash TEXT NOT NULL,
+        first_seen INTEGER NOT NULL,
+        last_seen INTEGER NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_articles_published ON articles (published_ts);
+    CREATE INDEX IF NOT EXISTS idx_articles_source ON articles (source, published_ts);
+    CREATE INDEX IF NOT EXISTS idx_articles_category ON articles (category, published_ts);
+    """,
+    f"""
+    ALTER TABLE articles ADD COLUMN body TEXT;
+    CREATE INDEX IF NOT EXISTS idx_articles_id
+        ON articles (substr(url_hash, 1, {ARTICLE_ID_LENGTH}));
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS polls (
+        source TEXT NOT NULL,
+        category TEXT NOT NULL,
+        polled_at INTEGER NOT NULL,
+        next_poll INTEGER NOT NULL,
+        new_articles INTEGER NOT NULL,
+        PRIMARY KEY (source, category)
+    );
+    """,
+    # Full-text index of the text fields, kept in step with the articles
+    # table by triggers. Source and category are indexed too, to filter
+    # matches inside the index. The index refers to articles by rowid, which
+    # the store never changes (it does not VACUUM).
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+        title,
+        description,
+        content,
+        source,
+        category,
+        content='articles',
+        content_rowid='rowid',
+        tokenize='porter unicode61 remove_diacritics 2'
+    );
+    CREATE TRIGGER IF NOT EXISTS articles_fts_insert AFTER INSERT ON articles BEGIN
+        INSERT INTO articles_fts (rowid, title, description, content, source, category)
+        VALUES (new.rowid, new.title, new.description, new.content, new.source, new.category);
+    END;
+    CREATE TRIGGER IF NOT EXISTS articles_fts_delete AFTER DELETE ON articles BEGIN
+        INSERT INTO articles_fts (articles_fts, rowid, title, description, content, source, category)
+        VALUES ('delete', old.rowid, old.title, old.description, old.content, old.source, old.category);
+    END;
+    CREATE TRIGGER IF NOT EXISTS articles_fts_update
+    AFTER UPDATE OF title, description, content, source, category ON articles BEGIN
+        INSERT INTO articles_fts (articles_fts, rowid, title, description, content, source, category)
+        VALUES ('delete', old.rowid, old.title, old.description, old.content, old.source, old.category);
+        INSERT INTO articles_fts (rowid, title, description, content, source, category)
+        VALUES (new.rowid, new.title, new.description, new.content, new.source, new.category);
+    END;
+    INSERT INTO articles_fts (articles_fts) VALUES ('rebuild');
+    """
+]
+
+# Articles read from the database at once by iter_query
+QUERY_CHUNK_SIZE = 500
+
+# Weight of a match in each column of articles_fts (title, description,
+# content, source, category) when ranking; searches never match the last two
+SEARCH_WEIGHTS = (10.0, 4.0, 1.0, 0.0, 0.0)
+
+# A "quoted phrase" or a bare word of a search string
+_SEARCH_TERM = re.compile(r'"([^"]*)"?|(\S+)')
+
+class StoreError(Exception):
+    """Exception raised for article store errors."""
+    pass
+
+def url_hash(item: Dict[str, Any]) -> str:
+    """
+    Get the key of a news item in the store.
+
+    The first ARTICLE_ID_LENGTH characters of the key are the item's id.
+    """
+    return article_key(item.get("url") or "", item.get("source") or "", item.get("title") or "")
+
+def content_hash(item: Dict[str, Any]) -> str:
+    """Hash the text fields of a news item to detect changed articles."""
+    text = "\n".join(item.get(field) or "" for field in ("title", "description", "content"))
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+def published_timestamp(item: Dict[str, Any], default: int) -> int:
+    """
+    Get the publish time of a normalized news item as a UTC epoch.
+
+    Falls back to `default` when the item has no parseable date.
+    """
+    timestamp = item.get("published_ts")
+    if timestamp is None:
+        timestamp = to_timestamp(parse_date(item.get("published_at") or ""))
+    return default if timestamp is None else timestamp
+
+def build_match_query(text: str) -> str:
+    """
+    Turn a search string into an FTS5 query.
+
+    Every word and "quoted phrase" must match, a trailing * matches any
+    word starting with the given prefix, and OR between two terms matches
+    either of them. Any other FTS5 syntax is searched for as plain text, so
+    user input never makes an invalid query.
+    """
+    terms: List[str] = []
+    for phrase, word in _SEARCH_TERM.findall(text):
+        if word == "OR":
+            if terms and terms[-1] != "OR":
+                terms.append("OR")
+            continue
+
+        # Quote every term so the tokenizer sees it as plain text
+        term_text = phrase or word.rstrip("*")
+        if not any(char.isalnum() for char in term_text):
+            continue
+        term = '"' + term_text.replace('"', '') + '"'
+        if word.endswith("*"):
+            term += "*"
+        terms.append(term)
+
+    if terms and terms[-1] == "OR":
+        terms.pop()
+    return " ".join(terms)
+
+class ArticleStore:
+    """
+    SQLite-backed store of normalized news items.
+
+    Articles are keyed by a hash of their URL, so saving the same article
+    again only refreshes its last-seen time (and its fields, if the content
+    hash changed) while the first-seen time is kept.
+    """
+
+    def __init__(self, path: str = STORE_PATH):
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            if self.path != ":memory:":
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._migrate(conn)
+            self._conn = conn
+        return self._conn
+
+    def _migrate(self, conn: sqlite3.Connection) -> None:
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        for index in range(version, len(MIGRATIONS)):
+            conn.executescript(MIGRATIONS[index])
+            conn.execute(f"PRAGMA user_version = {index + 1}")
+        conn.commit()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def upsert(self, items: Iterable[Dict[str, Any]]) -> int:
+        """
+        Insert new news items and refresh the ones already stored.
+
+        Returns:
+            The number of articles that were not in the store before
+        """
+        now = int(time.time())
+        rows = []
+        for item in items:
+            if not item.get("title"):
+                continue
+            rows.append((
+                url_hash(item),
+                *(item.get(column) or "" for column in ITEM_COLUMNS),
+                published_timestamp(item, now),
+                content_hash(item),
+                now,
+                now
+            ))
+
+        if not rows:
+            return 0
+
+        try:
+            with self._lock:
+                conn = self._connect()
+                with conn:
+                    # rowcount leaves out the rows the full-text index triggers write
+                    inserted = conn.executemany(
+                        """
+                        INSERT INTO articles (
+                            url_hash, title, description, content, url, source,
+                            category, published_at, image_url, published_ts,
+                            content_hash, first_seen, last_seen
+                        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                        ON CONFLICT (url_hash) DO NOTHING
+                        """,
+                        rows
+                    ).rowcount
+                    conn.executemany(
+                        """
+                        UPDATE articles SET
+                            title = ?, description = ?, content = ?, url = ?,
+                            source = ?, category = ?, published_at = ?,
+                            image_url = ?, published_ts = ?, content_hash = ?,
+                            last_seen = ?
+                        WHERE url_hash = ? AND content_hash != ?
+                        """,
+                        [row[1:11] + (now, row[0], row[10]) for row in rows]
+                    )
+                    conn.executemany(
+                        "UPDATE articles SET last_seen = ? WHERE url_hash = ?",
+                        [(now, row[0]) for row in rows]
+                    )
+        except sqlite3.Error as e:
+            raise StoreError(f"Failed to save articles: {e}") from e
+
+        return inserted
+
+    def query(
+        self,
+        source: Optional[str] = None,
+        category: Optional[str] = None,
+        limit: int = 50,
+        since: Optional[int] = None
+    ) -> List[Article]:
+        """
+        Get the most recently published stored articles.
+
+        Args:
+            source: Only return articles from this source name
+            category: Only return articles in this category
+            limit: Maximum number of articles to return
+            since: Only return articles published at or after this UTC epoch
+
+        Returns:
+            List of articles, newest first
+        """
+        return list(self.iter_query(source, category, limit, since))
+
+    def iter_query(
+        self,
+        source: Optional[str] = None,
+        category: Optional[str] = None,
+        limit: int = 50,
+        since: Optional[int] = None
+    ) -> Iterator[Article]:
+        """
+        Same as query, but reads the articles QUERY_CHUNK_SIZE at a time.
+
+        Only one chunk is held in memory at once, however large `limit` is.
+        """
+        conditions = []
+        params: List[Any] = []
+        if source:
+            conditions.append("source = ?")
+            params.append(source)
+        if category:
+            conditions.append("category = ?")
+            params.append(category)
+        if since is not None:
+            conditions.append("published_ts >= ?")
+            params.append(since)
+
+        # Each chunk continues after the last row of the previous one
+        last: Optional[Tuple[int, int]] = None
+        remaining = limit
+        while remaining > 0:
+            chunk_conditions = list(conditions)
+            chunk_params = list(params)
+            if last is not None:
+                chunk_conditions.append("(published_ts, rowid) < (?, ?)")
+                chunk_params.extend(last)
+            where = f"WHERE {' AND '.join(chunk_conditions)}" if chunk_conditions else ""
+            chunk_params.append(min(remaining, QUERY_CHUNK_SIZE))
+
+            try:
+                with self._lock:
+                    rows = self._connect().execute(
+                        f"""
+                        SELECT rowid, * FROM articles {where}
+                        ORDER BY published_ts DESC, rowid DESC
+                        LIMIT ?
+                        """,
+                        chunk_params
+                    ).fetchall()
+            except sqlite3.Error as e:
+                raise StoreError(f"Failed to query articles: {e}") from e
+
+            for row in rows:
+                yield self._row_to_item(row)
+
+            if len(rows) < QUERY_CHUNK_SIZE:
+                return
+            remaining -= len(rows)
+            last = (rows[-1]["published_ts"], rows[-1]["rowid"])
+
+    def search(
+        self,
+        text: str,
+        source: Optional[str] = None,
+        category: Optional[str] = None,
+        since: Optional[int] = None,
+        until: Optional[int] = None,
+        limit: int = 20,
+        newest_first: bool = False,
+        candidates: int = SEARCH_CANDIDATES
+    ) -> List[Article]:
+        """
+        Search the title, description and content of the stored articles.
+
+        Only the `candidates` most recently saved matches are ranked, so
+        terms found in a large part of the store stay fast to search.
+
+        Args:
+            text: Search string (see build_match_query)
+            source: Only return articles from this source name
+            category: Only return articles in this category
+            since: Only return articles published at or after this UTC epoch
+            until: Only return articles published before this UTC epoch
+            limit: Maximum number of articles to return
+            newest_first: Sort by publish time instead of relevance
+            candidates: Number of matches to rank
+
+        Returns:
+            List of matching articles, best (or newest) match first
+        """
+        match = build_match_query(text)
+        if not match:
+            return []
+
+        # Search the text columns only, and narrow the matches down to the
+        # source and category inside the index
+        match = f"{{title description content}} : ({match})"
+        conditions = ["articles_fts MATCH ?"]
+        params: List[Any] = []
+        for column, value in (("source", source), ("category", category)):
+            if value:
+                match += f' AND {column} : ^"{value.replace(chr(34), chr(34) * 2)}"'
+                conditions.append(f"articles.{column} = ?")
+                params.append(value)
+        params.insert(0, match)
+
+        # Articles are saved roughly in publish order, so the rowids of the
+        # articles in the date range bound the part of the index to scan
+        if since is not None:
+            conditions.append("articles.published_ts >= ?")
+            conditions.append(
+                "articles_fts.rowid >= (SELECT MIN(rowid) FROM articles "
+                "INDEXED BY idx_articles_published WHERE published_ts >= ?)"
+            )
+            params.extend([since, since])
+        if until is not None:
+            conditions.append("articles.published_ts < ?")
+            conditions.append(
+                "articles_fts.rowid <= (SELECT MAX(rowid) FROM articles "
+                "INDEXED BY idx_articles_published WHERE published_ts < ?)"
+            )
+            params.extend([until, until])
+        params.extend([candidates, limit])
+
+        weights = ", ".join(str(weight) for weight in SEARCH_WEIGHTS)
+        order = "hits.published_ts DESC" if newest_first else "hits.score"
+
+        try:
+            with self._lock:
+                # The index yields the newest rowids first, so the inner query
+                # stops after `candidates` matches and only scores those
+                rows = self._connect().execute(
+                    f"""
+                    SELECT articles.* FROM articles JOIN (
+                        SELECT
+                            articles_fts.rowid AS hit,
+                            bm25(articles_fts, {weights}) AS score,
+                            articles.published_ts AS published_ts
+                        FROM articles_fts
+                        JOIN articles ON articles.rowid = articles_fts.rowid
+                        WHERE {' AND '.join(conditions)}
+                        ORDER BY articles_fts.rowid DESC
+                        LIMIT ?
+                    ) AS hits ON articles.rowid = hits.hit
+                    ORDER BY {order}
+                    LIMIT ?
+                    """,
+                    params
+                ).fetchall()
+        except sqlite3.Error as e:
+            raise StoreError(f"Failed to search articles: {e}") from e
+
+        return [self._row_to_item(row) for row in rows]
+
+    def get(self, article_id: str) -> Optional[Article]:
+        """
+        Look up a stored article by its short id.
+
+        Returns:
+            The article with its cached "body" (None if not fetched yet),
+            or None if no article has this id
+        """
+        article_id = article_id.strip().lower()
+        if len(article_id) != ARTICLE_ID_LENGTH:
+            return None
+
+        try:
+            with self._lock:
+                row = self._connect().execute(
+                    f"SELECT * FROM articles WHERE substr(url_hash, 1, {ARTICLE_ID_LENGTH}) = ?",
+                    (article_id,)
+                ).fetchone()
+        except sqlite3.Error as e:
+            raise StoreError(f"Failed to read article: {e}") from e
+
+        if row is None:
+            return None
+
+        item = self._row_to_item(row)
+        item["body"] = row["body"]
+        return item
+
+    def save_body(self, article_id: str, body: str) -> None:
+        """Cache the full text of an article."""
+        try:
+            with self._lock:
+                conn = self._connect()
+                with conn:
+                    conn.execute(
+                        f"UPDATE articles SET body = ? WHERE substr(url_hash, 1, {ARTICLE_ID_LENGTH}) = ?",
+                        (body, article_id.strip().lower())
+                    )
+        except sqlite3.Error as e:
+            raise StoreError(f"Failed to save article body: {e}") from e
+
+    def record_poll(
+        self,
+        source: str,
+        category: str,
+        polled_at: int,
+        next_poll: int,
+        new_articles: int
+    ) -> None:
+        """Record a poll of a (source, category) page by the watch command."""
+        try:
+            with self._lock:
+                conn = self._connect()
+                with conn:
+                    conn.execute(
+                        """
+                        INSERT OR REPLACE INTO polls (
+                            source, category, polled_at, next_poll, new_articles
+                        ) VALUES (?, ?, ?, ?, ?)
+                        """,
+                        (source, category, polled_at, next_poll, new_articles)
+                    )
+        except sqlite3.Error as e:
+            raise StoreError(f"Failed to record poll: {e}") from e
+
+    def get_polls(self) -> Dict[Tuple[str, str], Dict[str, int]]:
+        """Get the last recorded poll of every (source, category) page."""
+        try:
+            with self._lock:
+                rows = self._connect().execute("SELECT * FROM polls").fetchall()
+        except sqlite3.Error as e:
+            raise StoreError(f"Failed to read polls: {e}") from e
+
+        return {
+            (row["source"], row["category"]): {
+                "polled_at": row["polled_at"],
+                "next_poll": row["next_poll"],
+                "new_articles": row["new_articles"]
+            }
+            for row in rows
+        }
+
+    def is_warm(
+        self,
+        targets: Iterable[Tuple[str, Optional[str]]],
+        grace: int = WATCH_STALE_GRACE
+    ) -> bool:
+        """
+        Check whether the watch command keeps all the given pages fresh.
+
+        A page is fresh until `grace` seconds after its next due poll, so
+        the store goes cold shortly after the watch command stops.
+        """
+        targets = list(targets)
+        if not targets:
+            return False
+
+        polls = self.get_polls()
+        now = int(time.time())
+        for source, category in targets:
+            poll = polls.get((source, category or ""))
+            if poll is None or poll["next_poll"] + grace < now:
+                return False
+        return True
+
+    def _row_to_item(self, row: sqlite3.Row) -> Article:
+        return Article(
+            id=row["url_hash"][:ARTICLE_ID_LENGTH],
+            published_ts=row["published_ts"],
+            **{column: row[column] for column in ITEM_COLUMNS}
+        )
+
+# Shared store instance
+article_store = ArticleStore()
+
+def save_articles(items: List[Dict[str, Any]]) -> int:
+    """
+    Save fetched news items to the shared store, if enabled.
+
+    Storage errors are ignored so that fetching never fails because of
+    the local database. Returns the number of new articles.
+    """
+    if not STORE_ENABLED:
+        return 0
+    try:
+        with profiling.span("store"):
+            return article_store.upsert(items)
+    except StoreError:
+        return 0